@@ -0,0 +1,398 @@
+"""
+Local stand-in for the VFS booking site, used by the benchmarks.
+
+The site mimics the parts of the VFS Angular front end the bots interact
+with: a cookie banner with a "Reject All" button, the `#mat-input-0/1` login
+form, a dashboard with a "Start New Booking" button, `mat-form-field` /
+`mat-option` dropdowns, the `CheckIsSlotAvailable` API and the `div.alert`
+results. Every request is delayed by a configurable latency, and each
+availability check finds slots with a configurable probability.
+
+It also receives webhook notifications on `/webhook`, checking their HMAC
+signature and body like a real receiver would, so the webhook channel can be
+tried without an external endpoint.
+
+Run it on its own with:
+
+    python -m benchmarks.mock_vfs_site --port 8080 --latency 0.2 --webhook-secret s3cret
+"""
+
+import argparse
+import hmac
+import json
+import logging
+import random
+import threading
+import time
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from numbers import Number
+from typing import Dict, List, Optional, Tuple
+
+from vfs_appointment_bot.notification.webhook_client import (
+    SIGNATURE_HEADER,
+    TIMESTAMP_HEADER,
+    sign_payload,
+)
+
+# Options of the booking form dropdowns, in the order of the form fields
+DEFAULT_OPTIONS = [
+    ["Mock Visa Centre", "Other Visa Centre"],
+    ["Schengen Visa", "National Visa"],
+    ["Tourism", "Business"],
+]
+
+SESSION_COOKIE = "mock_vfs_session"
+
+# Maximum age in seconds of the timestamp of a signed webhook request
+WEBHOOK_TOLERANCE = 300
+
+APP_HTML = """<!doctype html>
+<html>
+<head><title>Mock VFS Global</title></head>
+<body>
+<div id="app"></div>
+<script>
+const OPTIONS = __OPTIONS__;
+const app = document.getElementById("app");
+
+function showLogin() {
+  app.innerHTML = `
+    <div id="cookie-banner"><button id="reject-cookies">Reject All</button></div>
+    <form onsubmit="return false">
+      <input id="mat-input-0" type="email">
+      <input id="mat-input-1" type="password">
+      <button type="button" id="sign-in">Sign In</button>
+    </form>`;
+  document.getElementById("reject-cookies").onclick = () =>
+    document.getElementById("cookie-banner").remove();
+  document.getElementById("sign-in").onclick = async () => {
+    const response = await fetch("/api/login", {
+      method: "POST",
+      body: JSON.stringify({
+        email: document.getElementById("mat-input-0").value,
+        password: document.getElementById("mat-input-1").value,
+      }),
+    });
+    if (response.ok) {
+      history.pushState({}, "", location.pathname.replace(/\\/login$/, "/dashboard"));
+      showDashboard();
+    }
+  };
+}
+
+function showDashboard() {
+  app.innerHTML = '<button id="start-booking">Start New Booking</button>';
+  document.getElementById("start-booking").onclick = showBookingForm;
+}
+
+function showBookingForm() {
+  app.innerHTML =
+    OPTIONS.map((_, index) => `<mat-form-field><span>Select ${index + 1}</span></mat-form-field>`).join("") +
+    '<div id="options"></div><div id="result"></div>';
+  const selected = [];
+  document.querySelectorAll("mat-form-field").forEach((field, index) => {
+    field.onclick = () => {
+      const panel = document.getElementById("options");
+      panel.innerHTML = OPTIONS[index].map((option) => `<mat-option>${option}</mat-option>`).join("");
+      panel.querySelectorAll("mat-option").forEach((option) => {
+        option.onclick = () => {
+          selected[index] = option.textContent;
+          field.querySelector("span").textContent = option.textContent;
+          panel.innerHTML = "";
+          if (index === OPTIONS.length - 1) checkAvailability(selected);
+        };
+      });
+    };
+  });
+}
+
+async function checkAvailability(selected) {
+  const result = document.getElementById("result");
+  result.innerHTML = "";
+  const response = await fetch("/appointment/CheckIsSlotAvailable", {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ params: selected }),
+  });
+  const payload = await response.json();
+  if (payload.earliestSlotLists.length === 0) {
+    result.innerHTML = '<div class="alert">No appointment slots are currently available</div>';
+    return;
+  }
+  result.innerHTML = payload.earliestSlotLists
+    .map((slot) => `<div class="alert">Earliest Available Slot : ${slot.displayDate}</div>`)
+    .join("");
+}
+
+const loggedIn = document.cookie.includes("__SESSION_COOKIE__=");
+if (location.pathname.endsWith("/dashboard") && loggedIn) {
+  showDashboard();
+} else {
+  showLogin();
+}
+</script>
+</body>
+</html>
+"""
+
+
+class MockVfsSite:
+    """
+    Mock VFS site served by a threaded HTTP server on a background thread.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        slot_probability: float = 0.0,
+        max_slots: int = 3,
+        options: Optional[List[List[str]]] = None,
+        webhook_secret: Optional[str] = None,
+    ):
+        """
+        Starts the mock site.
+
+        Args:
+            host (str): The address to listen on.
+            port (int): The port to listen on, 0 for a free port.
+            latency (float): Seconds every request is delayed by.
+            slot_probability (float): Probability that an availability check finds slots.
+            max_slots (int): Maximum number of slots found by one availability check.
+            options (Optional[List[List[str]]]): The options of every booking form dropdown.
+            webhook_secret (Optional[str]): The secret webhook requests must be
+                signed with, or None to accept unsigned requests.
+        """
+        self.latency = latency
+        self.slot_probability = slot_probability
+        self.max_slots = max_slots
+        self.options = options or DEFAULT_OPTIONS
+        self.webhook_secret = webhook_secret
+        self.availability_checks = 0
+        self.webhook_batches: List[List[dict]] = []
+        self._random = random.Random(0)
+        self._lock = threading.Lock()
+
+        site = self
+
+        class Handler(MockVfsRequestHandler):
+            mock_site = site
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="mock-vfs-site", daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def base_url(self) -> str:
+        """The URL of the site root, e.g. "http://127.0.0.1:8080"."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def login_url(self, source: str, destination: str) -> str:
+        """
+        Returns the login page URL of a route, shaped like the VFS URLs.
+
+        Args:
+            source (str): The source country code, e.g. "ind".
+            destination (str): The destination country code, e.g. "deu".
+
+        Returns:
+            str: The login page URL.
+        """
+        return f"{self.base_url}/{source}/en/{destination}/login"
+
+    def render_app(self) -> bytes:
+        """
+        Renders the single-page app served for the login and dashboard pages.
+
+        Returns:
+            bytes: The HTML of the app.
+        """
+        return (
+            APP_HTML.replace("__OPTIONS__", json.dumps(self.options))
+            .replace("__SESSION_COOKIE__", SESSION_COOKIE)
+            .encode("utf-8")
+        )
+
+    def check_availability(self) -> dict:
+        """
+        Answers an availability check like the VFS `CheckIsSlotAvailable` API.
+
+        Returns:
+            dict: The availability payload, with slots found with `slot_probability`.
+        """
+        with self._lock:
+            self.availability_checks += 1
+            found = self._random.random() < self.slot_probability
+            count = self._random.randint(1, self.max_slots) if found else 0
+            first_day = self._random.randint(7, 60)
+
+        slot_dates = [
+            date.today() + timedelta(days=first_day + day) for day in range(count)
+        ]
+        slots = [
+            {
+                "date": slot_date.strftime("%m/%d/%Y 00:00:00"),
+                "displayDate": slot_date.strftime("%d-%m-%Y"),
+            }
+            for slot_date in slot_dates
+        ]
+        return {
+            "earliestDate": slots[0]["date"] if slots else None,
+            "earliestSlotLists": slots,
+            "error": (
+                None if slots else {"code": 1035, "description": "No slots available"}
+            ),
+        }
+
+    def receive_webhook(self, headers: Dict[str, str], body: bytes) -> Tuple[int, str]:
+        """
+        Checks and records a webhook request sent by the webhook channel.
+
+        The request must carry a valid, recent signature when a webhook secret
+        is set, and its body must be `{"events": [...]}` with a string `id`, a
+        string `message` and a numeric `created_at` for every event.
+
+        Args:
+            headers (Dict[str, str]): The request headers.
+            body (bytes): The request body.
+
+        Returns:
+            Tuple[int, str]: The HTTP status and the reason of a rejection.
+        """
+        if self.webhook_secret:
+            timestamp = headers.get(TIMESTAMP_HEADER, "")
+            signature = headers.get(SIGNATURE_HEADER, "")
+            if (
+                not timestamp.isdigit()
+                or abs(time.time() - int(timestamp)) > WEBHOOK_TOLERANCE
+            ):
+                return 401, "Missing or expired timestamp"
+            expected = "sha256=" + sign_payload(self.webhook_secret, timestamp, body)
+            if not hmac.compare_digest(signature, expected):
+                return 401, "Invalid signature"
+
+        try:
+            events = json.loads(body)["events"]
+        except (ValueError, TypeError, KeyError):
+            return 400, "Body is not a JSON object with an events list"
+        if not isinstance(events, list) or not events:
+            return 400, "No events"
+        for event in events:
+            if not (
+                isinstance(event, dict)
+                and isinstance(event.get("id"), str)
+                and isinstance(event.get("message"), str)
+                and isinstance(event.get("created_at"), Number)
+            ):
+                return 400, f"Malformed event: {event}"
+
+        with self._lock:
+            self.webhook_batches.append(events)
+        logging.info(f"Webhook received {len(events)} event(s)")
+        return 200, ""
+
+    def close(self) -> None:
+        """
+        Stops the server.
+        """
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class MockVfsRequestHandler(BaseHTTPRequestHandler):
+    """Serves the pages and API of a `MockVfsSite`."""
+
+    mock_site: MockVfsSite = None
+
+    def do_GET(self) -> None:
+        time.sleep(self.mock_site.latency)
+        path = self.path.split("?", 1)[0]
+        if path.endswith("/login") or path.endswith("/dashboard"):
+            self._send(200, "text/html; charset=utf-8", self.mock_site.render_app())
+        else:
+            self._send(404, "text/plain", b"Not found")
+
+    def do_POST(self) -> None:
+        time.sleep(self.mock_site.latency)
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+        path = self.path.split("?", 1)[0]
+        if path == "/webhook":
+            status, reason = self.mock_site.receive_webhook(dict(self.headers), body)
+            self._send(status, "text/plain", reason.encode("utf-8"))
+        elif path == "/api/login":
+            self._send(
+                200,
+                "application/json",
+                b'{"ok": true}',
+                {"Set-Cookie": f"{SESSION_COOKIE}=1; Path=/"},
+            )
+        elif path == "/appointment/CheckIsSlotAvailable":
+            payload = json.dumps(self.mock_site.check_availability()).encode("utf-8")
+            self._send(200, "application/json", payload)
+        else:
+            self._send(404, "text/plain", b"Not found")
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+    def _send(
+        self,
+        status: int,
+        content_type: str,
+        body: bytes,
+        headers: Optional[dict] = None,
+    ) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serves a mock VFS booking site")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+    parser.add_argument("--port", type=int, default=8080, help="Port to listen on")
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Seconds every request is delayed by"
+    )
+    parser.add_argument(
+        "--slot-probability",
+        type=float,
+        default=0.0,
+        help="Probability that an availability check finds slots",
+    )
+    parser.add_argument(
+        "--webhook-secret",
+        help="Secret webhook requests must be signed with (default: unsigned)",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    site = MockVfsSite(
+        args.host,
+        args.port,
+        args.latency,
+        args.slot_probability,
+        webhook_secret=args.webhook_secret,
+    )
+    print(f"Mock VFS site running, log in at {site.login_url('ind', 'deu')}")
+    print(f"Webhook notifications are received on {site.base_url}/webhook")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        site.close()
+
+
+if __name__ == "__main__":
+    main()
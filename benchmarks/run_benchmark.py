@@ -0,0 +1,320 @@
+"""
+Benchmarks appointment checks against the local mock VFS site.
+
+The harness starts a `MockVfsSite`, points the bot configuration at it and
+runs `VfsBotDe` and `VfsBotIt` checks. It reports the p50/p95 latency of the
+whole check and of every phase measured by the bot's phase timer, then the
+throughput of N routes checked at once by the route runner. With `--probe`,
+it benchmarks the browserless HTTP probe against the availability API of the
+mock site instead, which needs no browser.
+
+Run it from the repository root with:
+
+    python -m benchmarks.run_benchmark --iterations 20 --routes 4 --latency 0.1
+    python -m benchmarks.run_benchmark --probe --iterations 200
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+from benchmarks.mock_vfs_site import DEFAULT_OPTIONS, MockVfsSite
+from vfs_appointment_bot.utils.config_reader import initialize_config
+from vfs_appointment_bot.vfs_bot.browser_manager import close_browser_manager
+from vfs_appointment_bot.vfs_bot.http_probe import HttpProbe, create_probe_session
+from vfs_appointment_bot.vfs_bot.response_capture import (
+    AvailabilityRequest,
+    get_availability_capture,
+)
+from vfs_appointment_bot.vfs_bot.route_runner import RouteRunner
+from vfs_appointment_bot.vfs_bot.vfs_bot import VfsBot
+from vfs_appointment_bot.vfs_bot.vfs_bot_de import VfsBotDe
+from vfs_appointment_bot.vfs_bot.vfs_bot_it import VfsBotIt
+
+# Routes benchmarked, with the path segments of their login URL
+ROUTES = [("IN", "DE", "ind", "deu"), ("AZ", "IT", "aze", "ita")]
+
+APPOINTMENT_PARAMS = {
+    "visa_center": DEFAULT_OPTIONS[0][0],
+    "visa_category": DEFAULT_OPTIONS[1][0],
+    "visa_sub_category": DEFAULT_OPTIONS[2][0],
+}
+
+
+def write_benchmark_config(
+    site: MockVfsSite, directory: str, args: argparse.Namespace
+) -> str:
+    """
+    Writes a user config pointing the bots at the mock site.
+
+    Notifications, the slot state and the check history are disabled, so
+    only the checks themselves are measured.
+
+    Args:
+        site (MockVfsSite): The running mock site.
+        directory (str): Directory for the config file and the session cache.
+        args (argparse.Namespace): The parsed benchmark arguments.
+
+    Returns:
+        str: The path of the config file.
+    """
+    vfs_urls = "\n".join(
+        f"{source}-{destination} = {site.login_url(source_path, destination_path)}"
+        for source, destination, source_path, destination_path in ROUTES
+    )
+    path = os.path.join(directory, "benchmark.ini")
+    with open(path, "w") as file:
+        file.write(f"""[vfs-url]
+{vfs_urls}
+
+[browser]
+type = {args.browser}
+headless = True
+
+[default]
+warm_poll = {args.warm_poll}
+
+[session]
+enabled = {args.session_cache}
+cache_dir = {os.path.join(directory, "sessions")}
+check_timeout = 2000
+
+[notification]
+channels =
+
+[slot-state]
+enabled = False
+
+[history]
+enabled = False
+
+[metrics]
+enabled = False
+
+[vfs-credential]
+email = benchmark@example.com
+password = benchmark
+""")
+    return path
+
+
+def percentile(values: List[float], percent: float) -> float:
+    """
+    Computes a percentile with the nearest-rank method.
+
+    Args:
+        values (List[float]): The measured values.
+        percent (float): The percentile, between 0 and 100.
+
+    Returns:
+        float: The percentile of the values, NaN if there are none.
+    """
+    if not values:
+        return math.nan
+    ordered = sorted(values)
+    rank = max(math.ceil(percent / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def run_sequential(
+    bots: List[VfsBot], iterations: int
+) -> Tuple[List[float], Dict[str, List[float]]]:
+    """
+    Checks every bot `iterations` times, one check at a time.
+
+    Args:
+        bots (List[VfsBot]): The bots to check with.
+        iterations (int): The number of checks per bot.
+
+    Returns:
+        Tuple[List[float], Dict[str, List[float]]]: The end-to-end durations and
+            the durations of every phase, in seconds.
+    """
+    durations = []
+    phases: Dict[str, List[float]] = {}
+    for _ in range(iterations):
+        for bot in bots:
+            start = time.perf_counter()
+            bot.run()
+            durations.append(time.perf_counter() - start)
+            for phase, duration in bot.phase_timer.durations.items():
+                phases.setdefault(phase, []).append(duration)
+    for bot in bots:
+        bot.close_warm_page()
+    return durations, phases
+
+
+def run_concurrent(num_routes: int, rounds: int) -> Tuple[float, List[float]]:
+    """
+    Checks `num_routes` routes at once with the route runner, `rounds` times.
+
+    Args:
+        num_routes (int): The number of routes checked at the same time.
+        rounds (int): The number of rounds.
+
+    Returns:
+        Tuple[float, List[float]]: The throughput in checks per second and the
+            duration of every round in seconds.
+    """
+    routes = []
+    for index in range(num_routes):
+        source, destination = ROUTES[index % len(ROUTES)][:2]
+        bot = VfsBotDe(source) if destination == "DE" else VfsBotIt(source)
+        routes.append((bot, APPOINTMENT_PARAMS))
+
+    runner = RouteRunner(num_routes)
+    round_durations = []
+    try:
+        for _ in range(rounds):
+            start = time.perf_counter()
+            runner.run(routes)
+            round_durations.append(time.perf_counter() - start)
+    finally:
+        runner.close()
+    return num_routes * rounds / sum(round_durations), round_durations
+
+
+def run_probe(site: MockVfsSite, iterations: int) -> List[float]:
+    """
+    Polls the availability API of the mock site with the HTTP probe.
+
+    The probe session is logged in through the mock login API and replays
+    the availability request the booking form sends, like a probe created
+    from a logged-in browser page.
+
+    Args:
+        site (MockVfsSite): The running mock site.
+        iterations (int): The number of availability requests.
+
+    Returns:
+        List[float]: The latency of every request in seconds.
+    """
+    session = create_probe_session()
+    session.post(f"{site.base_url}/api/login", data="{}", timeout=10).raise_for_status()
+    availability_request = AvailabilityRequest(
+        f"{site.base_url}/appointment/CheckIsSlotAvailable",
+        "POST",
+        {"Content-Type": "application/json"},
+        json.dumps({"params": list(APPOINTMENT_PARAMS.values())}),
+    )
+    probe = HttpProbe(session, availability_request, get_availability_capture(), 10)
+    try:
+        for _ in range(iterations):
+            probe.probe(APPOINTMENT_PARAMS)
+    finally:
+        probe.close()
+    return list(probe.latencies)
+
+
+def print_latency_table(durations: List[float], phases: Dict[str, List[float]]) -> None:
+    """
+    Prints the p50/p95 latency of the checks and of every phase.
+
+    Args:
+        durations (List[float]): The end-to-end durations in seconds.
+        phases (Dict[str, List[float]]): The durations of every phase in seconds.
+    """
+    print(f"{'':<18}{'p50 (s)':>10}{'p95 (s)':>10}{'count':>8}")
+    rows = [("end-to-end", durations)] + sorted(phases.items())
+    for name, values in rows:
+        print(
+            f"{name:<18}{percentile(values, 50):>10.3f}{percentile(values, 95):>10.3f}{len(values):>8}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmarks appointment checks against a mock VFS site"
+    )
+    parser.add_argument(
+        "--iterations",
+        type=int,
+        default=10,
+        help="Sequential checks per route (default: 10)",
+    )
+    parser.add_argument(
+        "--routes", type=int, default=4, help="Routes checked at once (default: 4)"
+    )
+    parser.add_argument(
+        "--rounds", type=int, default=3, help="Rounds of concurrent checks (default: 3)"
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.05,
+        help="Seconds every request is delayed by",
+    )
+    parser.add_argument(
+        "--slot-probability",
+        type=float,
+        default=0.2,
+        help="Probability that an availability check finds slots (default: 0.2)",
+    )
+    parser.add_argument(
+        "--browser", default="firefox", help="Browser type (default: firefox)"
+    )
+    parser.add_argument(
+        "--warm-poll",
+        action="store_true",
+        help="Keep the logged-in page between checks",
+    )
+    parser.add_argument(
+        "--session-cache",
+        action="store_true",
+        help="Restore cached sessions instead of logging in",
+    )
+    parser.add_argument(
+        "--probe",
+        action="store_true",
+        help="Benchmark the HTTP probe instead of the browser checks",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+    site = MockVfsSite(latency=args.latency, slot_probability=args.slot_probability)
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ["VFS_BOT_CONFIG_PATH"] = write_benchmark_config(
+            site, directory, args
+        )
+        initialize_config()
+        try:
+            if args.probe:
+                print(
+                    f"HTTP probe, {args.iterations} requests, {args.latency:g}s request latency"
+                )
+                print_latency_table(run_probe(site, args.iterations), {})
+                return
+
+            bots = []
+            for source, destination, _, _ in ROUTES:
+                bot = VfsBotDe(source) if destination == "DE" else VfsBotIt(source)
+                bot.appointment_params = APPOINTMENT_PARAMS
+                bots.append(bot)
+
+            print(
+                f"Sequential checks of {', '.join(f'{r[0]}-{r[1]}' for r in ROUTES)}, "
+                + f"{args.iterations} iterations, {args.latency:g}s request latency"
+            )
+            durations, phases = run_sequential(bots, args.iterations)
+            print_latency_table(durations, phases)
+            close_browser_manager()
+
+            print(f"\nConcurrent checks of {args.routes} routes, {args.rounds} rounds")
+            throughput, round_durations = run_concurrent(args.routes, args.rounds)
+            print(
+                f"throughput {throughput:.2f} checks/s, round p50 {percentile(round_durations, 50):.3f}s, "
+                + f"p95 {percentile(round_durations, 95):.3f}s"
+            )
+            print(f"\nMock site served {site.availability_checks} availability checks")
+        finally:
+            close_browser_manager()
+            site.close()
+
+
+if __name__ == "__main__":
+    main()
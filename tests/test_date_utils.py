@@ -0,0 +1,100 @@
+from datetime import date
+
+import pytest
+
+from vfs_appointment_bot.utils.date_utils import parse_dates, parse_dates_batch
+
+MAY_21 = date(2024, 5, 21)
+MAY_24 = date(2024, 5, 24)
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("Earliest Available Slot : 21-05-2024", [MAY_21]),
+        ("21/05/2024", [MAY_21]),
+        ("21.05.2024", [MAY_21]),
+        ("21/05/24", [MAY_21]),
+        ("2024-05-21", [MAY_21]),
+        ("2024/05/21", [MAY_21]),
+        ("05/21/2024", [MAY_21]),
+        ("Call 12-05-2024 - 2024-06-01", [date(2024, 5, 12), date(2024, 6, 1)]),
+    ],
+)
+def test_numeric_dates(text, expected):
+    assert list(parse_dates(text)) == expected
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "21 May 2024",
+        "21st of May 2024",
+        "May 21, 2024",
+        "May 21st 2024",
+        "21. Mai 2024",
+        "21 de mayo de 2024",
+        "21 mai 2024",
+        "21 maggio 2024",
+        "21 de maio de 2024",
+        "21 mei 2024",
+    ],
+)
+def test_localized_dates(text):
+    assert parse_dates(text) == (MAY_21,)
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("21-05-2024 to 24-05-2024", [MAY_21, MAY_24]),
+        ("21 - 24 May 2024", [MAY_21, MAY_24]),
+        ("between 21 and 24 May 2024", [MAY_21, MAY_24]),
+        ("21 May - 24 May 2024", [MAY_21, MAY_24]),
+        ("between 21 May and 24 May 2024", [MAY_21, MAY_24]),
+        ("21 May 2024 - 24 May 2024", [MAY_21, MAY_24]),
+        ("21. Mai bis 24. Mai 2024", [MAY_21, MAY_24]),
+        ("du 21 mai au 24 mai 2024", [MAY_21, MAY_24]),
+        ("May 21 - 24, 2024", [MAY_21, MAY_24]),
+        ("May 21 - May 24, 2024", [MAY_21, MAY_24]),
+        ("May 30 - June 2, 2024", [date(2024, 5, 30), date(2024, 6, 2)]),
+        ("30 May - 2 June 2024", [date(2024, 5, 30), date(2024, 6, 2)]),
+        ("30 Dec - 2 Jan 2025", [date(2024, 12, 30), date(2025, 1, 2)]),
+        ("Dec 30 - Jan 2, 2025", [date(2024, 12, 30), date(2025, 1, 2)]),
+    ],
+)
+def test_ranges_yield_their_first_and_last_day(text, expected):
+    assert list(parse_dates(text)) == expected
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "No appointment slots are currently available",
+        "1 out of 2024",
+        "10.30.00",
+        "Reference 123-456-7890",
+        "31/02/2024",
+    ],
+)
+def test_texts_without_dates(text):
+    assert parse_dates(text) == ()
+
+
+@pytest.mark.parametrize(
+    "text, day_first, expected",
+    [
+        ("05/06/2024", True, date(2024, 6, 5)),
+        ("05/06/2024", False, date(2024, 5, 6)),
+        ("21/05/2024", False, MAY_21),
+        ("05/21/2024", True, MAY_21),
+    ],
+)
+def test_ambiguous_numeric_dates(text, day_first, expected):
+    assert parse_dates(text, day_first) == (expected,)
+
+
+def test_batch_is_sorted_without_duplicates():
+    texts = ["24 May 2024", "21-05-2024 to 24-05-2024", "No slots"]
+
+    assert parse_dates_batch(texts) == [MAY_21, MAY_24]
@@ -0,0 +1,123 @@
+import multiprocessing
+import random
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+from vfs_appointment_bot.notification import notification_dispatcher, outbox
+from vfs_appointment_bot.notification.notification_dispatcher import (
+    NotificationDispatcher,
+)
+from vfs_appointment_bot.notification.outbox import NotificationOutbox
+from vfs_appointment_bot.notification.rate_limiter import RateLimiter
+
+CHANNELS = ["stub", "slow"]
+
+
+class StubClient:
+    """Answers after a random delay, sometimes past its deadline."""
+
+    timeout = 0.005
+
+    def __init__(self):
+        self._random = random.Random(0)
+        self._lock = threading.Lock()
+
+    def send_batch(self, notifications):
+        with self._lock:
+            delay = self._random.uniform(0, 0.01)
+        time.sleep(delay)
+
+
+def deliver_while_enqueueing(path: str) -> None:
+    dispatcher = NotificationDispatcher(4)
+    client = StubClient()
+    notification_outbox = NotificationOutbox(
+        path,
+        RateLimiter({}, 60),
+        retry_base=0.001,
+        retry_max=0.001,
+        poll_interval=0.0005,
+    )
+    with mock.patch.object(
+        notification_dispatcher, "get_notification_client", return_value=client
+    ), mock.patch.object(
+        outbox, "get_notification_dispatcher", return_value=dispatcher
+    ), mock.patch.object(
+        outbox, "close_notification_dispatcher", dispatcher.shutdown
+    ):
+        notification_outbox.start()
+        for index in range(300):
+            notification_outbox.enqueue(f"alert {index}", CHANNELS, f"key-{index}")
+        notification_outbox.close()
+
+
+@pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(), reason="needs fork"
+)
+def test_sends_completing_during_delivery_rounds_do_not_deadlock(tmp_path):
+    # Run in a child process, which can be killed if its threads deadlock
+    process = multiprocessing.get_context("fork").Process(
+        target=deliver_while_enqueueing, args=(str(tmp_path / "outbox.db"),)
+    )
+    process.start()
+    process.join(timeout=30)
+    if process.is_alive():
+        process.kill()
+        process.join()
+        pytest.fail("the outbox deadlocked")
+    assert process.exitcode == 0
+
+
+@pytest.fixture
+def make_outbox(tmp_path):
+    outboxes = []
+
+    def make(**kwargs) -> NotificationOutbox:
+        notification_outbox = NotificationOutbox(
+            str(tmp_path / "outbox.db"), RateLimiter({}, 60), **kwargs
+        )
+        outboxes.append(notification_outbox)
+        return notification_outbox
+
+    yield make
+    for notification_outbox in outboxes:
+        notification_outbox._connection.close()
+
+
+def give_up(notification_outbox: NotificationOutbox, key: str, created_at: float):
+    notification_outbox._connection.execute(
+        "UPDATE outbox SET attempts = ?, created_at = ? WHERE idempotency_key = ?",
+        (notification_outbox.max_attempts, created_at, f"{key}:stub"),
+    )
+
+
+def test_given_up_notification_is_queued_again(make_outbox):
+    notification_outbox = make_outbox(max_attempts=3)
+    notification_outbox.enqueue("alert", ["stub"], "key")
+    give_up(notification_outbox, "key", time.time())
+    assert notification_outbox.get_queue_stats() == {}
+
+    notification_outbox.enqueue("alert", ["stub"], "key")
+
+    assert notification_outbox.get_queue_stats()["stub"].depth == 1
+
+
+def test_given_up_notifications_are_purged_after_retention(make_outbox):
+    notification_outbox = make_outbox(retention=60)
+    for key in ["old", "recent", "pending"]:
+        notification_outbox.enqueue(f"{key} alert", ["stub"], key)
+    give_up(notification_outbox, "old", time.time() - 120)
+    give_up(notification_outbox, "recent", time.time())
+
+    notification_outbox._purge_finished()
+
+    keys = [
+        key
+        for (key,) in notification_outbox._connection.execute(
+            "SELECT idempotency_key FROM outbox ORDER BY id"
+        )
+    ]
+    assert keys == ["recent:stub", "pending:stub"]
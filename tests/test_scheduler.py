@@ -0,0 +1,137 @@
+import pytest
+
+from vfs_appointment_bot.utils.scheduler import CheckOutcome, PollingScheduler
+
+# Noon on Monday 15 January 2024 UTC, away from any DST change
+NOW = 1705320000.0
+HOUR = 3600
+
+
+class FakeClock:
+    def __init__(self, now: float = NOW):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_scheduler(**kwargs) -> PollingScheduler:
+    options = {
+        "base_interval": 100,
+        "min_interval": 10,
+        "max_interval": 1000,
+        "backoff_factor": 2,
+        "jitter": 0,
+        "hot_interval": 30,
+        "clock": FakeClock(),
+        "rng": lambda: 0.5,
+    }
+    options.update(kwargs)
+    return PollingScheduler(**options)
+
+
+@pytest.mark.parametrize(
+    "outcome",
+    [CheckOutcome.ERROR, CheckOutcome.LOGIN_ERROR, CheckOutcome.TIMEOUT],
+)
+def test_failures_back_off_exponentially_up_to_max_interval(outcome):
+    scheduler = make_scheduler()
+
+    intervals = []
+    for _ in range(5):
+        scheduler.record(outcome)
+        intervals.append(scheduler.next_interval())
+
+    assert intervals == [200, 400, 800, 1000, 1000]
+
+
+def test_successful_check_resets_backoff():
+    scheduler = make_scheduler()
+    for _ in range(3):
+        scheduler.record(CheckOutcome.ERROR)
+
+    scheduler.record(CheckOutcome.NOT_FOUND)
+
+    assert scheduler.next_interval() == 100
+
+
+def test_backoff_does_not_overflow_after_many_failures():
+    scheduler = make_scheduler(max_interval=1e9)
+    for _ in range(10000):
+        scheduler.record(CheckOutcome.ERROR)
+
+    assert scheduler.next_interval() == 1e9
+
+
+@pytest.mark.parametrize("random_value, expected", [(0.0, 90), (0.5, 100), (1.0, 110)])
+def test_jitter_stays_within_bounds(random_value, expected):
+    scheduler = make_scheduler(jitter=0.1, rng=lambda: random_value)
+
+    assert scheduler.next_interval() == pytest.approx(expected)
+
+
+def test_jitter_is_clamped_to_min_and_max_interval():
+    low = make_scheduler(base_interval=10, jitter=0.5, rng=lambda: 0.0)
+    high = make_scheduler(base_interval=1000, jitter=0.5, rng=lambda: 1.0)
+
+    assert low.next_interval() == 10
+    assert high.next_interval() == 1000
+
+
+def test_base_interval_override():
+    scheduler = make_scheduler()
+
+    assert scheduler.next_interval(50) == 50
+
+
+def test_found_slot_tightens_interval_in_the_same_hour_of_the_week():
+    clock = FakeClock()
+    scheduler = make_scheduler(clock=clock)
+
+    scheduler.record(CheckOutcome.FOUND)
+
+    assert scheduler.is_hot_window()
+    assert scheduler.next_interval() == 30
+    clock.now += HOUR
+    assert not scheduler.is_hot_window()
+    assert scheduler.next_interval() == 100
+    clock.now += 7 * 24 * HOUR - HOUR
+    assert scheduler.next_interval() == 30
+
+
+def test_hot_window_threshold():
+    scheduler = make_scheduler(hot_window_threshold=2)
+
+    scheduler.record(CheckOutcome.FOUND)
+    assert not scheduler.is_hot_window()
+    scheduler.record(CheckOutcome.FOUND)
+    assert scheduler.is_hot_window()
+
+
+def test_backoff_takes_precedence_over_hot_window():
+    scheduler = make_scheduler()
+    scheduler.record(CheckOutcome.FOUND)
+
+    scheduler.record(CheckOutcome.ERROR)
+
+    assert scheduler.next_interval() == 200
+
+
+def test_hot_windows_persist_across_restarts(tmp_path):
+    state_path = str(tmp_path / "scheduler.json")
+    make_scheduler(state_path=state_path).record(CheckOutcome.FOUND)
+
+    restarted = make_scheduler(state_path=state_path)
+
+    assert restarted.is_hot_window()
+    assert restarted.next_interval() == 30
+
+
+def test_unreadable_state_starts_without_hot_windows(tmp_path):
+    state_path = tmp_path / "scheduler.json"
+    state_path.write_text("not json")
+
+    scheduler = make_scheduler(state_path=str(state_path))
+
+    assert scheduler.hot_windows == {}
+    assert scheduler.next_interval() == 100
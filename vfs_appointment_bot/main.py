@@ -1,11 +1,41 @@
 import argparse
 import logging
 import sys
-from typing import Dict
+import time
+from datetime import datetime
+from typing import Dict, Optional
 
+from vfs_appointment_bot.notification.notification_client import (
+    NotificationClientConfigValidationError,
+)
+from vfs_appointment_bot.notification.notification_client_factory import (
+    UnsupportedNotificationChannelError,
+    close_notification_clients,
+    initialize_notification_clients,
+)
+from vfs_appointment_bot.notification.notification_dispatcher import (
+    close_notification_dispatcher,
+)
+from vfs_appointment_bot.notification.outbox import (
+    close_notification_outbox,
+    get_notification_outbox,
+)
+from vfs_appointment_bot.utils.check_history import CheckHistory, get_check_history
 from vfs_appointment_bot.utils.config_reader import get_config_value, initialize_config
-from vfs_appointment_bot.utils.timer import countdown
-from vfs_appointment_bot.vfs_bot.vfs_bot import LoginError
+from vfs_appointment_bot.utils.metrics import (
+    close_metrics_server,
+    start_metrics_server,
+)
+from vfs_appointment_bot.utils.scheduler import CheckOutcome, get_polling_scheduler
+from vfs_appointment_bot.utils.timer import get_periodic_timer
+from vfs_appointment_bot.utils.watchlist_reader import WatchlistError, read_watchlist
+from vfs_appointment_bot.vfs_bot.browser_manager import close_browser_manager
+from vfs_appointment_bot.vfs_bot.route_runner import RouteRunner
+from vfs_appointment_bot.vfs_bot.session_cache import SessionCache
+from vfs_appointment_bot.vfs_bot.vfs_bot import (
+    InvalidAppointmentParamError,
+    LoginError,
+)
 from vfs_appointment_bot.vfs_bot.vfs_bot_factory import (
     UnsupportedCountryError,
     get_vfs_bot,
@@ -51,14 +81,15 @@ def main() -> None:
     parser = argparse.ArgumentParser(
         description="VFS Appointment Bot: Checks for appointments at VFS Global"
     )
-    required_args = parser.add_argument_group("required arguments")
+    required_args = parser.add_argument_group(
+        "required arguments (unless --routes or --watchlist is used)"
+    )
     required_args.add_argument(
         "-sc",
         "--source-country-code",
         type=str,
         help="The ISO 3166-1 alpha-2 source country code (refer to README)",
         metavar="<country_code>",
-        required=True,
     )
 
     required_args.add_argument(
@@ -67,7 +98,23 @@ def main() -> None:
         type=str,
         help="The ISO 3166-1 alpha-2 destination country code (refer to README)",
         metavar="<country_code>",
-        required=True,
+    )
+
+    parser.add_argument(
+        "-r",
+        "--routes",
+        type=str,
+        default=None,
+        help="Comma-separated routes checked concurrently, e.g. IN-DE,MA-IT (refer to README)",
+        metavar="<source-destination,...>",
+    )
+
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help="Maximum number of routes checked at the same time (used with --routes)",
+        metavar="<count>",
     )
 
     parser.add_argument(
@@ -80,24 +127,339 @@ def main() -> None:
         metavar="<key1=value1,key2=value2,...>",
     )
 
+    parser.add_argument(
+        "-w",
+        "--watchlist",
+        type=str,
+        default=None,
+        help="Path of a watchlist file with routes and appointment parameters (refer to README)",
+        metavar="<path>",
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of worker processes checking the watchlist (used with --watchlist)",
+        metavar="<count>",
+    )
+
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Watch the booking form for new appointments instead of polling (single route only)",
+    )
+
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Run a single check under cProfile and save the sorted stats (single route only)",
+    )
+
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="Run a single check with a Playwright trace and a span log of its steps (single route only)",
+    )
+
+    parser.add_argument(
+        "--clear-session",
+        action="store_true",
+        help="Discard cached login sessions and log in again",
+    )
+
+    subparsers = parser.add_subparsers(dest="command", metavar="<command>")
+    history_parser = subparsers.add_parser(
+        "history",
+        help="Query the history of appointment checks (refer to README)",
+        description="Lists past appointment checks, newest first",
+    )
+    history_parser.add_argument(
+        "--route",
+        type=str,
+        default=None,
+        help="Only checks of this route, e.g. IN-DE",
+        metavar="<source-destination>",
+    )
+    history_parser.add_argument(
+        "--days",
+        type=float,
+        default=30,
+        help="Only checks of the last <days> days (default: 30)",
+        metavar="<days>",
+    )
+    history_parser.add_argument(
+        "--outcome",
+        type=str,
+        default=CheckOutcome.FOUND.value,
+        choices=[outcome.value for outcome in CheckOutcome] + ["all"],
+        help="Only checks with this outcome (default: found)",
+    )
+    history_parser.add_argument(
+        "--limit",
+        type=int,
+        default=50,
+        help="Maximum number of checks listed (default: 50)",
+        metavar="<count>",
+    )
+    history_parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Show the number of checks per outcome and the average phase durations",
+    )
+
     args = parser.parse_args()
+    if args.command == "history":
+        run_history(args)
+        return
+
+    if not (args.routes or args.watchlist) and not (
+        args.source_country_code and args.destination_country_code
+    ):
+        parser.error(
+            "the following arguments are required: -sc/--source-country-code, "
+            + "-dc/--destination-country-code (or -r/--routes or -w/--watchlist)"
+        )
+    if args.routes and args.appointment_params is not None:
+        parser.error(
+            "-ap/--appointment-params cannot be used with -r/--routes, since routes "
+            + "need different parameters; use -w/--watchlist to give them per route"
+        )
+
+    if args.clear_session:
+        clear_session_cache()
+
+    try:
+        if args.watchlist:
+            run_watchlist(args)
+        else:
+            start_metrics_server()
+            initialize_notification_clients()
+            get_notification_outbox()
+            if args.routes:
+                run_routes(args)
+            else:
+                run_route(args)
+    except (
+        UnsupportedCountryError,
+        LoginError,
+        InvalidAppointmentParamError,
+        WatchlistError,
+        UnsupportedNotificationChannelError,
+        NotificationClientConfigValidationError,
+    ) as e:
+        logging.error(e)
+    except Exception as e:
+        logging.exception(e)
+    finally:
+        close_browser_manager()
+        close_notification_outbox()
+        close_notification_dispatcher()
+        close_notification_clients()
+        close_metrics_server()
+
+
+def clear_session_cache() -> None:
+    """
+    Discards the cached login sessions.
+
+    Sessions are removed even if the session cache is disabled now, so the
+    cookies saved while it was enabled do not stay on disk.
+    """
+    SessionCache(get_config_value("session", "cache_dir", ".vfs_sessions"), 0).clear()
+    logging.info("Cleared cached login sessions")
+
+
+def run_route(args: argparse.Namespace) -> None:
+    """
+    Checks a single route until appointments are found.
+
+    Args:
+        args (argparse.Namespace): The parsed command-line arguments.
+    """
     source_country_code = args.source_country_code
     destination_country_code = args.destination_country_code
+    vfs_bot = get_vfs_bot(source_country_code, destination_country_code)
+    if args.profile or args.trace:
+        # Imported here so that the profiling code is only loaded when used
+        from vfs_appointment_bot.vfs_bot.check_profiler import run_profiled_check
+
+        run_profiled_check(vfs_bot, args, args.profile, args.trace)
+        return
+
+    # A single route has nothing to coalesce its alerts with
+    vfs_bot.urgent_alerts = True
+    scheduler = get_polling_scheduler()
+    periodic_timer = get_periodic_timer()
+    while True:
+        periodic_timer.mark_start()
+        try:
+            if args.watch:
+                appointment_found = vfs_bot.watch(args)
+            else:
+                appointment_found = vfs_bot.run(args)
+            scheduler.record(vfs_bot.last_outcome or CheckOutcome.NOT_FOUND)
+        except LoginError as e:
+            logging.error(e)
+            appointment_found = False
+            scheduler.record(CheckOutcome.LOGIN_ERROR)
+        if appointment_found:
+            break
+
+        base_interval = None
+        if vfs_bot.http_probe is not None:
+            base_interval = float(get_config_value("http-probe", "interval", "30"))
+        periodic_timer.wait(
+            scheduler.next_interval(base_interval), "Next appointment check in"
+        )
+
+
+def run_routes(args: argparse.Namespace) -> None:
+    """
+    Checks several routes concurrently on a pool of threads.
+
+    Routes are dropped once appointments have been found for them, and the
+    function returns when no route is left.
+
+    Args:
+        args (argparse.Namespace): The parsed command-line arguments.
+    """
+    routes = []
+    for route in args.routes.split(","):
+        source_country_code, destination_country_code = route.strip().split("-")
+        vfs_bot = get_vfs_bot(
+            source_country_code.upper(), destination_country_code.upper()
+        )
+        routes.append((vfs_bot, vfs_bot.get_appointment_params(args)))
+
+    concurrency = args.concurrency or int(
+        get_config_value("default", "concurrency", "4")
+    )
+    runner = RouteRunner(concurrency)
+    scheduler = get_polling_scheduler()
+    periodic_timer = get_periodic_timer()
+    try:
+        while routes:
+            periodic_timer.mark_start()
+            results = runner.run(routes)
+            scheduler.record(
+                CheckOutcome.FOUND if any(results) else CheckOutcome.NOT_FOUND
+            )
+            routes = [route for route, found in zip(routes, results) if not found]
+            if not routes:
+                break
+            periodic_timer.wait(scheduler.next_interval(), "Next appointment check in")
+    finally:
+        runner.close()
+
+
+def run_watchlist(args: argparse.Namespace) -> None:
+    """
+    Checks every watchlist entry on a pool of pre-forked worker processes.
+
+    Entries are dropped once appointments have been found for them, and the
+    function returns when no entry is left. A per-worker throughput and latency
+    summary is logged after every round.
+
+    Args:
+        args (argparse.Namespace): The parsed command-line arguments.
+    """
+    entries = read_watchlist(args.watchlist)
+    num_workers = args.workers or int(get_config_value("default", "workers", "2"))
+
+    # Imported here so that Playwright is only loaded before forking when the
+    # watchlist mode is actually used.
+    from vfs_appointment_bot.vfs_bot.worker_pool import WorkerPool
+
+    worker_pool = WorkerPool(min(num_workers, len(entries)))
+    scheduler = get_polling_scheduler()
+    periodic_timer = get_periodic_timer()
     try:
-        while True:
-            vfs_bot = get_vfs_bot(source_country_code, destination_country_code)
-            appointment_found = vfs_bot.run(args)
-            if appointment_found:
+        # Started after forking, so the workers do not inherit the server
+        # thread or open notification connections. The workers deliver the
+        # notifications themselves; the clients are only validated here.
+        start_metrics_server()
+        initialize_notification_clients()
+        while entries:
+            periodic_timer.mark_start()
+            results = worker_pool.run(entries)
+            worker_pool.log_summary()
+            if any(result.found for result in results):
+                scheduler.record(CheckOutcome.FOUND)
+            elif all(result.error is not None for result in results):
+                scheduler.record(CheckOutcome.ERROR)
+            else:
+                scheduler.record(CheckOutcome.NOT_FOUND)
+            entries = [
+                entry for entry, result in zip(entries, results) if not result.found
+            ]
+            if not entries:
                 break
-            countdown(
-                int(get_config_value("default", "interval")),
-                "Next appointment check in",
+            periodic_timer.wait(scheduler.next_interval(), "Next appointment check in")
+    finally:
+        worker_pool.close()
+
+
+def run_history(args: argparse.Namespace) -> None:
+    """
+    Prints the appointment checks recorded in the check history.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments of the `history` command.
+    """
+    check_history = get_check_history()
+    if check_history is None:
+        logging.error(
+            "The check history is disabled, see the history section of the config"
+        )
+        return
+
+    since = time.time() - args.days * 86400
+    outcome = None if args.outcome == "all" else args.outcome
+    try:
+        if args.stats:
+            print_history_stats(check_history, args.route, since)
+            return
+
+        checks = check_history.query(args.route, since, outcome, args.limit)
+        if not checks:
+            print(f"No {args.outcome} checks in the last {args.days:g} days")
+            return
+        for check in checks:
+            started_at = datetime.fromtimestamp(check.started_at).strftime(
+                "%Y-%m-%d %H:%M:%S"
             )
+            print(
+                f"{started_at}  {check.route:<6}  {check.outcome:<11}  {check.duration:6.1f}s  "
+                + f"{', '.join(check.params.values())}"
+                + (f"  dates: {', '.join(check.dates)}" if check.dates else "")
+                + (f"  error: {check.error}" if check.error else "")
+            )
+    finally:
+        check_history.close()
 
-    except (UnsupportedCountryError, LoginError) as e:
-        logging.error(e)
-    except Exception as e:
-        logging.exception(e)
+
+def print_history_stats(
+    check_history: CheckHistory, route: Optional[str], since: float
+) -> None:
+    """
+    Prints the number of checks per outcome and the average phase durations.
+
+    Args:
+        check_history (CheckHistory): The check history.
+        route (Optional[str]): Only checks of this route, or None for all routes.
+        since (float): Only checks started after this UNIX time.
+    """
+    outcome_counts = check_history.count_outcomes(route, since)
+    print("Checks per outcome:")
+    for outcome, count in sorted(outcome_counts.items()):
+        print(f"  {outcome:<11} {count}")
+
+    phase_averages = check_history.get_phase_averages(route, since)
+    if phase_averages:
+        print("Average phase durations:")
+        for phase, duration in phase_averages.items():
+            print(f"  {phase:<15} {duration:6.2f}s")
 
 
 def initialize_logger():
@@ -0,0 +1,93 @@
+from typing import Dict, List, Sequence
+
+from vfs_appointment_bot.utils.config_reader import get_config_value
+
+
+class AlertCoalescer:
+    """
+    Merges notifications sent close together into one batch per channel.
+
+    Notifications are held back for `window` seconds after they are queued.
+    When the first of them is due, every notification of the same channel
+    queued within the window is sent along in the same batch, which most
+    channels deliver as a single digest message, so several routes opening
+    at once cost one message per channel instead of one per route. Urgent
+    notifications are due immediately and take the notifications already
+    waiting on their channel with them. With a window of 0, only
+    notifications that are due at the same time are batched.
+    """
+
+    def __init__(self, window: float, max_batch: int = 20):
+        """
+        Initializes the coalescer.
+
+        Args:
+            window (float): Seconds a notification waits for others to join it.
+            max_batch (int): Maximum number of notifications in one digest.
+        """
+        self.window = window
+        self.max_batch = max_batch
+
+    def get_due_time(self, now: float, urgent: bool = False) -> float:
+        """
+        Computes when a notification queued now should be sent.
+
+        Args:
+            now (float): The current UNIX time.
+            urgent (bool): Whether the notification bypasses the window.
+
+        Returns:
+            float: The UNIX time at which the notification is due.
+        """
+        return now if urgent else now + self.window
+
+    def group(self, rows: Sequence) -> List[List]:
+        """
+        Splits outbox rows into the batches that are sent together.
+
+        Args:
+            rows (Sequence): Outbox rows with a `channel` attribute, oldest first.
+
+        Returns:
+            List[List]: Batches of at most `max_batch` rows of the same channel,
+                in the order of their oldest row.
+        """
+        rows_by_channel: Dict[str, List] = {}
+        for row in rows:
+            rows_by_channel.setdefault(row.channel, []).append(row)
+        batches = []
+        for channel_rows in rows_by_channel.values():
+            for start in range(0, len(channel_rows), self.max_batch):
+                end = start + self.max_batch
+                batches.append(channel_rows[start:end])
+        return batches
+
+
+def get_alert_coalescer() -> AlertCoalescer:
+    """
+    Creates an `AlertCoalescer` from the `coalescing` configuration section.
+
+    Returns:
+        AlertCoalescer: The coalescer, with a window of 0 if coalescing is disabled.
+    """
+    enabled = get_config_value("coalescing", "enabled", "False") in ("True", "true")
+    return AlertCoalescer(
+        float(get_config_value("coalescing", "window", "3")) if enabled else 0,
+        int(get_config_value("coalescing", "max_batch", "20")),
+    )
+
+
+def is_urgent_route(route: str) -> bool:
+    """
+    Checks whether the notifications of a route bypass the coalescing window.
+
+    Args:
+        route (str): The route, e.g. "in-de".
+
+    Returns:
+        bool: True if the route is listed in `urgent_routes` of the `coalescing` section.
+    """
+    urgent_routes = get_config_value("coalescing", "urgent_routes", "")
+    return route.lower() in (
+        urgent_route.strip().lower() for urgent_route in urgent_routes.split(",")
+    )
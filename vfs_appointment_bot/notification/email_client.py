@@ -1,7 +1,17 @@
 import smtplib
 import logging
+import threading
+from typing import Optional
 
-from vfs_appointment_bot.notification.notification_client import NotificationClient
+from vfs_appointment_bot.notification.notification_client import (
+    NotificationClient,
+    RateLimitedError,
+)
+
+# Temporary rejections that signal too many connections or messages, and the
+# enhanced status code of Gmail's daily sending limit
+SMTP_THROTTLING_CODES = {421, 450, 451, 452, 454}
+SMTP_QUOTA_STATUS = "5.4.5"
 
 
 class EmailClient(NotificationClient):
@@ -11,34 +21,103 @@ class EmailClient(NotificationClient):
 
         This constructor retrieves configuration settings from the designated
         section (e.g., `"email"`) of the application configuration and
-        validates them using the base class validation logic.
+        validates them using the base class validation logic. It then opens
+        the SMTP connection, so that the first notification does not have to
+        wait for the TLS handshake and login.
         """
         required_keys = ["email", "password"]
         super().__init__("email", required_keys)
+        self._smtp_server: Optional[smtplib.SMTP_SSL] = None
+        self._lock = threading.Lock()
+        try:
+            with self._lock:
+                self.__connect()
+        except (smtplib.SMTPException, OSError) as e:
+            logging.warning(
+                f"Failed to connect to the SMTP server, retrying on send: {e}"
+            )
 
     def send_notification(self, message: str) -> None:
         """
         Sends a notification message through the email channel.
 
-        This method sends an email notification using the provided message content.
-        It connects securely to the configured SMTP server (e.g., Gmail's SMTP),
-        authenticates with the provided credentials, and constructs a well-formatted
-        email before sending it.
+        This method sends an email notification using the provided message content
+        over a persistent connection to the configured SMTP server (e.g., Gmail's SMTP).
+        If the connection was dropped since the last message, it reconnects,
+        authenticates with the provided credentials and sends the email again.
 
         Args:
             message (str): The message content to be included in the email.
+
+        Raises:
+            RateLimitedError: If the SMTP server throttles the sender or the daily
+                sending limit is reached.
         """
         email: str = self.config.get("email")
-        password: str = self.config.get("password")
         email_text = self.__construct_email_text(email, message)
 
-        smtp_server = smtplib.SMTP_SSL("smtp.gmail.com", 465)
-        smtp_server.ehlo()
-        smtp_server.login(email, password)
-        smtp_server.sendmail(email, email, email_text)
-        smtp_server.close()
+        with self._lock:
+            try:
+                self.__send(email, email_text)
+            except smtplib.SMTPResponseException as e:
+                if e.smtp_code in SMTP_THROTTLING_CODES or SMTP_QUOTA_STATUS in str(
+                    e.smtp_error
+                ):
+                    self.__disconnect()
+                    raise RateLimitedError(f"SMTP server throttled the sender: {e}")
+                raise
         logging.info("Email sent successfully!")
 
+    def close(self) -> None:
+        """
+        Closes the SMTP connection.
+        """
+        with self._lock:
+            if self._smtp_server is not None:
+                try:
+                    self._smtp_server.quit()
+                except (smtplib.SMTPException, OSError):
+                    pass
+            self.__disconnect()
+
+    def __send(self, email: str, email_text: str) -> None:
+        """
+        Sends an email, reconnecting once if the connection was dropped.
+        """
+        try:
+            if self._smtp_server is None:
+                self.__connect()
+            self._smtp_server.sendmail(email, email, email_text)
+        except smtplib.SMTPResponseException:
+            # The server answered, so the connection is fine
+            raise
+        except OSError:
+            logging.debug("SMTP connection lost, reconnecting")
+            self.__disconnect()
+            self.__connect()
+            self._smtp_server.sendmail(email, email, email_text)
+
+    def __connect(self) -> None:
+        """
+        Opens an authenticated connection to the SMTP server.
+        """
+        smtp_server = smtplib.SMTP_SSL("smtp.gmail.com", 465, timeout=self.timeout)
+        try:
+            smtp_server.ehlo()
+            smtp_server.login(self.config.get("email"), self.config.get("password"))
+        except Exception:
+            smtp_server.close()
+            raise
+        self._smtp_server = smtp_server
+
+    def __disconnect(self) -> None:
+        """
+        Drops the SMTP connection without waiting for the server.
+        """
+        if self._smtp_server is not None:
+            self._smtp_server.close()
+            self._smtp_server = None
+
     def __construct_email_text(self, email: str, message: str) -> str:
         """
         Constructs a formatted email text with sender, receiver, subject,
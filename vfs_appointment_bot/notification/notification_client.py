@@ -1,7 +1,20 @@
 from abc import ABC, abstractmethod
-from typing import List
+from dataclasses import dataclass
+from typing import List, Optional
 
-from vfs_appointment_bot.utils.config_reader import get_config_section
+from vfs_appointment_bot.utils.config_reader import (
+    get_config_section,
+    get_config_value,
+)
+
+
+@dataclass
+class Notification:
+    """A message queued for a notification channel."""
+
+    message: str
+    idempotency_key: Optional[str] = None
+    created_at: Optional[float] = None
 
 
 class NotificationClient(ABC):
@@ -26,6 +39,7 @@ class NotificationClient(ABC):
         self.required_keys = required_config_keys
         self.config = get_config_section(config_section)
         self._validate_config(required_config_keys)
+        self.timeout = get_channel_timeout(config_section)
 
     @abstractmethod
     def send_notification(self, message: str) -> None:
@@ -40,6 +54,27 @@ class NotificationClient(ABC):
             message (str): The message content to be sent.
         """
 
+    def send_batch(self, notifications: List[Notification]) -> None:
+        """
+        Sends several notification messages at once.
+
+        The default implementation sends a single notification as it is and
+        combines several into one digest message. Clients whose channel can
+        carry several messages in one request override this method.
+
+        Args:
+            notifications (List[Notification]): The notifications to be sent.
+        """
+        self.send_notification(format_digest([n.message for n in notifications]))
+
+    def close(self) -> None:
+        """
+        Releases the connections held by the client.
+
+        Clients that keep connections open between notifications override this
+        method; the default implementation does nothing.
+        """
+
     def _validate_config(self, required_config_keys: list[str]):
         """
         Validates the configuration of the notification client.
@@ -65,9 +100,59 @@ class NotificationClient(ABC):
                 )
 
 
+def format_digest(messages: List[str]) -> str:
+    """
+    Combines several notification messages into one.
+
+    Args:
+        messages (List[str]): The messages to combine.
+
+    Returns:
+        str: The digest message, or the message itself if there is only one.
+    """
+    if len(messages) == 1:
+        return messages[0]
+    return f"{len(messages)} appointment alerts:\n" + "\n".join(
+        f"- {message}" for message in messages
+    )
+
+
+def get_channel_timeout(config_section: str) -> float:
+    """
+    Returns the deadline of a notification channel in seconds.
+
+    The `timeout` key of the channel's own section takes precedence over the
+    `timeout` key of the `notification` section.
+
+    Args:
+        config_section (str): The configuration section of the channel.
+
+    Returns:
+        float: The deadline in seconds.
+    """
+    default_timeout = get_config_value("notification", "timeout", "10")
+    return float(get_config_value(config_section, "timeout", default_timeout))
+
+
 class NotificationClientConfigValidationError(Exception):
     """Exception raised when notification client configuration validation fails."""
 
 
 class NotificationClientError(Exception):
     """Exception raised when an error occurs during notification sending."""
+
+
+class RateLimitedError(NotificationClientError):
+    """Exception raised when the provider of a channel throttles the sender."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        """
+        Initializes the exception.
+
+        Args:
+            message (str): The error message.
+            retry_after (Optional[float]): Seconds the provider asked to wait
+                before sending again, if it said so.
+        """
+        super().__init__(message)
+        self.retry_after = retry_after
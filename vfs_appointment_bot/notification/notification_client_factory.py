@@ -1,4 +1,12 @@
+import logging
+import threading
+from typing import Dict
+
 from vfs_appointment_bot.notification.notification_client import NotificationClient
+from vfs_appointment_bot.utils.config_reader import get_config_value
+
+_notification_clients: Dict[str, NotificationClient] = {}
+_notification_clients_lock = threading.Lock()
 
 
 class UnsupportedNotificationChannelError(Exception):
@@ -8,10 +16,11 @@ class UnsupportedNotificationChannelError(Exception):
 def get_notification_client(channel: str) -> NotificationClient:
     """Retrieves the appropriate notification client for a given channel.
 
-    This function creates an instance of a notification client class based on the
-    provided channel string. Currently supported channels include "telegram" and
-    "slack". If an unsupported channel is provided, a `ValueError` exception is
-    raised.
+    Clients are process-scoped singletons: the client of a channel is created on
+    first use (or by `initialize_notification_clients`) and reused afterwards, so
+    that its connections stay open between notifications. Currently supported
+    channels include "telegram", "slack", "email" and "webhook". If an unsupported channel
+    is provided, an `UnsupportedNotificationChannelError` exception is raised.
 
     Args:
         channel (str): The notification channel name.
@@ -22,7 +31,48 @@ def get_notification_client(channel: str) -> NotificationClient:
     Raises:
         UnsupportedNotificationChannelError: If the provided notification channel is not supported.
     """
+    with _notification_clients_lock:
+        client = _notification_clients.get(channel)
+        if client is None:
+            client = _create_notification_client(channel)
+            _notification_clients[channel] = client
+        return client
+
+
+def initialize_notification_clients() -> None:
+    """
+    Creates and validates the clients of all configured notification channels.
+
+    Called at startup, so that configuration errors surface before the first
+    check and the first notification does not pay for setting up the client.
+    Clients inherited from a parent process are replaced, since their
+    connections cannot be shared.
 
+    Raises:
+        UnsupportedNotificationChannelError: If a configured channel is not supported.
+        NotificationClientConfigValidationError: If a channel is misconfigured.
+    """
+    channels = get_config_value("notification", "channels")
+    with _notification_clients_lock:
+        _notification_clients.clear()
+        for channel in filter(None, channels.split(",")):
+            _notification_clients[channel] = _create_notification_client(channel)
+
+
+def close_notification_clients() -> None:
+    """
+    Closes the connections of all notification clients.
+    """
+    with _notification_clients_lock:
+        for channel, client in _notification_clients.items():
+            try:
+                client.close()
+            except Exception as e:
+                logging.debug(f"Failed to close {channel} notification client: {e}")
+        _notification_clients.clear()
+
+
+def _create_notification_client(channel: str) -> NotificationClient:
     if channel == "telegram":
         from .telegram_client import TelegramClient
 
@@ -35,6 +85,10 @@ def get_notification_client(channel: str) -> NotificationClient:
         from .email_client import EmailClient
 
         return EmailClient()
+    elif channel == "webhook":
+        from .webhook_client import WebhookClient
+
+        return WebhookClient()
     else:
         raise UnsupportedNotificationChannelError(
             f"Notification channel '{channel}' is not supported"
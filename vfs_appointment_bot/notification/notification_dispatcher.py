@@ -0,0 +1,216 @@
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import Dict, List, Optional, Set
+
+from vfs_appointment_bot.notification.notification_client import (
+    Notification,
+    NotificationClient,
+    RateLimitedError,
+)
+from vfs_appointment_bot.notification.notification_client_factory import (
+    get_notification_client,
+)
+from vfs_appointment_bot.utils.config_reader import get_config_value
+from vfs_appointment_bot.utils.metrics import observe_delivery
+
+_notification_dispatcher: "NotificationDispatcher" = None
+
+
+@dataclass
+class DeliveryResult:
+    """Outcome of sending one notification on one channel."""
+
+    channel: str
+    success: bool
+    latency: float
+    error: Optional[str] = None
+    rate_limited: bool = False
+    retry_after: Optional[float] = None
+
+
+class NotificationDispatcher:
+    """
+    Sends notifications to all channels in parallel on a thread pool.
+
+    `submit` returns immediately, so the caller never waits for a slow
+    channel. Every channel has a deadline (its `timeout` setting): clients use
+    it as their network timeout, and a delivery that has not finished by then
+    is resolved as failed, so it is retried. A delivery still waiting for a
+    pool thread at its deadline is cancelled. A delivery already running
+    cannot be interrupted. Its channel is reported by `get_overdue_channels`
+    until the delivery ends, so callers can hold the channel back and a hung
+    channel holds at most one pool thread.
+    """
+
+    def __init__(self, max_workers: int):
+        """
+        Initializes the dispatcher.
+
+        Args:
+            max_workers (int): Maximum number of notifications sent at the same time.
+        """
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="notification"
+        )
+        self._lock = threading.Lock()
+        # Result futures not resolved yet, by the send or by its deadline
+        self._unresolved: Set[Future] = set()
+        self._overdue: Dict[str, int] = {}
+
+    def submit(self, channel: str, notifications: List[Notification]) -> Future:
+        """
+        Starts sending notifications on one channel without waiting for the result.
+
+        The notifications are handed to the client as one batch.
+
+        Args:
+            channel (str): The notification channel name.
+            notifications (List[Notification]): The notifications to be sent.
+
+        Returns:
+            Future: A future resolving to the `DeliveryResult` of the channel, at
+                the latest when the channel's deadline has passed.
+        """
+        result_future = Future()
+        try:
+            client = get_notification_client(channel)
+        except Exception as e:
+            logging.error(f"Failed to send {channel} notification: {e}")
+            result_future.set_result(DeliveryResult(channel, False, 0.0, str(e)))
+            return result_future
+
+        with self._lock:
+            self._unresolved.add(result_future)
+        send_future = self._executor.submit(self._send, channel, client, notifications)
+        deadline = threading.Timer(
+            client.timeout,
+            self._expire,
+            args=(channel, send_future, result_future, client.timeout),
+        )
+        deadline.daemon = True
+        deadline.start()
+        send_future.add_done_callback(
+            partial(self._complete, channel, deadline, result_future)
+        )
+        return result_future
+
+    def get_overdue_channels(self) -> Set[str]:
+        """
+        Returns the channels with a delivery still running past its deadline.
+
+        Returns:
+            Set[str]: The names of the overdue channels.
+        """
+        with self._lock:
+            return set(self._overdue)
+
+    def shutdown(self) -> None:
+        """
+        Waits for the notifications in flight and stops the thread pool.
+        """
+        self._executor.shutdown(wait=True)
+
+    def _send(
+        self,
+        channel: str,
+        client: NotificationClient,
+        notifications: List[Notification],
+    ) -> DeliveryResult:
+        start = time.perf_counter()
+        try:
+            client.send_batch(notifications)
+            result = DeliveryResult(channel, True, time.perf_counter() - start)
+            logging.info(f"Sent {channel} notification in {result.latency:.2f}s")
+            observe_delivery(channel, "sent", result.latency)
+        except RateLimitedError as e:
+            result = DeliveryResult(
+                channel, False, time.perf_counter() - start, str(e), True, e.retry_after
+            )
+            logging.warning(f"{channel} notification was rate limited: {e}")
+            observe_delivery(channel, "rate_limited", result.latency)
+        except Exception as e:
+            result = DeliveryResult(channel, False, time.perf_counter() - start, str(e))
+            logging.error(
+                f"Failed to send {channel} notification after {result.latency:.2f}s: {e}"
+            )
+            observe_delivery(channel, "failed", result.latency)
+        return result
+
+    def _expire(
+        self,
+        channel: str,
+        send_future: Future,
+        result_future: Future,
+        deadline: float,
+    ) -> None:
+        # Futures are resolved outside the lock, since their callbacks, e.g.
+        # recording the result in the outbox, may take other locks
+        with self._lock:
+            if result_future not in self._unresolved:
+                return
+            self._unresolved.discard(result_future)
+            # Cancelling runs `_complete`, which returns before taking the lock
+            if not send_future.cancel():
+                self._overdue[channel] = self._overdue.get(channel, 0) + 1
+        logging.warning(
+            f"{channel} notification has not completed within its {deadline:g}s deadline"
+        )
+        observe_delivery(channel, "timed_out", deadline)
+        result_future.set_result(
+            DeliveryResult(
+                channel,
+                False,
+                deadline,
+                f"Not delivered within the {deadline:g}s deadline",
+            )
+        )
+
+    def _complete(
+        self,
+        channel: str,
+        deadline: threading.Timer,
+        result_future: Future,
+        send_future: Future,
+    ) -> None:
+        deadline.cancel()
+        if send_future.cancelled():
+            return
+        with self._lock:
+            resolve = result_future in self._unresolved
+            self._unresolved.discard(result_future)
+            if not resolve and channel in self._overdue:
+                # A delivery that overran its deadline has finished late
+                self._overdue[channel] -= 1
+                if self._overdue[channel] == 0:
+                    del self._overdue[channel]
+        if resolve:
+            result_future.set_result(send_future.result())
+
+
+def get_notification_dispatcher() -> NotificationDispatcher:
+    """
+    Returns the process-wide `NotificationDispatcher`, creating it on first use.
+
+    Returns:
+        NotificationDispatcher: The shared notification dispatcher.
+    """
+    global _notification_dispatcher
+    if _notification_dispatcher is None:
+        _notification_dispatcher = NotificationDispatcher(
+            int(get_config_value("notification", "max_workers", "4"))
+        )
+    return _notification_dispatcher
+
+
+def close_notification_dispatcher() -> None:
+    """
+    Waits for pending notifications and shuts down the process-wide dispatcher.
+    """
+    global _notification_dispatcher
+    if _notification_dispatcher is not None:
+        _notification_dispatcher.shutdown()
+        _notification_dispatcher = None
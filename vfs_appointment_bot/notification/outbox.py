@@ -0,0 +1,474 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from vfs_appointment_bot.notification.coalescer import (
+    AlertCoalescer,
+    get_alert_coalescer,
+)
+from vfs_appointment_bot.notification.notification_client import Notification
+from vfs_appointment_bot.notification.notification_dispatcher import (
+    DeliveryResult,
+    close_notification_dispatcher,
+    get_notification_dispatcher,
+)
+from vfs_appointment_bot.notification.rate_limiter import RateLimiter, get_rate_limiter
+from vfs_appointment_bot.utils.config_reader import get_config_value
+from vfs_appointment_bot.utils.metrics import observe_queue
+
+_notification_outbox: "NotificationOutbox" = None
+_notification_outbox_pid: Optional[int] = None
+_notification_outbox_lock = threading.Lock()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    idempotency_key TEXT NOT NULL UNIQUE,
+    channel TEXT NOT NULL,
+    message TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    created_at REAL NOT NULL,
+    delivered_at REAL,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS outbox_pending
+    ON outbox (next_attempt_at) WHERE delivered_at IS NULL;
+"""
+
+
+class OutboxRow(NamedTuple):
+    """A notification claimed for delivery on one channel."""
+
+    id: int
+    idempotency_key: str
+    channel: str
+    message: str
+    attempts: int
+    created_at: float
+
+
+@dataclass
+class ChannelQueueStats:
+    """Notifications waiting for delivery on one channel."""
+
+    depth: int
+    oldest_wait: float
+    rate_limit_wait: float
+
+
+class NotificationOutbox:
+    """
+    Durable queue of notifications, delivered by a background thread.
+
+    `enqueue` stores one row per channel in a SQLite database and returns
+    right away. The delivery thread claims due rows, sends them through the
+    notification dispatcher and marks them as delivered, or schedules a retry
+    with exponential backoff when sending failed. A claimed row is leased for
+    `lease` seconds, so rows of a process that crashed mid-delivery are sent
+    again by the next process: delivery is at-least-once. Every row carries an
+    idempotency key derived from the content of the notification (see
+    `make_idempotency_key`). Enqueueing a key that is still pending, or was
+    delivered less than `dedup_window` seconds ago, is a no-op, so a check
+    replayed after a crash does not alert twice. A notification that was given
+    up after `max_attempts` is queued again when its key is enqueued again.
+
+    Sending is throttled per channel by the rate limiter: notifications over
+    the limit, or on a channel whose provider asked to slow down, stay queued
+    in the outbox until the channel may send again. A throttled attempt does
+    not count towards `max_attempts`.
+
+    The pending notifications of a channel are sent together as one batch,
+    after waiting for the coalescing window of the alert coalescer.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        rate_limiter: RateLimiter,
+        coalescer: Optional[AlertCoalescer] = None,
+        max_attempts: int = 10,
+        retry_base: float = 5,
+        retry_max: float = 600,
+        lease: float = 300,
+        poll_interval: float = 1,
+        retention: float = 86400,
+        dedup_window: float = 600,
+    ):
+        """
+        Initializes the outbox and creates the database if needed.
+
+        Args:
+            path (str): Path of the SQLite database file.
+            rate_limiter (RateLimiter): Rate limits of the notification channels.
+            coalescer (Optional[AlertCoalescer]): Batches the notifications of a
+                channel. Defaults to a coalescer without a waiting window.
+            max_attempts (int): Number of attempts after which a notification is
+                given up.
+            retry_base (float): Seconds before the first retry; doubled per attempt.
+            retry_max (float): Maximum number of seconds between two attempts.
+            lease (float): Seconds after which a claimed notification that was
+                neither delivered nor failed is sent again.
+            poll_interval (float): Maximum number of seconds between two looks
+                for due notifications.
+            retention (float): Seconds after which delivered notifications, and
+                notifications that were given up, are removed from the database.
+            dedup_window (float): Seconds after its delivery during which a
+                notification is not enqueued again.
+        """
+        self.path = path
+        self.rate_limiter = rate_limiter
+        self.coalescer = coalescer or AlertCoalescer(0)
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.lease = lease
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self.dedup_window = dedup_window
+        self._lock = threading.Lock()
+        self._wake_event = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._throttled_channels = set()
+        self._queued_channels = set()
+        self._connection = sqlite3.connect(
+            path, timeout=30, check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(SCHEMA)
+        rate_limiter.create_schema(self._connection)
+
+    def enqueue(
+        self,
+        message: str,
+        channels: List[str],
+        idempotency_key: str,
+        urgent: bool = False,
+    ) -> None:
+        """
+        Stores a notification for delivery on every channel.
+
+        Args:
+            message (str): The message content to be sent.
+            channels (List[str]): The notification channel names.
+            idempotency_key (str): Key identifying the notification (see
+                `make_idempotency_key`). Enqueueing a key that is pending, or
+                was delivered less than `dedup_window` seconds ago, is ignored.
+                A key that was given up is queued again.
+            urgent (bool): Whether the notification is sent without waiting for
+                the coalescing window. Defaults to False.
+        """
+        now = time.time()
+        due_time = self.coalescer.get_due_time(now, urgent)
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                self._connection.executemany(
+                    "INSERT INTO outbox "
+                    + "(idempotency_key, channel, message, next_attempt_at, created_at) "
+                    + "VALUES (?, ?, ?, ?, ?) "
+                    + "ON CONFLICT (idempotency_key) DO UPDATE SET "
+                    + "message = excluded.message, attempts = 0, "
+                    + "next_attempt_at = excluded.next_attempt_at, "
+                    + "created_at = excluded.created_at, delivered_at = NULL, last_error = NULL "
+                    + "WHERE delivered_at < ? OR attempts >= ?",
+                    [
+                        (
+                            f"{idempotency_key}:{channel}",
+                            channel,
+                            message,
+                            due_time,
+                            now,
+                            now - self.dedup_window,
+                            self.max_attempts,
+                        )
+                        for channel in channels
+                    ],
+                )
+                self._connection.execute("COMMIT")
+            except Exception:
+                self._connection.execute("ROLLBACK")
+                raise
+        self._wake_event.set()
+
+    def start(self) -> None:
+        """
+        Starts the background delivery thread.
+        """
+        self._purge_finished()
+        self._thread = threading.Thread(
+            target=self._run, name="notification-outbox", daemon=True
+        )
+        self._thread.start()
+
+    def close(self) -> None:
+        """
+        Stops the delivery thread after a last delivery round, waits for the
+        notifications in flight and closes the database.
+
+        Notifications that are not due yet stay in the outbox and are delivered
+        by the next run.
+        """
+        self._stop_event.set()
+        self._wake_event.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.deliver_due(flush=True)
+        close_notification_dispatcher()
+        with self._lock:
+            self._connection.close()
+
+    def get_queue_stats(self) -> Dict[str, ChannelQueueStats]:
+        """
+        Summarizes the pending notifications of every channel.
+
+        Returns:
+            Dict[str, ChannelQueueStats]: The queue depth, the age of the oldest
+                pending notification and the time until the rate limiter lets
+                the next notification through, per channel.
+        """
+        now = time.time()
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT channel, COUNT(*), MIN(created_at) FROM outbox "
+                + "WHERE delivered_at IS NULL AND attempts < ? GROUP BY channel",
+                (self.max_attempts,),
+            ).fetchall()
+            buckets = self.rate_limiter.load(self._connection, now)
+        return {
+            channel: ChannelQueueStats(
+                depth,
+                now - oldest,
+                buckets[channel].get_wait_time(now) if channel in buckets else 0.0,
+            )
+            for channel, depth, oldest in rows
+        }
+
+    def deliver_due(self, flush: bool = False) -> int:
+        """
+        Claims the notifications that are due and that the rate limiter lets
+        through, and starts sending them.
+
+        The notifications of a channel with a due notification that would
+        become due within the coalescing window are sent along in one batch.
+
+        Args:
+            flush (bool): Whether to send notifications that are still waiting
+                for the coalescing window. Defaults to False.
+
+        Returns:
+            int: The number of notifications sent.
+        """
+        now = time.time()
+        horizon = now + self.coalescer.window
+        dispatcher = get_notification_dispatcher()
+        # A channel still busy with a delivery past its deadline is held back.
+        # Read before taking the outbox lock, so that the outbox never waits
+        # for the dispatcher lock while holding its own.
+        overdue_channels = dispatcher.get_overdue_channels()
+        claimed = []
+        throttled_channels = set()
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                buckets = self.rate_limiter.load(self._connection, now)
+                throttled_channels.update(
+                    channel
+                    for channel, bucket in buckets.items()
+                    if bucket.get_wait_time(now) > 0
+                )
+                held_channels = throttled_channels | overdue_channels
+                rows = [
+                    OutboxRow(*row)
+                    for row in self._connection.execute(
+                        "SELECT id, idempotency_key, channel, message, attempts, created_at FROM outbox "
+                        + "WHERE delivered_at IS NULL AND next_attempt_at <= ? AND attempts < ? "
+                        + f"AND channel NOT IN ({', '.join('?' * len(held_channels))}) "
+                        + "AND (? OR channel IN (SELECT channel FROM outbox WHERE delivered_at IS NULL "
+                        + "AND next_attempt_at <= ? AND attempts < ?)) "
+                        + "ORDER BY id LIMIT 200",
+                        (
+                            horizon,
+                            self.max_attempts,
+                            *held_channels,
+                            flush,
+                            now,
+                            self.max_attempts,
+                        ),
+                    )
+                ]
+                for batch in self.coalescer.group(rows):
+                    bucket = buckets.get(batch[0].channel)
+                    if bucket is None or bucket.try_acquire(now):
+                        claimed.append(batch)
+                    else:
+                        throttled_channels.add(batch[0].channel)
+                self._connection.executemany(
+                    "UPDATE outbox SET attempts = attempts + 1, next_attempt_at = ? WHERE id = ?",
+                    [(now + self.lease, row.id) for batch in claimed for row in batch],
+                )
+                self.rate_limiter.save(self._connection, buckets)
+                self._connection.execute("COMMIT")
+            except Exception:
+                self._connection.execute("ROLLBACK")
+                raise
+
+        for batch in claimed:
+            notifications = [
+                Notification(row.message, row.idempotency_key, row.created_at)
+                for row in batch
+            ]
+            future = dispatcher.submit(batch[0].channel, notifications)
+            future.add_done_callback(partial(self._record_result, batch))
+        self._report_queue(throttled_channels)
+        return sum(len(batch) for batch in claimed)
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                self.deliver_due()
+            except sqlite3.Error as e:
+                logging.warning(f"Failed to read the notification outbox: {e}")
+            self._wake_event.wait(self.poll_interval)
+            self._wake_event.clear()
+
+    def _record_result(self, batch: List[OutboxRow], future: Future) -> None:
+        result: DeliveryResult = future.result()
+        now = time.time()
+        with self._lock:
+            if result.rate_limited:
+                self._connection.execute("BEGIN IMMEDIATE")
+                try:
+                    delay = self.rate_limiter.block(
+                        self._connection, result.channel, now, result.retry_after
+                    )
+                    self._connection.executemany(
+                        "UPDATE outbox SET attempts = attempts - 1, next_attempt_at = ?, "
+                        + "last_error = ? WHERE id = ?",
+                        [(now + delay, result.error, row.id) for row in batch],
+                    )
+                    self._connection.execute("COMMIT")
+                except Exception:
+                    self._connection.execute("ROLLBACK")
+                    raise
+                return
+
+            if result.success:
+                self._connection.executemany(
+                    "UPDATE outbox SET delivered_at = ?, last_error = NULL WHERE id = ?",
+                    [(now, row.id) for row in batch],
+                )
+                return
+
+            retries = []
+            for row in batch:
+                attempts = row.attempts + 1
+                if attempts >= self.max_attempts:
+                    logging.error(
+                        f"Giving up {row.channel} notification {row.idempotency_key} after {attempts} attempts"
+                    )
+                delay = min(
+                    self.retry_base * 2 ** min(attempts - 1, 32), self.retry_max
+                )
+                retries.append((now + delay, result.error, row.id))
+            self._connection.executemany(
+                "UPDATE outbox SET next_attempt_at = ?, last_error = ? WHERE id = ?",
+                retries,
+            )
+
+    def _report_queue(self, throttled_channels: set) -> None:
+        queue_stats = self.get_queue_stats()
+        for channel, stats in queue_stats.items():
+            observe_queue(channel, stats.depth, stats.rate_limit_wait)
+        for channel in self._queued_channels.difference(queue_stats):
+            observe_queue(channel, 0, 0.0)
+        self._queued_channels = set(queue_stats)
+
+        # Only channels with queued notifications are actually held back
+        throttled_channels = throttled_channels.intersection(queue_stats)
+        for channel in throttled_channels - self._throttled_channels:
+            logging.info(
+                f"{channel} notifications are rate limited: {queue_stats[channel].depth} queued, "
+                + f"next send in {queue_stats[channel].rate_limit_wait:.1f}s"
+            )
+        for channel in self._throttled_channels - throttled_channels:
+            logging.info(f"{channel} notifications are no longer rate limited")
+        self._throttled_channels = throttled_channels
+
+    def _purge_finished(self) -> None:
+        expiry = time.time() - self.retention
+        with self._lock:
+            self._connection.execute(
+                "DELETE FROM outbox WHERE delivered_at < ? "
+                + "OR (delivered_at IS NULL AND attempts >= ? AND created_at < ?)",
+                (expiry, self.max_attempts, expiry),
+            )
+
+
+def make_idempotency_key(**parts: Any) -> str:
+    """
+    Derives the idempotency key of a notification from what it is about.
+
+    Notifications about the same event, e.g. the same dates found on the same
+    route and appointment parameters, get the same key, so enqueueing them
+    again is a no-op.
+
+    Args:
+        **parts (Any): JSON-serializable values identifying the notification.
+
+    Returns:
+        str: The idempotency key.
+    """
+    content = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def get_notification_outbox() -> NotificationOutbox:
+    """
+    Returns the process-wide `NotificationOutbox`, creating and starting it on first use.
+
+    A new outbox is opened in every process, since neither SQLite connections
+    nor threads survive a fork.
+
+    Returns:
+        NotificationOutbox: The notification outbox configured in the `outbox` section.
+    """
+    global _notification_outbox, _notification_outbox_pid
+    with _notification_outbox_lock:
+        if _notification_outbox is None or _notification_outbox_pid != os.getpid():
+            _notification_outbox = NotificationOutbox(
+                get_config_value("outbox", "path", ".vfs_outbox.db"),
+                get_rate_limiter(),
+                get_alert_coalescer(),
+                int(get_config_value("outbox", "max_attempts", "10")),
+                float(get_config_value("outbox", "retry_base", "5")),
+                float(get_config_value("outbox", "retry_max", "600")),
+                float(get_config_value("outbox", "lease", "300")),
+                float(get_config_value("outbox", "poll_interval", "1")),
+                float(get_config_value("outbox", "retention", "86400")),
+                float(get_config_value("outbox", "dedup_window", "600")),
+            )
+            _notification_outbox_pid = os.getpid()
+            _notification_outbox.start()
+    return _notification_outbox
+
+
+def close_notification_outbox() -> None:
+    """
+    Delivers the due notifications and stops the process-wide outbox.
+    """
+    global _notification_outbox
+    with _notification_outbox_lock:
+        if _notification_outbox is not None and _notification_outbox_pid == os.getpid():
+            _notification_outbox.close()
+        _notification_outbox = None
@@ -0,0 +1,223 @@
+import sqlite3
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from vfs_appointment_bot.utils.config_reader import get_config_section, get_config_value
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rate_limits (
+    channel TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    blocked_until REAL NOT NULL
+)
+"""
+
+
+@dataclass
+class TokenBucket:
+    """
+    Token bucket limiting the number of messages sent on one channel.
+
+    The bucket holds up to `capacity` tokens and gains one token every
+    `period / capacity` seconds. Sending a message takes one token. A bucket
+    can also be blocked for a while when the provider signals back-pressure,
+    e.g. with an HTTP 429 response.
+    """
+
+    capacity: float
+    period: float
+    tokens: float
+    updated_at: float
+    blocked_until: float = 0.0
+
+    def refill(self, now: float) -> None:
+        """
+        Adds the tokens gained since the last update.
+
+        Args:
+            now (float): The current UNIX time.
+        """
+        elapsed = max(now - self.updated_at, 0)
+        self.tokens = min(
+            self.capacity, self.tokens + elapsed * self.capacity / self.period
+        )
+        self.updated_at = now
+
+    def try_acquire(self, now: float) -> bool:
+        """
+        Takes a token if one is available and the bucket is not blocked.
+
+        Args:
+            now (float): The current UNIX time.
+
+        Returns:
+            bool: True if a message may be sent now.
+        """
+        self.refill(now)
+        if now < self.blocked_until or self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+    def get_wait_time(self, now: float) -> float:
+        """
+        Computes the number of seconds until a message may be sent.
+
+        Args:
+            now (float): The current UNIX time.
+
+        Returns:
+            float: The wait time in seconds, 0 if a message may be sent now.
+        """
+        self.refill(now)
+        refill_wait = max(1 - self.tokens, 0) * self.period / self.capacity
+        return max(refill_wait, self.blocked_until - now, 0)
+
+    def block(self, now: float, seconds: float) -> None:
+        """
+        Stops sending for a number of seconds and empties the bucket.
+
+        Args:
+            now (float): The current UNIX time.
+            seconds (float): The number of seconds requested by the provider.
+        """
+        self.refill(now)
+        self.tokens = 0
+        self.blocked_until = max(self.blocked_until, now + seconds)
+
+
+class RateLimiter:
+    """
+    Token buckets of all notification channels, stored in the outbox database.
+
+    The buckets are kept in the database rather than in memory, so that the
+    limits hold across restarts and are shared by all processes delivering
+    from the same outbox. Callers are expected to load, use and save the
+    buckets within one transaction.
+    """
+
+    def __init__(self, limits: Dict[str, TokenBucket], default_retry_after: float):
+        """
+        Initializes the rate limiter.
+
+        Args:
+            limits (Dict[str, TokenBucket]): Full buckets of the limited channels.
+            default_retry_after (float): Seconds to back off after a back-pressure
+                signal that does not say how long to wait.
+        """
+        self.limits = limits
+        self.default_retry_after = default_retry_after
+
+    def create_schema(self, connection: sqlite3.Connection) -> None:
+        """
+        Creates the table of the buckets if needed.
+
+        Args:
+            connection (sqlite3.Connection): The outbox database connection.
+        """
+        connection.execute(SCHEMA)
+
+    def load(
+        self, connection: sqlite3.Connection, now: float
+    ) -> Dict[str, TokenBucket]:
+        """
+        Loads the current state of the buckets.
+
+        Args:
+            connection (sqlite3.Connection): The outbox database connection.
+            now (float): The current UNIX time.
+
+        Returns:
+            Dict[str, TokenBucket]: The bucket of every limited channel.
+        """
+        buckets = {
+            channel: TokenBucket(limit.capacity, limit.period, limit.capacity, now)
+            for channel, limit in self.limits.items()
+        }
+        for channel, tokens, updated_at, blocked_until in connection.execute(
+            "SELECT channel, tokens, updated_at, blocked_until FROM rate_limits"
+        ):
+            bucket = buckets.get(channel)
+            if bucket is not None:
+                bucket.tokens = min(tokens, bucket.capacity)
+                bucket.updated_at = updated_at
+                bucket.blocked_until = blocked_until
+            elif blocked_until > now:
+                # Channels without a configured limit still honour back-pressure
+                buckets[channel] = TokenBucket(1, 1, 1, now, blocked_until)
+        return buckets
+
+    def save(
+        self, connection: sqlite3.Connection, buckets: Dict[str, TokenBucket]
+    ) -> None:
+        """
+        Stores the state of the buckets.
+
+        Args:
+            connection (sqlite3.Connection): The outbox database connection.
+            buckets (Dict[str, TokenBucket]): The buckets to store.
+        """
+        connection.executemany(
+            "INSERT OR REPLACE INTO rate_limits VALUES (?, ?, ?, ?)",
+            [
+                (channel, bucket.tokens, bucket.updated_at, bucket.blocked_until)
+                for channel, bucket in buckets.items()
+            ],
+        )
+
+    def block(
+        self,
+        connection: sqlite3.Connection,
+        channel: str,
+        now: float,
+        retry_after: Optional[float],
+    ) -> float:
+        """
+        Blocks a channel after the provider signalled back-pressure.
+
+        Args:
+            connection (sqlite3.Connection): The outbox database connection.
+            channel (str): The notification channel name.
+            now (float): The current UNIX time.
+            retry_after (Optional[float]): Seconds requested by the provider, if any.
+
+        Returns:
+            float: The number of seconds the channel is blocked for.
+        """
+        seconds = retry_after if retry_after is not None else self.default_retry_after
+        bucket = self.load(connection, now).get(channel)
+        if bucket is None:
+            bucket = TokenBucket(1, 1, 1, now)
+        bucket.block(now, seconds)
+        self.save(connection, {channel: bucket})
+        return seconds
+
+
+def get_rate_limiter() -> RateLimiter:
+    """
+    Creates a `RateLimiter` from the `rate-limit` configuration section.
+
+    Every channel key holds a limit as `<messages>/<seconds>`, e.g.
+    `telegram = 20/60` for at most 20 messages per minute.
+
+    Returns:
+        RateLimiter: The rate limiter.
+
+    Raises:
+        ValueError: If a limit is not formatted as `<messages>/<seconds>`.
+    """
+    limits = {}
+    for channel, limit in get_config_section("rate-limit").items():
+        if channel == "default_retry_after":
+            continue
+        try:
+            messages, seconds = (float(value) for value in limit.split("/"))
+        except ValueError:
+            raise ValueError(
+                f"Invalid rate limit '{limit}' for {channel}, use <messages>/<seconds>"
+            )
+        limits[channel] = TokenBucket(messages, seconds, messages, 0.0)
+    return RateLimiter(
+        limits, float(get_config_value("rate-limit", "default_retry_after", "60"))
+    )
@@ -1,8 +1,13 @@
 import logging
 
 import requests
+from requests.adapters import HTTPAdapter
 
-from vfs_appointment_bot.notification.notification_client import NotificationClient
+from vfs_appointment_bot.notification.notification_client import (
+    NotificationClient,
+    NotificationClientError,
+    RateLimitedError,
+)
 
 
 class TelegramClient(NotificationClient):
@@ -20,10 +25,13 @@ class TelegramClient(NotificationClient):
 
         This constructor retrieves configuration settings from the "telegram"
         section of the application configuration and validates them using the
-        base class validation logic.
+        base class validation logic. Requests go through a keep-alive session,
+        so only the first notification pays for the TLS handshake.
         """
         required_keys = ["bot_token", "chat_id", "parse_mode"]
         super().__init__("telegram", required_keys)
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
 
     def send_notification(self, message: str) -> None:
         """
@@ -31,19 +39,34 @@ class TelegramClient(NotificationClient):
 
         This method constructs a Telegram API request URL using the retrieved
         configuration settings (bot token, chat ID, and parse mode) and sends a
-        GET request to the Telegram API with the message content. The response
-        from the Telegram API is logged for debugging purposes.
+        GET request to the Telegram API with the message content over the
+        client's keep-alive session. The response from the Telegram API is
+        logged for debugging purposes.
 
         Args:
             message (str): The message content to be sent as a Telegram notification.
+
+        Raises:
+            RateLimitedError: If Telegram asks to slow down (HTTP 429).
+            NotificationClientError: If Telegram rejects the message.
         """
         bot_token: str = self.config.get("bot_token")
         chat_id: str = self.config.get("chat_id")
         parse_mode: str = self.config.get("parse_mode")
 
-        url = (
-            f"https://api.telegram.org/bot{bot_token}/sendMessage?"
-            + f"chat_id={chat_id}&parse_mode={parse_mode}&text={message}"
-        )
-        requests.get(url, timeout=3000).json()
+        url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
+        params = {"chat_id": chat_id, "parse_mode": parse_mode, "text": message}
+        response = self.session.get(url, params=params, timeout=self.timeout).json()
+        if not response.get("ok"):
+            description = response.get("description", "unknown error")
+            if response.get("error_code") == 429:
+                retry_after = response.get("parameters", {}).get("retry_after")
+                raise RateLimitedError(description, retry_after)
+            raise NotificationClientError(description)
         logging.info("Telegram message sent successfully!")
+
+    def close(self) -> None:
+        """
+        Closes the pooled HTTP connections.
+        """
+        self.session.close()
@@ -0,0 +1,133 @@
+import hashlib
+import hmac
+import json
+import logging
+import time
+from typing import List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from vfs_appointment_bot.notification.notification_client import (
+    Notification,
+    NotificationClient,
+    NotificationClientError,
+    RateLimitedError,
+)
+
+SIGNATURE_HEADER = "X-VFS-Signature"
+TIMESTAMP_HEADER = "X-VFS-Timestamp"
+
+
+class WebhookClient(NotificationClient):
+    """Concrete implementation of NotificationClient for a generic webhook.
+
+    This class POSTs notifications as JSON to a configured URL, e.g. to feed them
+    into an existing alerting stack. Several notifications sent together are
+    delivered in one request. Requests go through a keep-alive session and can
+    be signed with HMAC-SHA256, so the receiver can verify where they came from.
+    """
+
+    def __init__(self):
+        """
+        Initializes the webhook client with configuration data.
+
+        This constructor retrieves configuration settings from the "webhook"
+        section of the application configuration and validates them using the
+        base class validation logic.
+        """
+        required_keys = ["url"]
+        super().__init__("webhook", required_keys)
+        self.connect_timeout = float(
+            self.config.get("connect_timeout", min(self.timeout, 5))
+        )
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+        self.session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+
+    def send_notification(self, message: str) -> None:
+        """
+        Sends a notification message through the webhook.
+
+        Args:
+            message (str): The message content to be sent.
+        """
+        self.send_batch([Notification(message)])
+
+    def send_batch(self, notifications: List[Notification]) -> None:
+        """
+        Sends several notifications in one webhook request.
+
+        The request body is a JSON object with an `events` list holding the
+        message, idempotency key and creation time of every notification. When
+        a `secret` is configured, the body is signed with HMAC-SHA256 over
+        `<timestamp>.<body>`; the timestamp and the hex digest are sent in the
+        `X-VFS-Timestamp` and `X-VFS-Signature` headers.
+
+        Args:
+            notifications (List[Notification]): The notifications to be sent.
+
+        Raises:
+            RateLimitedError: If the receiver asks to slow down (HTTP 429).
+            NotificationClientError: If the receiver rejects the request.
+        """
+        body = json.dumps(
+            {
+                "events": [
+                    {
+                        "id": notification.idempotency_key,
+                        "message": notification.message,
+                        "created_at": notification.created_at,
+                    }
+                    for notification in notifications
+                ]
+            }
+        ).encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+        secret: Optional[str] = self.config.get("secret")
+        if secret:
+            timestamp = str(int(time.time()))
+            headers[TIMESTAMP_HEADER] = timestamp
+            headers[SIGNATURE_HEADER] = "sha256=" + sign_payload(
+                secret, timestamp, body
+            )
+
+        response = self.session.post(
+            self.config.get("url"),
+            data=body,
+            headers=headers,
+            timeout=(self.connect_timeout, self.timeout),
+        )
+        if response.status_code == 429:
+            retry_after = response.headers.get("Retry-After")
+            raise RateLimitedError(
+                "Webhook receiver is rate limiting",
+                float(retry_after) if retry_after and retry_after.isdigit() else None,
+            )
+        if not response.ok:
+            raise NotificationClientError(
+                f"Webhook receiver answered {response.status_code}: {response.text[:200]}"
+            )
+        logging.info(f"Webhook delivered {len(notifications)} event(s) successfully!")
+
+    def close(self) -> None:
+        """
+        Closes the pooled HTTP connections.
+        """
+        self.session.close()
+
+
+def sign_payload(secret: str, timestamp: str, body: bytes) -> str:
+    """
+    Computes the HMAC-SHA256 signature of a webhook request.
+
+    Args:
+        secret (str): The shared secret.
+        timestamp (str): The UNIX timestamp sent with the request.
+        body (bytes): The request body.
+
+    Returns:
+        str: The hex digest of the signature.
+    """
+    signed_content = timestamp.encode("utf-8") + b"." + body
+    return hmac.new(secret.encode("utf-8"), signed_content, hashlib.sha256).hexdigest()
@@ -0,0 +1,259 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from vfs_appointment_bot.utils.config_reader import get_config_value
+
+_check_history: "CheckHistory" = None
+_check_history_pid: Optional[int] = None
+_check_history_lock = threading.Lock()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS checks (
+    id INTEGER PRIMARY KEY,
+    route TEXT NOT NULL,
+    params TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    finished_at REAL NOT NULL,
+    outcome TEXT NOT NULL,
+    phases TEXT NOT NULL,
+    dates TEXT NOT NULL,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS checks_route_started ON checks (route, started_at);
+CREATE INDEX IF NOT EXISTS checks_started ON checks (started_at);
+CREATE INDEX IF NOT EXISTS checks_found ON checks (route, started_at) WHERE outcome = 'found';
+"""
+
+# Seconds between two prunes of the rows past their retention
+PRUNE_INTERVAL = 3600
+
+
+@dataclass
+class CheckRecord:
+    """The result of one appointment check."""
+
+    route: str
+    params: Dict[str, str]
+    started_at: float
+    finished_at: float
+    outcome: str
+    phases: Dict[str, float] = field(default_factory=dict)
+    dates: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def duration(self) -> float:
+        """Total duration of the check in seconds."""
+        return self.finished_at - self.started_at
+
+
+class CheckHistory:
+    """
+    Append-only log of appointment checks in a SQLite database.
+
+    The database runs in WAL mode, so recording a check is a single cheap
+    append that does not block readers, and several processes can record
+    into it at the same time. Queries by route and time use the indexes on
+    `(route, started_at)`, with a partial index for checks that found slots,
+    and rows older than the retention period are pruned periodically.
+    """
+
+    def __init__(self, path: str, retention_days: float = 90):
+        """
+        Initializes the check history and creates the database if needed.
+
+        Args:
+            path (str): Path of the SQLite database file.
+            retention_days (float): Number of days after which checks are pruned.
+        """
+        self.path = path
+        self.retention_days = retention_days
+        self._lock = threading.Lock()
+        self._last_prune = 0.0
+        self._connection = sqlite3.connect(
+            path, timeout=30, check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(SCHEMA)
+
+    def record(self, check_record: CheckRecord) -> None:
+        """
+        Appends a check to the history.
+
+        Args:
+            check_record (CheckRecord): The check to record.
+        """
+        with self._lock:
+            self._connection.execute(
+                "INSERT INTO checks (route, params, started_at, finished_at, outcome, phases, dates, error) "
+                + "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    check_record.route,
+                    json.dumps(check_record.params, sort_keys=True),
+                    check_record.started_at,
+                    check_record.finished_at,
+                    check_record.outcome,
+                    json.dumps(check_record.phases),
+                    json.dumps(check_record.dates),
+                    check_record.error,
+                ),
+            )
+        if check_record.finished_at - self._last_prune > PRUNE_INTERVAL:
+            self.prune()
+
+    def query(
+        self,
+        route: Optional[str] = None,
+        since: Optional[float] = None,
+        outcome: Optional[str] = None,
+        limit: int = 100,
+    ) -> List[CheckRecord]:
+        """
+        Returns the most recent checks matching the filters.
+
+        Args:
+            route (Optional[str]): Only checks of this route, e.g. "IN-DE".
+            since (Optional[float]): Only checks started after this UNIX time.
+            outcome (Optional[str]): Only checks with this outcome, e.g. "found".
+            limit (int): Maximum number of checks returned.
+
+        Returns:
+            List[CheckRecord]: The matching checks, newest first.
+        """
+        where, params = self._build_filter(route, since, outcome)
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT route, params, started_at, finished_at, outcome, phases, dates, error "
+                + f"FROM checks {where} ORDER BY started_at DESC LIMIT ?",
+                (*params, limit),
+            ).fetchall()
+        return [
+            CheckRecord(
+                route,
+                json.loads(params),
+                started_at,
+                finished_at,
+                outcome,
+                json.loads(phases),
+                json.loads(dates),
+                error,
+            )
+            for route, params, started_at, finished_at, outcome, phases, dates, error in rows
+        ]
+
+    def count_outcomes(
+        self, route: Optional[str] = None, since: Optional[float] = None
+    ) -> Dict[str, int]:
+        """
+        Counts the checks per outcome.
+
+        Args:
+            route (Optional[str]): Only checks of this route, e.g. "IN-DE".
+            since (Optional[float]): Only checks started after this UNIX time.
+
+        Returns:
+            Dict[str, int]: The number of checks per outcome.
+        """
+        where, params = self._build_filter(route, since, None)
+        with self._lock:
+            return dict(
+                self._connection.execute(
+                    f"SELECT outcome, COUNT(*) FROM checks {where} GROUP BY outcome",
+                    params,
+                ).fetchall()
+            )
+
+    def get_phase_averages(
+        self, route: Optional[str] = None, since: Optional[float] = None
+    ) -> Dict[str, float]:
+        """
+        Computes the average duration of every check phase.
+
+        Args:
+            route (Optional[str]): Only checks of this route, e.g. "IN-DE".
+            since (Optional[float]): Only checks started after this UNIX time.
+
+        Returns:
+            Dict[str, float]: The average duration in seconds per phase, slowest first.
+        """
+        where, params = self._build_filter(route, since, None)
+        with self._lock:
+            return dict(
+                self._connection.execute(
+                    "SELECT phase.key, AVG(phase.value) FROM checks, json_each(checks.phases) AS phase "
+                    + f"{where} GROUP BY phase.key ORDER BY AVG(phase.value) DESC",
+                    params,
+                ).fetchall()
+            )
+
+    def prune(self) -> int:
+        """
+        Deletes the checks older than the retention period.
+
+        Returns:
+            int: The number of deleted checks.
+        """
+        now = time.time()
+        with self._lock:
+            self._last_prune = now
+            cursor = self._connection.execute(
+                "DELETE FROM checks WHERE started_at < ?",
+                (now - self.retention_days * 86400,),
+            )
+        if cursor.rowcount:
+            logging.debug(f"Pruned {cursor.rowcount} checks from the check history")
+        return cursor.rowcount
+
+    def close(self) -> None:
+        """
+        Closes the database connection.
+        """
+        with self._lock:
+            self._connection.close()
+
+    def _build_filter(
+        self, route: Optional[str], since: Optional[float], outcome: Optional[str]
+    ):
+        conditions = []
+        params = []
+        if route:
+            conditions.append("route = ?")
+            params.append(route.upper())
+        if since is not None:
+            conditions.append("started_at >= ?")
+            params.append(since)
+        if outcome:
+            conditions.append("outcome = ?")
+            params.append(outcome)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return where, params
+
+
+def get_check_history() -> Optional[CheckHistory]:
+    """
+    Returns the process-wide `CheckHistory` configured in the `history` section.
+
+    A new connection is opened in every process, since SQLite connections must
+    not be shared across a fork.
+
+    Returns:
+        Optional[CheckHistory]: The check history, or None if it is disabled.
+    """
+    global _check_history, _check_history_pid
+    if get_config_value("history", "enabled", "True") not in ("True", "true"):
+        return None
+    with _check_history_lock:
+        if _check_history is None or _check_history_pid != os.getpid():
+            _check_history = CheckHistory(
+                get_config_value("history", "path", ".vfs_history.db"),
+                float(get_config_value("history", "retention_days", "90")),
+            )
+            _check_history_pid = os.getpid()
+    return _check_history
@@ -1,10 +1,234 @@
 import re
+from datetime import date
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
 
+# Month names of the languages VFS sites are shown in, January first. Both the
+# full names and the abbreviations are recognised, case-insensitively.
+MONTH_NAMES = {
+    "en": "january february march april may june july august september october november december",
+    "de": "januar februar märz april mai juni juli august september oktober november dezember",
+    "fr": "janvier février mars avril mai juin juillet août septembre octobre novembre décembre",
+    "it": "gennaio febbraio marzo aprile maggio giugno luglio agosto settembre ottobre novembre dicembre",
+    "es": "enero febrero marzo abril mayo junio julio agosto septiembre octubre noviembre diciembre",
+    "pt": "janeiro fevereiro março abril maio junho julho agosto setembro outubro novembro dezembro",
+    "nl": "januari februari maart april mei juni juli augustus september oktober november december",
+}
 
-def extract_date_from_string(text):
-    pattern = r"(\d{4}-\d{2}-\d{2}|\d{2}-\d{2}-\d{4}|\d{2}-\d{2}-\d{2})"
-    match = re.search(pattern, text)
-    if match:
-        return match.group()
+# Abbreviations that are not the first three letters of a month name
+MONTH_ABBREVIATIONS = {
+    "sept": 9,
+    "jän": 1,
+    "mrz": 3,
+    "okt": 10,
+    "dez": 12,
+    "févr": 2,
+    "janv": 1,
+    "avr": 4,
+    "juil": 7,
+    "déc": 12,
+    "mrt": 3,
+}
+
+
+def _build_month_lookup() -> Dict[str, int]:
+    lookup = dict(MONTH_ABBREVIATIONS)
+    for names in MONTH_NAMES.values():
+        for month, name in enumerate(names.split(), start=1):
+            lookup.setdefault(name, month)
+            lookup.setdefault(name[:3], month)
+    return lookup
+
+
+MONTHS = _build_month_lookup()
+
+_MONTH = (
+    "(?:" + "|".join(sorted(map(re.escape, MONTHS), key=len, reverse=True)) + r")\.?"
+)
+_DAY = r"(?:0?[1-9]|[12]\d|3[01])(?:st|nd|rd|th|er|º|\.)?"
+# Words between the day and the month ("21st of May", "21 de mayo") and
+# between the month and the year ("mayo de 2024"). "of" is not accepted before
+# the year, so "1 out of 2024" is not read as a Portuguese date.
+_DAY_OF = r"(?:\s+(?:de|of)\s+|[\s,]+)"
+_YEAR_OF = r"(?:\s+de\s+|[\s,]+)"
+
+# Words and dashes joining the ends of a date range
+_TO = r"(?:-|–|—|to|until|till|through|bis|au|al|a|à|hasta|tot|até)"
+_AND = r"(?:and|und|et|e|y|en)"
+_BETWEEN = r"(?:between|zwischen|entre|tra|fra|tussen)"
+
+DATE_PATTERN = re.compile(
+    # 2024-05-21, 2024/05/21
+    r"(?<!\d)(?P<iso_year>\d{4})(?P<iso_sep>[-/.])(?P<iso_month>\d{1,2})(?P=iso_sep)(?P<iso_day>\d{1,2})(?!\d)"
+    # 21-05-2024, 21/05/24, 21.05.2024, or 05/21/2024 month first
+    + r"|(?<!\d)(?P<first>\d{1,2})(?P<sep>[-/.])(?P<second>\d{1,2})(?P=sep)(?P<year>\d{4}|\d{2})(?!\d)"
+    # 21 May 2024, 21. Mai 2024, 21 de mayo de 2024, 1er juin 2024
+    + rf"|(?<!\w)(?P<day_name>{_DAY}){_DAY_OF}?(?P<name_month>{_MONTH}){_YEAR_OF}(?P<name_year>\d{{4}})(?!\d)"
+    # May 21, 2024, May 21st 2024, and the ranges May 21 - 24, 2024 and May 30 - June 2, 2024
+    + rf"|(?<!\w)(?P<month_name>{_MONTH})\s+"
+    + rf"(?:(?P<start_day>{_DAY})\s*{_TO}\s*(?:(?P<end_month>{_MONTH})\s+)?)?"
+    + rf"(?P<name_day>{_DAY}),?\s+(?P<month_year>\d{{4}})(?!\d)",
+    re.IGNORECASE,
+)
+
+# Leading day of a range sharing the year, and unless given the month, of its
+# last day, e.g. "25 -" in "25 - 30 May 2024", "25 May -" in "25 May - 30 May 2024"
+# or "between 25 and" in "between 25 and 30 May 2024"
+DAY_RANGE_START = re.compile(
+    rf"(?:(?<!\w){_BETWEEN}\s+(?P<between_day>{_DAY})(?:{_DAY_OF}?(?P<between_month>{_MONTH}))?\s*{_AND}"
+    + rf"|(?<![\w.:/-])(?P<day>{_DAY})(?:{_DAY_OF}?(?P<month>{_MONTH}))?\s*{_TO})\s*$",
+    re.IGNORECASE,
+)
+
+
+def parse_date(text: str, day_first: bool = True) -> Optional[date]:
+    """
+    Parses the first date mentioned in a text.
+
+    Args:
+        text (str): The text, e.g. "Earliest Available Slot : 21-05-2024".
+        day_first (bool): Whether ambiguous numeric dates such as "05/06/2024"
+            are read day first.
+
+    Returns:
+        Optional[date]: The date, or None if the text does not mention one.
+    """
+    dates = parse_dates(text, day_first)
+    return dates[0] if dates else None
+
+
+@lru_cache(maxsize=4096)
+def parse_dates(text: str, day_first: bool = True) -> Tuple[date, ...]:
+    """
+    Parses every date mentioned in a text.
+
+    Numeric dates (ISO, day-month-year with "-", "/" or "." separators and
+    two- or four-digit years) and dates with English, German, French,
+    Italian, Spanish, Portuguese or Dutch month names are recognised. A
+    range yields its first and last day, whatever its length: "21-05-2024 to
+    24-05-2024", "21 - 24 May 2024", "21 May - 24 May 2024" and "May 21 - 24,
+    2024" all give 2024-05-21 and 2024-05-24.
+    Results are cached, since the same alert texts are parsed again on
+    every check.
+
+    Args:
+        text (str): The text to parse.
+        day_first (bool): Whether ambiguous numeric dates such as "05/06/2024"
+            are read day first.
+
+    Returns:
+        Tuple[date, ...]: The dates without duplicates, in the order of the text.
+    """
+    dates: List[date] = []
+    for match in DATE_PATTERN.finditer(text):
+        parsed = _to_date(match, day_first)
+        if parsed is None:
+            continue
+
+        if match.group("start_day"):
+            start = _start_of(
+                parsed, match.group("month_name"), match.group("start_day")
+            )
+        elif match.group("day_name") or match.group("name_day"):
+            start = _range_start(text[: match.start()], parsed)
+        else:
+            start = None
+        if start is not None:
+            dates.append(start)
+        dates.append(parsed)
+    return tuple(dict.fromkeys(dates))
+
+
+def parse_dates_batch(texts: Iterable[str], day_first: bool = True) -> List[date]:
+    """
+    Parses the dates mentioned in a batch of texts.
+
+    Args:
+        texts (Iterable[str]): The texts to parse, e.g. the appointment alerts.
+        day_first (bool): Whether ambiguous numeric dates such as "05/06/2024"
+            are read day first.
+
+    Returns:
+        List[date]: The dates of all texts, sorted and without duplicates.
+    """
+    return sorted({parsed for text in texts for parsed in parse_dates(text, day_first)})
+
+
+def format_dates(dates: Iterable[date]) -> str:
+    """
+    Formats dates for logs and notifications, e.g. "2024-05-21, 2024-05-24".
+
+    Args:
+        dates (Iterable[date]): The dates.
+
+    Returns:
+        str: The ISO dates, separated by commas.
+    """
+    return ", ".join(parsed.isoformat() for parsed in dates)
+
+
+def _to_date(match: "re.Match", day_first: bool) -> Optional[date]:
+    if match.group("iso_year"):
+        return _safe_date(
+            match.group("iso_year"), match.group("iso_month"), match.group("iso_day")
+        )
+    if match.group("first"):
+        first, second = match.group("first"), match.group("second")
+        year = match.group("year")
+        if match.group("sep") == "." and len(year) == 2:
+            # Too easily confused with times such as "10.30.00"
+            return None
+        day, month = (first, second) if day_first else (second, first)
+        # Fall back to the other order when it is the only valid one, e.g. "05/21/2024"
+        return _safe_date(year, month, day) or _safe_date(year, day, month)
+    if match.group("day_name"):
+        return _safe_date(
+            match.group("name_year"),
+            MONTHS[_month_key(match.group("name_month"))],
+            _day_number(match.group("day_name")),
+        )
+    return _safe_date(
+        match.group("month_year"),
+        MONTHS[_month_key(match.group("end_month") or match.group("month_name"))],
+        _day_number(match.group("name_day")),
+    )
+
+
+def _safe_date(year, month, day) -> Optional[date]:
+    year = int(year)
+    if year < 100:
+        year += 2000
+    try:
+        return date(year, int(month), int(day))
+    except ValueError:
+        return None
+
+
+def _month_key(name: str) -> str:
+    return name.rstrip(".").lower()
+
+
+def _day_number(day: str) -> int:
+    return int(re.match(r"\d+", day).group())
+
+
+def _range_start(before: str, end: date) -> Optional[date]:
+    match = DAY_RANGE_START.search(before)
+    if not match:
+        return None
+    if match.group("day"):
+        return _start_of(end, match.group("month"), match.group("day"))
+    return _start_of(end, match.group("between_month"), match.group("between_day"))
+
+
+def _start_of(end: date, month: Optional[str], day: str) -> Optional[date]:
+    if month is None:
+        start = _safe_date(end.year, end.month, _day_number(day))
     else:
+        month_number = MONTHS[_month_key(month)]
+        # "30 Dec - 2 Jan 2025" starts in the year before its last day
+        year = end.year - 1 if month_number > end.month else end.year
+        start = _safe_date(year, month_number, _day_number(day))
+    if start is None or start >= end:
         return None
+    return start
@@ -0,0 +1,424 @@
+import logging
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from vfs_appointment_bot.utils.check_history import CheckRecord
+from vfs_appointment_bot.utils.config_reader import get_config_value
+
+_metrics_server: "MetricsServer" = None
+
+# Upper bounds in seconds of the latency histogram buckets
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+
+class Metric:
+    """
+    Base class of the metrics, holding one value per combination of labels.
+
+    Values are only ever added to, so the values collected by another process
+    can be drained there and merged into the metrics of this process.
+    """
+
+    type_name = "untyped"
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = ()):
+        """
+        Initializes the metric and registers it.
+
+        Args:
+            name (str): The metric name, e.g. "vfs_checks_total".
+            help_text (str): The description shown in the exposition.
+            label_names (Sequence[str]): The names of the labels of the metric.
+        """
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._values: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def drain(self) -> Dict[Tuple[str, ...], object]:
+        """
+        Returns the values collected so far and resets them.
+
+        Returns:
+            Dict[Tuple[str, ...], object]: The values by label values.
+        """
+        with self._lock:
+            values, self._values = self._values, {}
+        return values
+
+    def merge(self, values: Dict[Tuple[str, ...], object]) -> None:
+        """
+        Adds values drained from the same metric in another process.
+
+        Args:
+            values (Dict[Tuple[str, ...], object]): The drained values.
+        """
+        raise NotImplementedError
+
+    def render(self) -> Iterator[str]:
+        """
+        Yields the lines of the metric in the Prometheus text format.
+        """
+        yield f"# HELP {self.name} {self.help_text}"
+        yield f"# TYPE {self.name} {self.type_name}"
+        with self._lock:
+            values = {key: self._copy(value) for key, value in self._values.items()}
+        for label_values, value in sorted(values.items()):
+            yield from self._render_value(label_values, value)
+
+    def _copy(self, value):
+        return value
+
+    def _render_value(self, label_values: Tuple[str, ...], value) -> Iterator[str]:
+        yield f"{self.name}{self._format_labels(label_values)} {value:.15g}"
+
+    def _format_labels(
+        self, label_values: Tuple[str, ...], extra: Optional[Tuple[str, str]] = None
+    ) -> str:
+        labels = list(zip(self.label_names, label_values))
+        if extra is not None:
+            labels.append(extra)
+        if not labels:
+            return ""
+        escaped = (
+            (name, value.replace("\\", "\\\\").replace('"', '\\"'))
+            for name, value in labels
+        )
+        return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+class Counter(Metric):
+    """A value that only goes up, e.g. the number of checks."""
+
+    type_name = "counter"
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        """
+        Increments the counter.
+
+        Args:
+            *label_values (str): The label values, in the order of `label_names`.
+            amount (float): The amount to add. Defaults to 1.
+        """
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def merge(self, values: Dict[Tuple[str, ...], float]) -> None:
+        for label_values, amount in values.items():
+            self.inc(*label_values, amount=amount)
+
+
+class Gauge(Metric):
+    """A value that is set to the latest observation, e.g. a timestamp."""
+
+    type_name = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        label_names: Sequence[str] = (),
+        keep_max: bool = True,
+    ):
+        """
+        Initializes the gauge and registers it.
+
+        Args:
+            name (str): The metric name, e.g. "vfs_notification_queue_depth".
+            help_text (str): The description shown in the exposition.
+            label_names (Sequence[str]): The names of the labels of the metric.
+            keep_max (bool): Whether merged values only replace lower values, as
+                for timestamps. Otherwise the last merged value wins. Defaults
+                to True.
+        """
+        super().__init__(name, help_text, label_names)
+        self.keep_max = keep_max
+
+    def set(self, value: float, *label_values: str) -> None:
+        """
+        Sets the gauge.
+
+        Args:
+            value (float): The new value.
+            *label_values (str): The label values, in the order of `label_names`.
+        """
+        with self._lock:
+            self._values[label_values] = value
+
+    def merge(self, values: Dict[Tuple[str, ...], float]) -> None:
+        with self._lock:
+            for label_values, value in values.items():
+                if self.keep_max:
+                    value = max(value, self._values.get(label_values, value))
+                self._values[label_values] = value
+
+
+class Histogram(Metric):
+    """A distribution of observed values, e.g. latencies in seconds."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        """
+        Initializes the histogram and registers it.
+
+        Args:
+            name (str): The metric name, e.g. "vfs_check_duration_seconds".
+            help_text (str): The description shown in the exposition.
+            label_names (Sequence[str]): The names of the labels of the metric.
+            buckets (Sequence[float]): The sorted upper bounds of the buckets.
+        """
+        super().__init__(name, help_text, label_names)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, *label_values: str) -> None:
+        """
+        Adds an observation to the histogram.
+
+        Args:
+            value (float): The observed value.
+            *label_values (str): The label values, in the order of `label_names`.
+        """
+        with self._lock:
+            state = self._values.get(label_values)
+            if state is None:
+                state = self._values[label_values] = [
+                    [0] * (len(self.buckets) + 1),
+                    0.0,
+                ]
+            state[0][bisect_left(self.buckets, value)] += 1
+            state[1] += value
+
+    def merge(self, values: Dict[Tuple[str, ...], List]) -> None:
+        with self._lock:
+            for label_values, (bucket_counts, total) in values.items():
+                state = self._values.setdefault(
+                    label_values, [[0] * (len(self.buckets) + 1), 0.0]
+                )
+                state[0] = [a + b for a, b in zip(state[0], bucket_counts)]
+                state[1] += total
+
+    def _copy(self, value: List) -> List:
+        return [list(value[0]), value[1]]
+
+    def _render_value(self, label_values: Tuple[str, ...], value) -> Iterator[str]:
+        bucket_counts, total = value
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), bucket_counts):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else f"{bound:g}"
+            yield f"{self.name}_bucket{self._format_labels(label_values, ('le', le))} {cumulative}"
+        labels = self._format_labels(label_values)
+        yield f"{self.name}_sum{labels} {total:.15g}"
+        yield f"{self.name}_count{labels} {cumulative}"
+
+
+REGISTRY: List[Metric] = []
+
+CHECK_DURATION = Histogram(
+    "vfs_check_duration_seconds",
+    "End-to-end duration of an appointment check",
+    ("route", "outcome"),
+)
+PHASE_DURATION = Histogram(
+    "vfs_check_phase_duration_seconds",
+    "Duration of a phase of an appointment check",
+    ("route", "phase"),
+)
+CHECKS = Counter(
+    "vfs_checks_total", "Number of appointment checks", ("route", "outcome")
+)
+LOGIN_FAILURES = Counter(
+    "vfs_login_failures_total", "Number of failed logins", ("route",)
+)
+SLOTS_FOUND = Counter(
+    "vfs_slots_found_total", "Number of appointment dates found by checks", ("route",)
+)
+NOTIFICATION_LATENCY = Histogram(
+    "vfs_notification_latency_seconds",
+    "Time taken to deliver a notification batch to a channel",
+    ("channel", "outcome"),
+)
+LAST_SUCCESSFUL_CHECK = Gauge(
+    "vfs_last_successful_check_timestamp_seconds",
+    "UNIX time of the last check that completed without error",
+)
+# The outbox is shared by all processes, so the last reported value is current
+NOTIFICATION_QUEUE_DEPTH = Gauge(
+    "vfs_notification_queue_depth",
+    "Number of notifications waiting in the outbox",
+    ("channel",),
+    keep_max=False,
+)
+NOTIFICATION_RATE_LIMIT_WAIT = Gauge(
+    "vfs_notification_rate_limit_wait_seconds",
+    "Time until the rate limiter lets the next notification through",
+    ("channel",),
+    keep_max=False,
+)
+
+
+def observe_check(check_record: CheckRecord) -> None:
+    """
+    Updates the check metrics with a finished check.
+
+    Args:
+        check_record (CheckRecord): The finished check.
+    """
+    route = check_record.route
+    CHECKS.inc(route, check_record.outcome)
+    CHECK_DURATION.observe(check_record.duration, route, check_record.outcome)
+    for phase, duration in check_record.phases.items():
+        PHASE_DURATION.observe(duration, route, phase)
+    if check_record.outcome == "login_error":
+        LOGIN_FAILURES.inc(route)
+    elif check_record.outcome not in ("error", "timeout"):
+        LAST_SUCCESSFUL_CHECK.set(check_record.finished_at)
+    if check_record.dates:
+        SLOTS_FOUND.inc(route, amount=len(check_record.dates))
+
+
+def observe_delivery(channel: str, outcome: str, latency: float) -> None:
+    """
+    Updates the notification metrics with a delivery attempt.
+
+    Args:
+        channel (str): The notification channel name.
+        outcome (str): "sent", "rate_limited", "failed" or "timed_out".
+        latency (float): The time taken by the attempt in seconds.
+    """
+    NOTIFICATION_LATENCY.observe(latency, channel, outcome)
+
+
+def observe_queue(channel: str, depth: int, rate_limit_wait: float) -> None:
+    """
+    Updates the notification queue metrics of a channel.
+
+    Args:
+        channel (str): The notification channel name.
+        depth (int): The number of notifications waiting in the outbox.
+        rate_limit_wait (float): The seconds until the channel may send again.
+    """
+    NOTIFICATION_QUEUE_DEPTH.set(depth, channel)
+    NOTIFICATION_RATE_LIMIT_WAIT.set(rate_limit_wait, channel)
+
+
+def drain_metrics() -> Dict[str, Dict]:
+    """
+    Returns the metrics collected by this process and resets them.
+
+    Worker processes send the drained metrics to the main process, which
+    merges them with `merge_metrics` and serves them.
+
+    Returns:
+        Dict[str, Dict]: The drained values by metric name.
+    """
+    return {metric.name: metric.drain() for metric in REGISTRY}
+
+
+def merge_metrics(metrics: Dict[str, Dict]) -> None:
+    """
+    Adds metrics drained in another process to the metrics of this process.
+
+    Args:
+        metrics (Dict[str, Dict]): The values by metric name, from `drain_metrics`.
+    """
+    for metric in REGISTRY:
+        values = metrics.get(metric.name)
+        if values:
+            metric.merge(values)
+
+
+def render_metrics() -> str:
+    """
+    Renders every metric in the Prometheus text exposition format.
+
+    Returns:
+        str: The exposition text.
+    """
+    return "\n".join(line for metric in REGISTRY for line in metric.render()) + "\n"
+
+
+class MetricsRequestHandler(BaseHTTPRequestHandler):
+    """Serves the metrics on `/metrics`."""
+
+    def do_GET(self) -> None:
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render_metrics().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        logging.debug(f"Metrics request: {format % args}")
+
+
+class MetricsServer:
+    """
+    HTTP server exposing the metrics to Prometheus, on a background thread.
+    """
+
+    def __init__(self, host: str, port: int):
+        """
+        Starts serving the metrics.
+
+        Args:
+            host (str): The address to listen on.
+            port (int): The port to listen on.
+        """
+        self._server = ThreadingHTTPServer((host, port), MetricsRequestHandler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="metrics", daemon=True
+        )
+        self._thread.start()
+        logging.info(f"Serving metrics on http://{host}:{port}/metrics")
+
+    def close(self) -> None:
+        """
+        Stops the server.
+        """
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def start_metrics_server() -> Optional[MetricsServer]:
+    """
+    Starts the metrics server configured in the `metrics` section, if enabled.
+
+    Returns:
+        Optional[MetricsServer]: The metrics server, or None if it is disabled.
+    """
+    global _metrics_server
+    if get_config_value("metrics", "enabled", "False") not in ("True", "true"):
+        return None
+    if _metrics_server is None:
+        _metrics_server = MetricsServer(
+            get_config_value("metrics", "host", "127.0.0.1"),
+            int(get_config_value("metrics", "port", "9464")),
+        )
+    return _metrics_server
+
+
+def close_metrics_server() -> None:
+    """
+    Stops the metrics server, if it is running.
+    """
+    global _metrics_server
+    if _metrics_server is not None:
+        _metrics_server.close()
+        _metrics_server = None
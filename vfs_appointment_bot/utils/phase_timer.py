@@ -0,0 +1,43 @@
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+
+class PhaseTimer:
+    """
+    Measures how long the phases of one appointment check take.
+
+    Each phase, e.g. "login" or "check", is timed with `measure`. A phase
+    measured several times during one check accumulates its durations.
+    """
+
+    def __init__(self):
+        """
+        Initializes a timer without any measured phase.
+        """
+        self.durations: Dict[str, float] = {}
+
+    @contextmanager
+    def measure(self, phase: str) -> Iterator[None]:
+        """
+        Adds the time spent in the `with` block to a phase.
+
+        The time is added even if the block raises, so failed phases are
+        measured as well.
+
+        Args:
+            phase (str): The phase name.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.durations[phase] = (
+                self.durations.get(phase, 0.0) + time.perf_counter() - start
+            )
+
+    def reset(self) -> None:
+        """
+        Forgets the measured phases, before a new check starts.
+        """
+        self.durations = {}
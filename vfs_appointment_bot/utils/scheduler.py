@@ -0,0 +1,177 @@
+import json
+import logging
+import os
+import random
+import time
+from enum import Enum
+from typing import Callable, Dict, Optional
+
+from vfs_appointment_bot.utils.config_reader import get_config_value
+
+
+class CheckOutcome(Enum):
+    """Outcome of an appointment check, as seen by the polling scheduler."""
+
+    FOUND = "found"
+    NOT_FOUND = "not_found"
+    ERROR = "error"
+    LOGIN_ERROR = "login_error"
+    TIMEOUT = "timeout"
+
+
+class PollingScheduler:
+    """
+    Adaptive interval between appointment checks.
+
+    The interval starts from a base interval and is adjusted after every check:
+
+    - Failed checks, failed logins and timed out checks back off exponentially,
+      so the bot does not hammer a site that is down, slow or blocking the account.
+    - Hours of the week in which past checks found slots are learned as "hot
+      windows", in which the interval is tightened to `hot_interval`.
+    - A random jitter spreads the checks so they do not follow a fixed pattern.
+
+    The result is always kept between `min_interval` and `max_interval`. The
+    clock and random source can be injected, which makes the scheduler fully
+    deterministic in tests.
+    """
+
+    def __init__(
+        self,
+        base_interval: float,
+        min_interval: float,
+        max_interval: float,
+        backoff_factor: float = 2.0,
+        jitter: float = 0.1,
+        hot_interval: Optional[float] = None,
+        hot_window_threshold: int = 1,
+        state_path: Optional[str] = None,
+        clock: Callable[[], float] = time.time,
+        rng: Callable[[], float] = random.random,
+    ):
+        """
+        Initializes the polling scheduler.
+
+        Args:
+            base_interval (float): Interval in seconds after a normal check.
+            min_interval (float): Lower bound of the interval in seconds.
+            max_interval (float): Upper bound of the interval in seconds.
+            backoff_factor (float): Multiplier applied per consecutive failure.
+            jitter (float): Maximum relative jitter, e.g. 0.1 for +/-10%.
+            hot_interval (Optional[float]): Interval in seconds inside hot windows.
+                Defaults to `min_interval`.
+            hot_window_threshold (int): Number of past finds that make an hour of
+                the week a hot window.
+            state_path (Optional[str]): JSON file in which the learned hot windows
+                are kept across restarts. Defaults to None (not persisted).
+            clock (Callable[[], float]): Returns the current UNIX time.
+            rng (Callable[[], float]): Returns a random float in [0, 1).
+        """
+        self.base_interval = base_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff_factor = backoff_factor
+        self.jitter = jitter
+        self.hot_interval = hot_interval if hot_interval is not None else min_interval
+        self.hot_window_threshold = hot_window_threshold
+        self.state_path = state_path
+        self.clock = clock
+        self.rng = rng
+        self.consecutive_failures = 0
+        self.hot_windows: Dict[str, int] = self._load_hot_windows()
+
+    def record(self, outcome: CheckOutcome) -> None:
+        """
+        Records the outcome of a check.
+
+        Args:
+            outcome (CheckOutcome): The outcome of the check.
+        """
+        if outcome in (
+            CheckOutcome.ERROR,
+            CheckOutcome.LOGIN_ERROR,
+            CheckOutcome.TIMEOUT,
+        ):
+            self.consecutive_failures += 1
+            return
+
+        self.consecutive_failures = 0
+        if outcome == CheckOutcome.FOUND:
+            window = self._get_window()
+            self.hot_windows[window] = self.hot_windows.get(window, 0) + 1
+            self._save_hot_windows()
+
+    def next_interval(self, base_interval: Optional[float] = None) -> float:
+        """
+        Computes the number of seconds to wait before the next check.
+
+        Args:
+            base_interval (Optional[float]): Overrides the base interval for this
+                check, e.g. for the faster HTTP probe. Defaults to None.
+
+        Returns:
+            float: The interval in seconds.
+        """
+        interval = base_interval if base_interval is not None else self.base_interval
+        if self.consecutive_failures:
+            # The exponent is capped to keep the float from overflowing
+            interval *= self.backoff_factor ** min(self.consecutive_failures, 32)
+        elif self.is_hot_window():
+            interval = min(interval, self.hot_interval)
+
+        interval *= 1 + self.jitter * (2 * self.rng() - 1)
+        return max(self.min_interval, min(self.max_interval, interval))
+
+    def is_hot_window(self) -> bool:
+        """
+        Checks whether past checks found slots in the current hour of the week.
+
+        Returns:
+            bool: True if the current hour of the week is a hot window.
+        """
+        return self.hot_windows.get(self._get_window(), 0) >= self.hot_window_threshold
+
+    def _get_window(self) -> str:
+        local_time = time.localtime(self.clock())
+        return f"{local_time.tm_wday}-{local_time.tm_hour}"
+
+    def _load_hot_windows(self) -> Dict[str, int]:
+        if not self.state_path:
+            return {}
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as state_file:
+                return json.load(state_file)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_hot_windows(self) -> None:
+        if not self.state_path:
+            return
+        tmp_path = self.state_path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as state_file:
+                json.dump(self.hot_windows, state_file)
+            os.replace(tmp_path, self.state_path)
+        except OSError as e:
+            logging.warning(f"Failed to save scheduler state: {e}")
+
+
+def get_polling_scheduler() -> PollingScheduler:
+    """
+    Creates a `PollingScheduler` from the `default` and `scheduler` configuration sections.
+
+    Returns:
+        PollingScheduler: The polling scheduler.
+    """
+    base_interval = float(get_config_value("default", "interval", "180"))
+    min_interval = float(get_config_value("scheduler", "min_interval", "10"))
+    return PollingScheduler(
+        base_interval,
+        min_interval,
+        float(get_config_value("scheduler", "max_interval", "1800")),
+        float(get_config_value("scheduler", "backoff_factor", "2")),
+        float(get_config_value("scheduler", "jitter", "0.1")),
+        float(get_config_value("scheduler", "hot_interval", "60")),
+        int(get_config_value("scheduler", "hot_window_threshold", "1")),
+        get_config_value("scheduler", "state_path", ".vfs_scheduler.json"),
+    )
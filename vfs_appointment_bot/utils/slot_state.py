@@ -0,0 +1,138 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from vfs_appointment_bot.utils.config_reader import get_config_value
+
+_slot_state: "SlotState" = None
+_slot_state_pid: Optional[int] = None
+_slot_state_lock = threading.Lock()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS announced_slots (
+    route TEXT NOT NULL,
+    params TEXT NOT NULL,
+    date TEXT NOT NULL,
+    announced_at REAL NOT NULL,
+    PRIMARY KEY (route, params, date)
+) WITHOUT ROWID
+"""
+
+
+class SlotState:
+    """
+    Persistent record of the appointment dates already announced to the user.
+
+    Dates are kept per route and set of appointment parameters in a SQLite
+    database, so the state survives restarts and can be shared by the worker
+    processes of a watchlist. Every update only touches the rows of the dates
+    that appeared or disappeared.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initializes the slot state and creates the database if needed.
+
+        Args:
+            path (str): Path of the SQLite database file.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        with self._connection:
+            self._connection.execute(SCHEMA)
+
+    def update(
+        self, route: str, appointment_params: Dict[str, str], dates: List[date]
+    ) -> Tuple[List[date], List[date]]:
+        """
+        Replaces the announced dates of a route with the dates of the latest check.
+
+        Args:
+            route (str): The route, e.g. "in-de".
+            appointment_params (Dict[str, str]): A dictionary containing appointment search criteria.
+            dates (List[date]): The appointment dates found by the latest check.
+
+        Returns:
+            Tuple[List[date], List[date]]: The dates that were not announced before,
+                in the order they were found, and the announced dates that are no
+                longer available.
+        """
+        params = json.dumps(appointment_params, sort_keys=True)
+        with self._lock, self._connection:
+            announced = {
+                date.fromisoformat(row[0])
+                for row in self._connection.execute(
+                    "SELECT date FROM announced_slots WHERE route = ? AND params = ?",
+                    (route, params),
+                )
+            }
+            added = [
+                slot_date
+                for slot_date in dict.fromkeys(dates)
+                if slot_date not in announced
+            ]
+            removed = sorted(announced.difference(dates))
+
+            now = time.time()
+            self._connection.executemany(
+                "INSERT INTO announced_slots VALUES (?, ?, ?, ?)",
+                [(route, params, slot_date.isoformat(), now) for slot_date in added],
+            )
+            self._connection.executemany(
+                "DELETE FROM announced_slots WHERE route = ? AND params = ? AND date = ?",
+                [(route, params, slot_date.isoformat()) for slot_date in removed],
+            )
+        return added, removed
+
+    def clear(self) -> None:
+        """
+        Forgets all announced dates.
+        """
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM announced_slots")
+
+    def close(self) -> None:
+        """
+        Closes the database connection.
+        """
+        with self._lock:
+            self._connection.close()
+
+
+def get_slot_state() -> Optional[SlotState]:
+    """
+    Returns the process-wide `SlotState` configured in the `slot-state` section.
+
+    A new connection is opened in every process, since SQLite connections must
+    not be shared across a fork.
+
+    Returns:
+        Optional[SlotState]: The slot state, or None if it is disabled.
+    """
+    global _slot_state, _slot_state_pid
+    if get_config_value("slot-state", "enabled", "True") not in ("True", "true"):
+        return None
+    with _slot_state_lock:
+        if _slot_state is None or _slot_state_pid != os.getpid():
+            _slot_state = SlotState(
+                get_config_value("slot-state", "path", ".vfs_slots.db")
+            )
+            _slot_state_pid = os.getpid()
+    return _slot_state
+
+
+def is_slot_removal_notified() -> bool:
+    """
+    Checks whether the user is notified when announced slots disappear.
+
+    Returns:
+        bool: True if "slots gone" notifications are enabled.
+    """
+    return get_config_value("slot-state", "notify_removed", "False") in ("True", "true")
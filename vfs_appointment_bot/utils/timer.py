@@ -1,21 +1,141 @@
+import logging
+import os
+import signal
+import threading
 import time
+from typing import Optional
 
 from tqdm import tqdm
 
+from vfs_appointment_bot.utils.config_reader import get_config_value
 
-def countdown(t: int, message="Countdown", unit="seconds"):
+
+class PeriodicTimer:
+    """
+    Drift-free, interruptible timer for running checks at a fixed rate.
+
+    Periods are measured start-to-start against the monotonic clock: the time
+    a check takes is deducted from the wait, and a check that overran its
+    period is followed by the next one right away. A wait can be cut short by
+    `wake()`, which can be bound to a signal (e.g. SIGUSR1) or triggered by
+    creating a trigger file, so an operator can force an immediate check.
+    """
+
+    def __init__(
+        self,
+        show_progress: bool = True,
+        trigger_file: Optional[str] = None,
+        tick: float = 0.5,
+    ):
+        """
+        Initializes the timer.
+
+        Args:
+            show_progress (bool): Whether to show a countdown in the terminal.
+                Defaults to True.
+            trigger_file (Optional[str]): Path of a file whose creation wakes the
+                timer. The file is removed when it is seen. Defaults to None.
+            tick (float): Maximum number of seconds between two checks of the
+                trigger file and updates of the countdown. Defaults to 0.5.
+        """
+        self.show_progress = show_progress
+        self.trigger_file = trigger_file
+        self.tick = tick
+        self._wake_event = threading.Event()
+        self._last_start: Optional[float] = None
+
+    def mark_start(self) -> None:
+        """
+        Records the start of a check, from which the next period is measured.
+        """
+        self._last_start = time.monotonic()
+
+    def wake(self) -> None:
+        """
+        Ends the current or next wait immediately.
+        """
+        self._wake_event.set()
+
+    def install_signal_handler(self, signal_name: str) -> None:
+        """
+        Wakes the timer whenever the process receives the given signal.
+
+        Args:
+            signal_name (str): Name of the signal, e.g. "SIGUSR1". Signals that
+                are not available on the platform are ignored with a warning.
+        """
+        signum = getattr(signal, signal_name, None)
+        if signum is None:
+            logging.warning(f"Signal {signal_name} is not supported on this platform")
+            return
+        signal.signal(signum, lambda *_: self.wake())
+
+    def wait(self, period: float, message: str = "Next check in") -> bool:
+        """
+        Waits until `period` seconds after the last `mark_start()` call.
+
+        Args:
+            period (float): The period in seconds; fractions are supported.
+            message (str, optional): The message shown with the countdown.
+                Defaults to "Next check in".
+
+        Returns:
+            bool: True if the wait was cut short by a wake-up, False otherwise.
+        """
+        start = self._last_start if self._last_start is not None else time.monotonic()
+        deadline = start + period
+        progress_bar = None
+        if self.show_progress:
+            progress_bar = tqdm(
+                total=round(max(deadline - time.monotonic(), 0), 1),
+                desc=message,
+                unit="seconds",
+                bar_format="{desc}: {remaining}",
+            )
+
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if self._consume_wake_up():
+                    logging.info("Timer woken up, checking now")
+                    return True
+                if remaining <= 0:
+                    return False
+                wait_start = time.monotonic()
+                self._wake_event.wait(min(self.tick, remaining))
+                if progress_bar is not None:
+                    progress_bar.update(round(time.monotonic() - wait_start, 1))
+        finally:
+            if progress_bar is not None:
+                progress_bar.close()
+
+    def _consume_wake_up(self) -> bool:
+        if self.trigger_file and os.path.exists(self.trigger_file):
+            try:
+                os.remove(self.trigger_file)
+            except OSError:
+                pass
+            self._wake_event.set()
+
+        if self._wake_event.is_set():
+            self._wake_event.clear()
+            return True
+        return False
+
+
+def get_periodic_timer() -> PeriodicTimer:
     """
-    Implements a countdown timer
+    Creates a `PeriodicTimer` from the `timer` configuration section.
 
-    Args:
-        t (int): The initial countdown time in the specified unit (e.g., seconds, minutes).
-        message (str, optional): The message to display during the countdown.
-                                Defaults to "Countdown".
-        unit (str, optional): The unit of time for the countdown. Defaults to "seconds".
+    Returns:
+        PeriodicTimer: The timer, with its wake-up signal handler installed.
     """
-    with tqdm(
-        total=t, desc=message, unit=unit, bar_format="{desc}: {remaining}"
-    ) as pbar:
-        for _ in range(t):
-            time.sleep(1)
-            pbar.update(1)
+    periodic_timer = PeriodicTimer(
+        get_config_value("timer", "progress", "True") in ("True", "true"),
+        get_config_value("timer", "trigger_file") or None,
+        float(get_config_value("timer", "tick", "0.5")),
+    )
+    wake_signal = get_config_value("timer", "wake_signal", "SIGUSR1")
+    if wake_signal:
+        periodic_timer.install_signal_handler(wake_signal)
+    return periodic_timer
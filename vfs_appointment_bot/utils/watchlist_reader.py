@@ -0,0 +1,72 @@
+from configparser import ConfigParser
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+
+class WatchlistError(Exception):
+    """Exception raised when a watchlist file is missing or invalid."""
+
+
+@dataclass
+class WatchlistEntry:
+    """A single route and its appointment parameters from a watchlist file."""
+
+    name: str
+    source_country_code: str
+    destination_country_code: str
+    appointment_params: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def route(self) -> str:
+        return f"{self.source_country_code}-{self.destination_country_code}"
+
+
+def read_watchlist(path: str) -> List[WatchlistEntry]:
+    """
+    Reads a watchlist INI file.
+
+    Every section describes one entry. The `route` key holds the source and
+    destination country codes (e.g. `IN-DE`) and every other key is used as an
+    appointment parameter:
+
+        [in-de-national]
+        route = IN-DE
+        visa_center = New Delhi
+        visa_category = National Visa
+        visa_sub_category = Student
+
+    Args:
+        path (str): Path of the watchlist file.
+
+    Returns:
+        List[WatchlistEntry]: The watchlist entries in file order.
+
+    Raises:
+        WatchlistError: If the file cannot be read or an entry has no valid route.
+    """
+    watchlist = ConfigParser()
+    if not watchlist.read(path):
+        raise WatchlistError(f"Watchlist file {path} not found")
+
+    entries = []
+    for name in watchlist.sections():
+        appointment_params = dict(watchlist[name])
+        route = appointment_params.pop("route", "")
+        try:
+            source_country_code, destination_country_code = route.split("-")
+        except ValueError:
+            raise WatchlistError(
+                f"Watchlist entry '{name}' needs a route like IN-DE, got '{route}'"
+            )
+        entries.append(
+            WatchlistEntry(
+                name,
+                source_country_code.strip().upper(),
+                destination_country_code.strip().upper(),
+                appointment_params,
+            )
+        )
+
+    if not entries:
+        raise WatchlistError(f"Watchlist file {path} has no entries")
+    return entries
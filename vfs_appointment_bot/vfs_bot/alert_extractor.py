@@ -0,0 +1,74 @@
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Dict, Iterable, List
+
+import playwright.sync_api
+
+from vfs_appointment_bot.utils.date_utils import parse_dates_batch
+
+# Maps an alert element to its text and attributes. Shared by the extraction
+# below and the MutationObserver of `SlotWatcher`, so alerts read either way
+# look the same.
+ALERT_MAPPER_SCRIPT = """
+(element) => ({
+    text: element.textContent.trim(),
+    attributes: Object.fromEntries(
+        Array.from(element.attributes, (attribute) => [attribute.name, attribute.value])
+    ),
+})
+"""
+
+# Collects every matching alert in a single round-trip to the browser
+EXTRACT_ALERTS_SCRIPT = f"(elements) => elements.map({ALERT_MAPPER_SCRIPT})"
+
+
+@dataclass
+class Alert:
+    """An appointment alert shown in the booking form."""
+
+    text: str
+    attributes: Dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def from_payload(cls, payload: Any) -> "Alert":
+        """
+        Creates an Alert from the object built by `ALERT_MAPPER_SCRIPT`.
+
+        Args:
+            payload (Any): The alert object returned by the page.
+
+        Returns:
+            Alert: The alert.
+        """
+        return cls(payload.get("text") or "", payload.get("attributes") or {})
+
+
+def extract_alerts(page: playwright.sync_api.Page, selector: str) -> List[Alert]:
+    """
+    Reads the text and attributes of every alert matching a selector.
+
+    All alerts are read in one `eval_on_selector_all` call, instead of one
+    call per element.
+
+    Args:
+        page (playwright.sync_api.Page): The page showing the alerts.
+        selector (str): Selector of the appointment alerts.
+
+    Returns:
+        List[Alert]: The alerts, in document order.
+    """
+    payload = page.eval_on_selector_all(selector, EXTRACT_ALERTS_SCRIPT)
+    return [Alert.from_payload(alert) for alert in payload]
+
+
+def get_alert_dates(alerts: Iterable[Alert]) -> List[date]:
+    """
+    Extracts the appointment dates mentioned in alerts.
+
+    Args:
+        alerts (Iterable[Alert]): The alerts to read.
+
+    Returns:
+        List[date]: The dates of all alerts, sorted and without duplicates.
+    """
+    return parse_dates_batch(alert.text for alert in alerts)
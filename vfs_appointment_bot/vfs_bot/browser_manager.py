@@ -0,0 +1,187 @@
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from playwright.sync_api import Browser, BrowserContext, Page, Playwright
+from playwright.sync_api import Error as PlaywrightError
+from playwright.sync_api import sync_playwright
+from playwright_stealth import stealth_sync
+
+from vfs_appointment_bot.utils.config_reader import get_config_value
+
+# The browser manager of every thread, see `get_browser_manager`
+_browser_managers = threading.local()
+
+
+class BrowserManager:
+    """
+    Long-lived owner of the Playwright driver and browser of a thread.
+
+    Launching a browser costs several seconds, so the browser is started once
+    and shared by every appointment check. Each page is handed out in its own
+    browser context, with the stealth init scripts registered once on that
+    context. The browser is only relaunched when it has crashed or fails the
+    health check.
+
+    When `trace_dir` is set, every context records a Playwright trace with
+    screenshots, DOM snapshots and network activity, saved to that directory
+    when its page is closed.
+    """
+
+    def __init__(self):
+        self._playwright: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+        self._page_contexts: Dict[Page, BrowserContext] = {}
+        self.launch_count = 0
+        self.last_launch_duration = 0.0
+        self.launch_time_saved = 0.0
+        self.reuse_count = 0
+        self.trace_dir: Optional[str] = None
+
+    def new_page(self, storage_state: Optional[Dict] = None) -> Page:
+        """
+        Hands out a new page in a fresh, stealth-enabled browser context.
+
+        The shared browser is launched on first use and relaunched when the
+        health check fails. Every reuse of a running browser is counted
+        towards the launch time saved.
+
+        Args:
+            storage_state (Optional[Dict]): Playwright storage state (cookies and
+                local storage) to seed the new context with. Defaults to None.
+
+        Returns:
+            playwright.sync_api.Page: A new page ready for navigation.
+        """
+        if self.is_healthy():
+            self._record_reuse()
+        else:
+            self._launch()
+
+        try:
+            context = self._new_context(storage_state)
+        except PlaywrightError as e:
+            logging.warning(f"Browser context creation failed, relaunching: {e}")
+            self._launch()
+            context = self._new_context(storage_state)
+
+        page = context.new_page()
+        self._page_contexts[page] = context
+        return page
+
+    def close_page(self, page: Page) -> None:
+        """
+        Closes a page handed out by `new_page` together with its context.
+
+        The browser itself stays alive for the next check.
+
+        Args:
+            page (playwright.sync_api.Page): The page to close.
+        """
+        context = self._page_contexts.pop(page, None)
+        try:
+            if context is not None:
+                if self.trace_dir is not None:
+                    self._save_trace(context)
+                context.close()
+            else:
+                page.close()
+        except PlaywrightError as e:
+            logging.debug(f"Failed to close page: {e}")
+
+    def is_healthy(self) -> bool:
+        """
+        Checks whether the shared browser is running and still connected.
+
+        Returns:
+            bool: True if the browser can be reused, False otherwise.
+        """
+        return self._browser is not None and self._browser.is_connected()
+
+    def close(self) -> None:
+        """
+        Closes the browser and stops the Playwright driver.
+        """
+        self._close_browser()
+        if self._playwright is not None:
+            self._playwright.stop()
+            self._playwright = None
+
+    def _new_context(self, storage_state: Optional[Dict]) -> BrowserContext:
+        context = self._browser.new_context(storage_state=storage_state)
+        stealth_sync(context)
+        if self.trace_dir is not None:
+            context.tracing.start(screenshots=True, snapshots=True, sources=False)
+        return context
+
+    def _save_trace(self, context: BrowserContext) -> None:
+        os.makedirs(self.trace_dir, exist_ok=True)
+        path = os.path.join(self.trace_dir, f"trace-{time.time_ns()}.zip")
+        context.tracing.stop(path=path)
+        logging.info(
+            f"Saved Playwright trace to {path}, open it with 'playwright show-trace {path}'"
+        )
+
+    def _launch(self) -> None:
+        browser_type = get_config_value("browser", "type", "firefox")
+        headless_mode = get_config_value("browser", "headless", "True")
+
+        self._close_browser()
+        if self._playwright is None:
+            self._playwright = sync_playwright().start()
+
+        launch_start = time.perf_counter()
+        self._browser = getattr(self._playwright, browser_type).launch(
+            headless=headless_mode in ("True", "true")
+        )
+        self.last_launch_duration = time.perf_counter() - launch_start
+        self.launch_count += 1
+        logging.info(
+            f"Launched {browser_type} browser in {self.last_launch_duration:.2f}s "
+            + f"(launch #{self.launch_count})"
+        )
+
+    def _close_browser(self) -> None:
+        self._page_contexts.clear()
+        if self._browser is not None:
+            try:
+                self._browser.close()
+            except PlaywrightError as e:
+                logging.debug(f"Failed to close browser: {e}")
+            self._browser = None
+
+    def _record_reuse(self) -> None:
+        self.reuse_count += 1
+        self.launch_time_saved += self.last_launch_duration
+        logging.info(
+            f"Reused running browser, saved {self.last_launch_duration:.2f}s launch time "
+            + f"({self.launch_time_saved:.2f}s over {self.reuse_count} cycles)"
+        )
+
+
+def get_browser_manager() -> BrowserManager:
+    """
+    Returns the `BrowserManager` of the calling thread, creating it on first use.
+
+    Playwright's sync API can only be used from the thread that started it,
+    so every thread checking routes gets its own driver and browser.
+
+    Returns:
+        BrowserManager: The browser manager shared by the checks of this thread.
+    """
+    browser_manager = getattr(_browser_managers, "browser_manager", None)
+    if browser_manager is None:
+        browser_manager = _browser_managers.browser_manager = BrowserManager()
+    return browser_manager
+
+
+def close_browser_manager() -> None:
+    """
+    Shuts down the `BrowserManager` of the calling thread if it was created.
+    """
+    browser_manager = getattr(_browser_managers, "browser_manager", None)
+    if browser_manager is not None:
+        browser_manager.close()
+        _browser_managers.browser_manager = None
@@ -0,0 +1,119 @@
+import time
+from typing import Callable, Dict
+
+from vfs_appointment_bot.utils.config_reader import get_config_value
+
+# Default timeouts in milliseconds of the steps of a check that wait for the site
+STEP_TIMEOUTS = {
+    # Loading the login page or the dashboard
+    "navigation": 30000,
+    # The "Start New Booking" button shown after signing in
+    "login": 30000,
+    # The dropdowns of the booking form
+    "dropdown": 10000,
+    # The options of an opened dropdown
+    "option": 5000,
+    # The appointment alert shown after the last selection
+    "result": 10000,
+}
+
+# Default budget in seconds of a whole check, login included
+DEFAULT_CHECK_DEADLINE = 120
+
+
+class CheckTimeoutError(Exception):
+    """Exception raised when a step of a check times out."""
+
+
+class CheckDeadline:
+    """
+    Time budget of one appointment check.
+
+    Every step waits at most its own timeout, and never longer than what is
+    left of the budget, so a check that is stuck on a slow site ends when the
+    budget is spent instead of adding up the timeouts of all its steps.
+    """
+
+    def __init__(
+        self,
+        budget: float,
+        step_timeouts: Dict[str, float],
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Starts the budget of a check.
+
+        Args:
+            budget (float): Seconds the whole check may take.
+            step_timeouts (Dict[str, float]): Timeout in milliseconds of every step.
+            clock (Callable[[], float]): Returns a monotonic time in seconds.
+        """
+        self.budget = budget
+        self.step_timeouts = step_timeouts
+        self.clock = clock
+        self.expires_at = clock() + budget
+
+    @property
+    def remaining(self) -> float:
+        """Seconds left of the budget, 0 once it is spent."""
+        return max(self.expires_at - self.clock(), 0.0)
+
+    @property
+    def expired(self) -> bool:
+        """Whether the budget is spent."""
+        return self.remaining == 0
+
+    def timeout(self, step: str) -> float:
+        """
+        Returns the Playwright timeout of a step.
+
+        Args:
+            step (str): The step, one of the keys of `STEP_TIMEOUTS`.
+
+        Returns:
+            float: The timeout of the step in milliseconds, capped to the rest
+                of the budget.
+        """
+        return self.cap(self.step_timeouts[step])
+
+    def cap(self, timeout: float) -> float:
+        """
+        Caps a Playwright timeout to the rest of the budget.
+
+        Args:
+            timeout (float): The timeout in milliseconds.
+
+        Returns:
+            float: The capped timeout in milliseconds. It is at least 1 ms, since
+                Playwright reads a timeout of 0 as no timeout at all.
+        """
+        return max(min(timeout, self.remaining * 1000), 1.0)
+
+
+def get_check_deadline(destination_country_code: str) -> CheckDeadline:
+    """
+    Starts a `CheckDeadline` configured in the `timeouts` section.
+
+    The `check_deadline` key holds the budget in seconds and the step keys
+    (`navigation`, `login`, `dropdown`, `option` and `result`) the step timeouts
+    in milliseconds. Keys of an optional `timeouts-<country>` section (e.g.
+    `timeouts-DE`) override them for that destination country.
+
+    Args:
+        destination_country_code (str): The destination country of the bot.
+
+    Returns:
+        CheckDeadline: The deadline of a check starting now.
+    """
+    country_section = f"timeouts-{destination_country_code.upper()}"
+
+    def get_timeout(key: str, default: float) -> float:
+        value = get_config_value("timeouts", key, str(default))
+        return float(get_config_value(country_section, key, value))
+
+    step_timeouts = {
+        step: get_timeout(step, default) for step, default in STEP_TIMEOUTS.items()
+    }
+    return CheckDeadline(
+        get_timeout("check_deadline", DEFAULT_CHECK_DEADLINE), step_timeouts
+    )
@@ -0,0 +1,207 @@
+import argparse
+import cProfile
+import functools
+import io
+import json
+import logging
+import os
+import pstats
+import time
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional
+
+from vfs_appointment_bot.utils.config_reader import get_config_value
+from vfs_appointment_bot.vfs_bot.browser_manager import get_browser_manager
+from vfs_appointment_bot.vfs_bot.vfs_bot import VfsBot
+
+# Steps of a check recorded in the span log, with a function describing the
+# call arguments worth logging. Credentials are never logged.
+TRACED_METHODS: Dict[str, Optional[Callable[..., str]]] = {
+    "new_session_page": None,
+    "restore_session": None,
+    "open_session": None,
+    "pre_login_steps": None,
+    "reject_cookie_policies": None,
+    "login": None,
+    "fill_login_form": None,
+    "check_for_appontment": None,
+    "select_appointment_params": None,
+    "select_dropdown_option": lambda page, index, value: f"#{index} {value}",
+    "capture_availability": None,
+    "extract_appointment_dates": None,
+    "announce_slots": None,
+}
+
+
+@dataclass
+class Span:
+    """One step of a check, with its UNIX start and end times."""
+
+    name: str
+    depth: int
+    start: float
+    end: float = 0.0
+    detail: Optional[str] = None
+    error: Optional[str] = None
+
+
+class SpanLog:
+    """
+    Records when every step of a check starts and ends.
+
+    The steps listed in `TRACED_METHODS` are wrapped on one bot instance
+    only, and unwrapped again afterwards, so bots that are not traced run
+    their methods unchanged.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty span log.
+        """
+        self.spans: List[Span] = []
+        self._depth = 0
+
+    def instrument(self, bot: VfsBot) -> None:
+        """
+        Records the traced steps of a bot from now on.
+
+        Args:
+            bot (VfsBot): The bot to trace.
+        """
+        for name, describe in TRACED_METHODS.items():
+            setattr(bot, name, self._wrap(name, getattr(bot, name), describe))
+
+    def uninstrument(self, bot: VfsBot) -> None:
+        """
+        Stops recording the steps of a bot.
+
+        Args:
+            bot (VfsBot): The traced bot.
+        """
+        for name in TRACED_METHODS:
+            vars(bot).pop(name, None)
+
+    def write(self, path: str) -> None:
+        """
+        Writes the spans to a file, one JSON object per line.
+
+        Args:
+            path (str): Path of the span log file.
+        """
+        with open(path, "w") as file:
+            for span in self.spans:
+                file.write(json.dumps(asdict(span)) + "\n")
+
+    def log_summary(self) -> None:
+        """
+        Logs the spans as an indented tree with their durations.
+        """
+        for span in self.spans:
+            detail = f" ({span.detail})" if span.detail else ""
+            error = f" failed: {span.error}" if span.error else ""
+            logging.info(
+                f"{'  ' * span.depth}{span.name}{detail}: "
+                + f"{(span.end - span.start) * 1000:.0f} ms{error}"
+            )
+
+    def _wrap(
+        self,
+        name: str,
+        method: Callable,
+        describe: Optional[Callable[..., str]],
+    ) -> Callable:
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            span = Span(name, self._depth, time.time())
+            if describe is not None:
+                span.detail = describe(*args, **kwargs)
+            self.spans.append(span)
+            self._depth += 1
+            try:
+                return method(*args, **kwargs)
+            except Exception as e:
+                span.error = f"{type(e).__name__}: {e}"
+                raise
+            finally:
+                self._depth -= 1
+                span.end = time.time()
+
+        return wrapper
+
+
+def run_profiled_check(
+    vfs_bot: VfsBot,
+    args: argparse.Namespace,
+    profile: bool = False,
+    trace: bool = False,
+) -> bool:
+    """
+    Runs a single check of a bot under the profiler and/or the tracer.
+
+    With `profile`, the check runs under cProfile and the stats are saved and
+    logged sorted by cumulative time. With `trace`, a Playwright trace with
+    screenshots, DOM snapshots and network activity is recorded, and the
+    start and end time of every login, pre-login and appointment check step,
+    including each dropdown selection, are written to a span log. The files
+    are saved to the `output_dir` of the `profiling` section.
+
+    Args:
+        vfs_bot (VfsBot): The bot to check with.
+        args (argparse.Namespace): The parsed command-line arguments.
+        profile (bool): Whether the check runs under cProfile.
+        trace (bool): Whether the check is traced.
+
+    Returns:
+        bool: True if appointments were found, False otherwise.
+    """
+    output_dir = get_config_value("profiling", "output_dir", ".vfs_profiles")
+    os.makedirs(output_dir, exist_ok=True)
+    route = f"{vfs_bot.source_country_code}-{vfs_bot.destination_country_code}"
+    prefix = os.path.join(
+        output_dir, f"{route.lower()}-{time.strftime('%Y%m%d-%H%M%S')}"
+    )
+
+    span_log = SpanLog() if trace else None
+    if span_log is not None:
+        span_log.instrument(vfs_bot)
+        get_browser_manager().trace_dir = output_dir
+    profiler = cProfile.Profile() if profile else None
+    try:
+        if profiler is not None:
+            profiler.enable()
+        try:
+            return vfs_bot.run(args)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            # Closing the pages saves their Playwright traces
+            vfs_bot.close_warm_page()
+            vfs_bot.close_http_probe()
+    finally:
+        if span_log is not None:
+            get_browser_manager().trace_dir = None
+            span_log.uninstrument(vfs_bot)
+            span_log.write(f"{prefix}-spans.jsonl")
+            span_log.log_summary()
+            logging.info(f"Saved span log to {prefix}-spans.jsonl")
+        if profiler is not None:
+            save_profile_stats(profiler, f"{prefix}.prof")
+
+
+def save_profile_stats(profiler: cProfile.Profile, path: str) -> None:
+    """
+    Saves the profiler stats and logs the functions with the most cumulative time.
+
+    The number of functions logged is set by `top` in the `profiling` section.
+
+    Args:
+        profiler (cProfile.Profile): The profiler that ran the check.
+        path (str): Path of the stats file, readable with `pstats` or snakeviz.
+    """
+    profiler.dump_stats(path)
+    output = io.StringIO()
+    stats = pstats.Stats(profiler, stream=output)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(
+        int(get_config_value("profiling", "top", "30"))
+    )
+    logging.info(f"Saved profile to {path}\n{output.getvalue()}")
@@ -0,0 +1,200 @@
+import logging
+import statistics
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+import requests
+from playwright.sync_api import BrowserContext
+from requests.adapters import HTTPAdapter
+
+from vfs_appointment_bot.utils.config_reader import get_config_value
+from vfs_appointment_bot.vfs_bot.response_capture import (
+    AvailabilityCapture,
+    AvailabilityRequest,
+    Slot,
+    UnexpectedAvailabilityResponseError,
+)
+
+# Headers managed by the HTTP client itself or taken from the cookie jar
+EXCLUDED_HEADERS = {"content-length", "host", "cookie", "connection"}
+AUTH_ERROR_STATUS_CODES = {401, 403, 419, 440}
+
+
+class ProbeEscalationError(Exception):
+    """Exception raised when the HTTP probe can no longer replace the browser flow."""
+
+
+class HttpProbe:
+    """
+    Polls the VFS availability API directly, without a browser.
+
+    The probe replays the availability request captured from a logged-in
+    browser page, with the cookies and auth headers of that page, over a
+    pooled keep-alive `requests.Session`. It raises `ProbeEscalationError`
+    when the API rejects the session or answers with an unexpected shape, so
+    that the caller can go back to the full browser flow.
+    """
+
+    def __init__(
+        self,
+        session: requests.Session,
+        availability_request: AvailabilityRequest,
+        availability_capture: AvailabilityCapture,
+        timeout: float,
+    ):
+        """
+        Initializes the HTTP probe.
+
+        Args:
+            session (requests.Session): Session holding the browser cookies.
+            availability_request (AvailabilityRequest): The availability request to replay.
+            availability_capture (AvailabilityCapture): Parser for the availability responses.
+            timeout (float): Request timeout in seconds.
+        """
+        self.session = session
+        self.availability_request = availability_request
+        self.availability_capture = availability_capture
+        self.timeout = timeout
+        self.latencies = deque(maxlen=1000)
+
+    @classmethod
+    def from_context(
+        cls,
+        context: BrowserContext,
+        availability_request: AvailabilityRequest,
+        availability_capture: AvailabilityCapture,
+        timeout: float,
+    ) -> "HttpProbe":
+        """
+        Creates a probe from the cookies of a logged-in browser context.
+
+        Args:
+            context (playwright.sync_api.BrowserContext): The logged-in browser context.
+            availability_request (AvailabilityRequest): The availability request to replay.
+            availability_capture (AvailabilityCapture): Parser for the availability responses.
+            timeout (float): Request timeout in seconds.
+
+        Returns:
+            HttpProbe: The HTTP probe.
+        """
+        session = create_probe_session()
+        for cookie in context.cookies():
+            session.cookies.set(
+                cookie["name"],
+                cookie["value"],
+                domain=cookie.get("domain"),
+                path=cookie.get("path", "/"),
+            )
+        session.headers.update(
+            {
+                name: value
+                for name, value in availability_request.headers.items()
+                if name.lower() not in EXCLUDED_HEADERS
+            }
+        )
+        return cls(session, availability_request, availability_capture, timeout)
+
+    def probe(self, appointment_params: Dict[str, str]) -> List[Slot]:
+        """
+        Sends one availability request and parses the response.
+
+        Args:
+            appointment_params (Dict[str, str]): A dictionary containing appointment search criteria.
+
+        Returns:
+            List[Slot]: The available slots (empty list if none are available).
+
+        Raises:
+            ProbeEscalationError: If the session is rejected or the response has an
+                unexpected shape.
+            requests.RequestException: If the request fails.
+        """
+        start = time.perf_counter()
+        response = self.session.request(
+            self.availability_request.method,
+            self.availability_request.url,
+            data=self.availability_request.body,
+            timeout=self.timeout,
+        )
+        self.latencies.append(time.perf_counter() - start)
+
+        if response.status_code in AUTH_ERROR_STATUS_CODES:
+            raise ProbeEscalationError(
+                f"Availability API rejected the session ({response.status_code})"
+            )
+        try:
+            return self.availability_capture.parse(response.json(), appointment_params)
+        except (ValueError, UnexpectedAvailabilityResponseError) as e:
+            raise ProbeEscalationError(
+                f"Unexpected availability API response ({response.status_code}): {e}"
+            )
+
+    def get_latency_summary(self) -> Optional[str]:
+        """
+        Summarizes the latency of the recent probe requests.
+
+        Returns:
+            Optional[str]: Median, p95 and max latency in milliseconds, or None
+                if no request was sent yet.
+        """
+        if not self.latencies:
+            return None
+        latencies = sorted(self.latencies)
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        return (
+            f"{len(latencies)} requests, median {statistics.median(latencies) * 1000:.0f}ms, "
+            + f"p95 {p95 * 1000:.0f}ms, max {latencies[-1] * 1000:.0f}ms"
+        )
+
+    def close(self) -> None:
+        """
+        Closes the pooled HTTP connections.
+        """
+        self.session.close()
+
+
+def create_probe_session() -> requests.Session:
+    """
+    Creates the keep-alive HTTP session used by the probe.
+
+    Returns:
+        requests.Session: A session with a small connection pool per host.
+    """
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+    session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+    return session
+
+
+def is_http_probe_enabled() -> bool:
+    """
+    Checks whether the HTTP probe mode is enabled in the `http-probe` configuration section.
+
+    Returns:
+        bool: True if the HTTP probe mode is enabled.
+    """
+    return get_config_value("http-probe", "enabled", "False") in ("True", "true")
+
+
+def create_http_probe(
+    context: BrowserContext,
+    availability_request: AvailabilityRequest,
+    availability_capture: AvailabilityCapture,
+) -> HttpProbe:
+    """
+    Creates an `HttpProbe` using the `http-probe` configuration section.
+
+    Args:
+        context (playwright.sync_api.BrowserContext): The logged-in browser context.
+        availability_request (AvailabilityRequest): The availability request to replay.
+        availability_capture (AvailabilityCapture): Parser for the availability responses.
+
+    Returns:
+        HttpProbe: The HTTP probe.
+    """
+    timeout = float(get_config_value("http-probe", "timeout", "10"))
+    logging.info("Switching to browserless HTTP probe for the next checks")
+    return HttpProbe.from_context(
+        context, availability_request, availability_capture, timeout
+    )
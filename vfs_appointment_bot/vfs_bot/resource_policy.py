@@ -0,0 +1,156 @@
+import fnmatch
+import logging
+import re
+from typing import Dict, List, Optional
+
+from playwright.sync_api import BrowserContext, Response, Route
+
+from vfs_appointment_bot.utils.config_reader import get_config_value
+
+# Typical transfer sizes in bytes, used to estimate the bandwidth saved by a
+# blocked request until a size has been observed for its resource type.
+ESTIMATED_RESOURCE_SIZES: Dict[str, int] = {
+    "image": 40_000,
+    "font": 50_000,
+    "media": 250_000,
+    "script": 60_000,
+    "stylesheet": 20_000,
+}
+DEFAULT_ESTIMATED_RESOURCE_SIZE = 10_000
+
+
+class ResourcePolicy:
+    """
+    Blocks heavy and irrelevant requests of the VFS pages through Playwright routing.
+
+    A request is aborted when its resource type is blocked or its URL matches a
+    deny pattern, unless its URL matches an allow pattern. Patterns are glob
+    patterns matched against the full URL (e.g. `*googletagmanager.com*`).
+    The policy counts the requests it blocked and estimates the bytes saved,
+    based on the sizes of responses of the same resource type that were allowed.
+    """
+
+    def __init__(
+        self,
+        blocked_resource_types: List[str],
+        deny_patterns: List[str],
+        allow_patterns: List[str],
+    ):
+        """
+        Initializes the resource policy.
+
+        Args:
+            blocked_resource_types (List[str]): Playwright resource types to block
+                (e.g. "image", "font", "media").
+            deny_patterns (List[str]): URL glob patterns to block.
+            allow_patterns (List[str]): URL glob patterns that are never blocked.
+        """
+        self.blocked_resource_types = set(blocked_resource_types)
+        self._deny_regex = _compile_patterns(deny_patterns)
+        self._allow_regex = _compile_patterns(allow_patterns)
+        # Resource type -> [total bytes, response count] of allowed responses
+        self._observed_sizes: Dict[str, List[int]] = {}
+        self.blocked_requests = 0
+        self.estimated_bytes_saved = 0
+
+    def apply(self, context: BrowserContext) -> None:
+        """
+        Routes every request of a browser context through the policy.
+
+        Args:
+            context (playwright.sync_api.BrowserContext): The context to apply the policy to.
+        """
+        context.route("**/*", self._handle_route)
+        context.on("response", self._record_response)
+
+    def is_blocked(self, url: str, resource_type: str) -> bool:
+        """
+        Decides whether a request is blocked by the policy.
+
+        Args:
+            url (str): The request URL.
+            resource_type (str): The Playwright resource type of the request.
+
+        Returns:
+            bool: True if the request should be aborted, False otherwise.
+        """
+        if self._allow_regex and self._allow_regex.match(url):
+            return False
+        if resource_type in self.blocked_resource_types:
+            return True
+        return bool(self._deny_regex and self._deny_regex.match(url))
+
+    def log_report(self) -> None:
+        """
+        Logs the requests and bytes saved since the last report and resets the counters.
+        """
+        logging.info(
+            f"Resource policy blocked {self.blocked_requests} requests, "
+            + f"saving ~{self.estimated_bytes_saved / 1024:.0f} KB"
+        )
+        self.blocked_requests = 0
+        self.estimated_bytes_saved = 0
+
+    def _handle_route(self, route: Route) -> None:
+        request = route.request
+        if self.is_blocked(request.url, request.resource_type):
+            self.blocked_requests += 1
+            self.estimated_bytes_saved += self._estimate_size(request.resource_type)
+            route.abort("blockedbyclient")
+        else:
+            route.continue_()
+
+    def _record_response(self, response: Response) -> None:
+        content_length = response.headers.get("content-length")
+        if content_length and content_length.isdigit():
+            sizes = self._observed_sizes.setdefault(
+                response.request.resource_type, [0, 0]
+            )
+            sizes[0] += int(content_length)
+            sizes[1] += 1
+
+    def _estimate_size(self, resource_type: str) -> int:
+        sizes = self._observed_sizes.get(resource_type)
+        if sizes:
+            return sizes[0] // sizes[1]
+        return ESTIMATED_RESOURCE_SIZES.get(
+            resource_type, DEFAULT_ESTIMATED_RESOURCE_SIZE
+        )
+
+
+def get_resource_policy(destination_country_code: str) -> Optional[ResourcePolicy]:
+    """
+    Creates a `ResourcePolicy` from the configuration.
+
+    The `resource-policy` section holds the shared settings. Patterns from an
+    optional `resource-policy-<country>` section (e.g. `resource-policy-DE`) are
+    added to the shared allow and deny lists for that destination country.
+
+    Args:
+        destination_country_code (str): The destination country of the bot.
+
+    Returns:
+        Optional[ResourcePolicy]: The resource policy, or None if it is disabled.
+    """
+    if get_config_value("resource-policy", "enabled", "False") not in ("True", "true"):
+        return None
+
+    country_section = f"resource-policy-{destination_country_code.upper()}"
+    return ResourcePolicy(
+        _get_list("resource-policy", "block_resource_types"),
+        _get_list("resource-policy", "deny_patterns")
+        + _get_list(country_section, "deny_patterns"),
+        _get_list("resource-policy", "allow_patterns")
+        + _get_list(country_section, "allow_patterns"),
+    )
+
+
+def _get_list(section: str, key: str) -> List[str]:
+    value = get_config_value(section, key, "")
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def _compile_patterns(patterns: List[str]) -> Optional[re.Pattern]:
+    if not patterns:
+        return None
+    return re.compile("|".join(fnmatch.translate(pattern) for pattern in patterns))
@@ -0,0 +1,149 @@
+import fnmatch
+import re
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+from vfs_appointment_bot.utils.config_reader import get_config_value
+from vfs_appointment_bot.utils.date_utils import parse_dates_batch
+
+
+class UnexpectedAvailabilityResponseError(Exception):
+    """Exception raised when an availability response does not have the expected shape."""
+
+
+@dataclass
+class AvailabilityRequest:
+    """The availability API request sent by the VFS front end, as seen by the browser."""
+
+    url: str
+    method: str
+    headers: Dict[str, str]
+    body: Optional[str] = None
+
+    @classmethod
+    def from_request(cls, request: Any) -> "AvailabilityRequest":
+        """
+        Creates an AvailabilityRequest from a Playwright request.
+
+        Args:
+            request (playwright.sync_api.Request): The request.
+
+        Returns:
+            AvailabilityRequest: The captured request.
+        """
+        return cls(
+            request.url, request.method, dict(request.headers), request.post_data
+        )
+
+
+@dataclass
+class Slot:
+    """An available appointment slot reported by the VFS availability API."""
+
+    date: date
+    centre: Optional[str] = None
+    category: Optional[str] = None
+
+
+class AvailabilityCapture:
+    """
+    Captures the availability API responses fetched by the VFS front end.
+
+    After the last appointment parameter is selected, the Angular app asks the
+    VFS API for the earliest available slots. Reading that JSON response is
+    faster and more reliable than waiting for the result alert to be rendered
+    and scraping its text.
+    """
+
+    def __init__(self, url_patterns: List[str], timeout: float):
+        """
+        Initializes the availability capture.
+
+        Args:
+            url_patterns (List[str]): URL glob patterns of the availability API.
+            timeout (float): Milliseconds to wait for an availability response.
+        """
+        self.timeout = timeout
+        self._url_regex = re.compile(
+            "|".join(fnmatch.translate(pattern) for pattern in url_patterns)
+        )
+
+    def matches(self, response: Any) -> bool:
+        """
+        Checks whether a Playwright response is an availability API response.
+
+        Args:
+            response (playwright.sync_api.Response): The response.
+
+        Returns:
+            bool: True if the response comes from the availability API.
+        """
+        return bool(self._url_regex.match(response.url))
+
+    def parse(self, payload: Any, appointment_params: Dict[str, str]) -> List[Slot]:
+        """
+        Parses an availability API payload into slots.
+
+        The API answers with the earliest date and a list of earliest slots, or
+        with an empty list and an error such as "No slots available".
+
+        Args:
+            payload (Any): The decoded JSON body of the response.
+            appointment_params (Dict[str, str]): The appointment search criteria,
+                used to label the slots with their centre and category.
+
+        Returns:
+            List[Slot]: The available slots (empty list if none are available).
+
+        Raises:
+            UnexpectedAvailabilityResponseError: If the payload does not look like
+                an availability response.
+        """
+        if not isinstance(payload, dict) or (
+            "earliestDate" not in payload and "earliestSlotLists" not in payload
+        ):
+            raise UnexpectedAvailabilityResponseError(
+                f"Unexpected availability response: {str(payload)[:200]}"
+            )
+
+        centre = appointment_params.get("visa_center")
+        category = appointment_params.get(
+            "visa_sub_category", appointment_params.get("visa_category")
+        )
+
+        dates = [
+            slot.get("date")
+            for slot in payload.get("earliestSlotLists") or []
+            if isinstance(slot, dict) and slot.get("date")
+        ]
+        if not dates and payload.get("earliestDate"):
+            dates = [payload["earliestDate"]]
+
+        # The API sends month-first dates, e.g. "05/21/2024 00:00:00"
+        return [
+            Slot(slot_date, centre, category)
+            for slot_date in parse_dates_batch(dates, day_first=False)
+        ]
+
+
+def get_availability_capture() -> Optional[AvailabilityCapture]:
+    """
+    Creates an `AvailabilityCapture` from the `availability-capture` configuration section.
+
+    Returns:
+        Optional[AvailabilityCapture]: The availability capture, or None if it is disabled.
+    """
+    if get_config_value("availability-capture", "enabled", "True") not in (
+        "True",
+        "true",
+    ):
+        return None
+
+    url_patterns = get_config_value(
+        "availability-capture", "url_patterns", "*/appointment/CheckIsSlotAvailable*"
+    )
+    return AvailabilityCapture(
+        [pattern.strip() for pattern in url_patterns.split(",") if pattern.strip()],
+        float(get_config_value("availability-capture", "timeout", "10000")),
+    )
@@ -0,0 +1,102 @@
+import argparse
+import logging
+import queue
+import threading
+from typing import Dict, List, Tuple
+
+from vfs_appointment_bot.vfs_bot.browser_manager import close_browser_manager
+from vfs_appointment_bot.vfs_bot.vfs_bot import LoginError, VfsBot
+
+
+class RouteRunner:
+    """
+    Checks many routes concurrently on a pool of threads.
+
+    Every check is a regular `VfsBot.run`, so the country specific login and
+    appointment steps, the resource policy, the HTTP probe, the session cache
+    and the check deadline all apply. Playwright's sync API can only be used
+    from the thread that started it, so every thread owns its own browser
+    (see `get_browser_manager`). A route is always checked by the same thread,
+    which keeps its warm page and HTTP probe usable between polling cycles.
+    """
+
+    def __init__(self, concurrency: int):
+        """
+        Starts the threads of the route runner.
+
+        Args:
+            concurrency (int): Maximum number of routes checked at the same time.
+        """
+        self.concurrency = max(1, concurrency)
+        self._task_queues: List[queue.Queue] = []
+        self._threads: List[threading.Thread] = []
+        self._assignments: Dict[VfsBot, int] = {}
+        for index in range(self.concurrency):
+            task_queue = queue.Queue()
+            thread = threading.Thread(
+                target=_run_checks,
+                args=(task_queue,),
+                name=f"route-runner-{index}",
+                daemon=True,
+            )
+            thread.start()
+            self._task_queues.append(task_queue)
+            self._threads.append(thread)
+
+    def run(self, routes: List[Tuple[VfsBot, Dict[str, str]]]) -> List[bool]:
+        """
+        Checks every route once, concurrently.
+
+        Args:
+            routes (List[Tuple[VfsBot, Dict[str, str]]]): The country bots to run,
+                each with its appointment parameters.
+
+        Returns:
+            List[bool]: Whether appointments were found, in the order of `routes`.
+        """
+        result_queue = queue.Queue()
+        for index, (bot, appointment_params) in enumerate(routes):
+            thread_index = self._assignments.setdefault(
+                bot, len(self._assignments) % self.concurrency
+            )
+            self._task_queues[thread_index].put(
+                (index, bot, appointment_params, result_queue)
+            )
+
+        results = [False] * len(routes)
+        for _ in routes:
+            index, found = result_queue.get()
+            results[index] = found
+        return results
+
+    def close(self) -> None:
+        """
+        Stops the threads, which close their browsers, and waits for them to exit.
+        """
+        for task_queue in self._task_queues:
+            task_queue.put(None)
+        for thread in self._threads:
+            thread.join()
+
+
+def _run_checks(task_queue: queue.Queue) -> None:
+    try:
+        while True:
+            task = task_queue.get()
+            if task is None:
+                break
+            index, bot, appointment_params, result_queue = task
+            result_queue.put((index, _check_route(bot, appointment_params)))
+    finally:
+        close_browser_manager()
+
+
+def _check_route(bot: VfsBot, appointment_params: Dict[str, str]) -> bool:
+    route = f"{bot.source_country_code}-{bot.destination_country_code}".upper()
+    try:
+        return bool(bot.run(argparse.Namespace(appointment_params=appointment_params)))
+    except LoginError as e:
+        logging.error(f"{route}: {e}")
+    except Exception as e:
+        logging.error(f"{route}: Appointment check failed: {e}")
+    return False
@@ -0,0 +1,132 @@
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Dict, Optional
+
+from vfs_appointment_bot.utils.config_reader import get_config_value
+
+
+class SessionCache:
+    """
+    On-disk cache of authenticated Playwright storage states.
+
+    Each entry holds the cookies and local storage of a logged-in browser
+    context for one credential and route, so later checks can skip the
+    cookie banner and login form while the session is still valid. Entries
+    older than the configured TTL are treated as expired.
+    """
+
+    def __init__(self, cache_dir: str, ttl: int):
+        """
+        Initializes the session cache.
+
+        Args:
+            cache_dir (str): Directory in which the storage states are saved.
+            ttl (int): Maximum age of a cached session in seconds.
+        """
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+
+    def load(self, key: str) -> Optional[Dict]:
+        """
+        Loads a cached storage state if it exists and has not expired.
+
+        Args:
+            key (str): The session key (see `get_session_key`).
+
+        Returns:
+            Optional[Dict]: The Playwright storage state, or None if there is
+                no usable session.
+        """
+        path = self._get_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as session_file:
+                entry = json.load(session_file)
+        except (OSError, ValueError):
+            return None
+
+        if time.time() - entry.get("saved_at", 0) > self.ttl:
+            logging.debug("Cached session has expired")
+            self.invalidate(key)
+            return None
+        return entry.get("storage_state")
+
+    def save(self, key: str, storage_state: Dict) -> None:
+        """
+        Saves a storage state for the given session key.
+
+        The file is written atomically and is only readable by the current
+        user, since it contains session cookies.
+
+        Args:
+            key (str): The session key (see `get_session_key`).
+            storage_state (Dict): The Playwright storage state to save.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._get_path(key)
+        tmp_path = path + ".tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as session_file:
+            json.dump(
+                {"saved_at": time.time(), "storage_state": storage_state}, session_file
+            )
+        os.replace(tmp_path, path)
+
+    def invalidate(self, key: str) -> None:
+        """
+        Removes the cached session for the given key, if any.
+
+        Args:
+            key (str): The session key (see `get_session_key`).
+        """
+        try:
+            os.remove(self._get_path(key))
+        except FileNotFoundError:
+            pass
+
+    def clear(self) -> None:
+        """
+        Removes every cached session.
+        """
+        if not os.path.isdir(self.cache_dir):
+            return
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and entry.name.endswith(".json"):
+                os.remove(entry.path)
+
+    def _get_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + ".json")
+
+
+def get_session_key(email_id: str, route: str) -> str:
+    """
+    Builds the cache key for a credential and route.
+
+    The key is a hash, so neither the email address nor the route leak into
+    file names.
+
+    Args:
+        email_id (str): The VFS login email address.
+        route (str): The route, e.g. "IN-DE".
+
+    Returns:
+        str: The session key.
+    """
+    return hashlib.sha256(f"{email_id}:{route.upper()}".encode()).hexdigest()
+
+
+def get_session_cache() -> Optional[SessionCache]:
+    """
+    Creates a `SessionCache` from the `session` configuration section.
+
+    Returns:
+        Optional[SessionCache]: The session cache, or None if it is disabled.
+    """
+    if get_config_value("session", "enabled", "False") not in ("True", "true"):
+        return None
+    return SessionCache(
+        get_config_value("session", "cache_dir", ".vfs_sessions"),
+        int(get_config_value("session", "ttl", "1800")),
+    )
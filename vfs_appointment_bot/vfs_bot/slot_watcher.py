@@ -0,0 +1,104 @@
+import queue
+import time
+from typing import List, Optional
+
+from playwright.sync_api import Page
+
+from vfs_appointment_bot.vfs_bot.alert_extractor import ALERT_MAPPER_SCRIPT, Alert
+
+BINDING_NAME = "vfsSlotChanged"
+
+# Observes the whole document, since Angular re-creates the alert container when
+# the appointment parameters change. Changes are debounced and reported to
+# Python with the text and attributes of every alert.
+OBSERVER_SCRIPT = """
+(selector) => {
+    if (window.__vfsSlotObserver) {
+        window.__vfsSlotObserver.disconnect();
+    }
+    let lastReport = null;
+    const report = () => {
+        const alerts = Array.from(document.querySelectorAll(selector)).map(
+            %s
+        );
+        const current = JSON.stringify(alerts);
+        if (current !== lastReport) {
+            lastReport = current;
+            window.%s(alerts);
+        }
+    };
+    const observer = new MutationObserver(() => {
+        clearTimeout(window.__vfsSlotTimer);
+        window.__vfsSlotTimer = setTimeout(report, 100);
+    });
+    observer.observe(document.body, {
+        childList: true,
+        subtree: true,
+        characterData: true,
+    });
+    window.__vfsSlotObserver = observer;
+}
+""" % (
+    ALERT_MAPPER_SCRIPT.strip(),
+    BINDING_NAME,
+)
+
+
+class SlotWatcher:
+    """
+    Pushes changes of the appointment alerts from the page to Python.
+
+    A DOM MutationObserver installed in the page reports the alerts through
+    an exposed binding whenever they change. The alerts are queued
+    and handed out by `wait_for_change`, which keeps the Playwright event
+    loop running while it blocks so that the binding calls are delivered as
+    soon as they happen.
+    """
+
+    def __init__(self, page: Page, selector: str, poll_interval: float = 0.2):
+        """
+        Initializes the slot watcher and exposes the binding on the page.
+
+        Args:
+            page (playwright.sync_api.Page): The page showing the appointment alerts.
+            selector (str): Selector of the appointment alerts.
+            poll_interval (float): Seconds between two checks of the event queue.
+        """
+        self.page = page
+        self.selector = selector
+        self.poll_interval = poll_interval
+        self._changes: "queue.Queue[List[Alert]]" = queue.Queue()
+        page.expose_function(BINDING_NAME, self._report_change)
+
+    def install(self) -> None:
+        """
+        Installs the MutationObserver in the current document of the page.
+
+        This must be called again after the page has navigated.
+        """
+        self.page.evaluate(OBSERVER_SCRIPT, self.selector)
+
+    def wait_for_change(self, timeout: float) -> Optional[List[Alert]]:
+        """
+        Blocks until the alerts change or the timeout expires.
+
+        Args:
+            timeout (float): Maximum number of seconds to wait.
+
+        Returns:
+            Optional[List[Alert]]: The alerts after the change, or None if
+                nothing changed before the timeout.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                return self._changes.get_nowait()
+            except queue.Empty:
+                pass
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            self.page.wait_for_timeout(min(self.poll_interval, remaining) * 1000)
+
+    def _report_change(self, alerts: List[dict]) -> None:
+        self._changes.put([Alert.from_payload(alert) for alert in alerts])
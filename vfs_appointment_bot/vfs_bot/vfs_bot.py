@@ -1,15 +1,63 @@
 import argparse
+import functools
 import logging
+import re
+import sqlite3
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, List
+from datetime import date
+from typing import Callable, Dict, List, Optional
 
 import playwright
-from playwright.sync_api import sync_playwright
-from playwright_stealth import stealth_sync
+import requests
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 
+from vfs_appointment_bot.utils.check_history import CheckRecord, get_check_history
 from vfs_appointment_bot.utils.config_reader import get_config_value
-from vfs_appointment_bot.notification.notification_client_factory import (
-    get_notification_client,
+from vfs_appointment_bot.utils.date_utils import format_dates
+from vfs_appointment_bot.utils.metrics import observe_check
+from vfs_appointment_bot.utils.phase_timer import PhaseTimer
+from vfs_appointment_bot.utils.scheduler import CheckOutcome
+from vfs_appointment_bot.utils.slot_state import (
+    get_slot_state,
+    is_slot_removal_notified,
+)
+from vfs_appointment_bot.vfs_bot.alert_extractor import (
+    Alert,
+    extract_alerts,
+    get_alert_dates,
+)
+from vfs_appointment_bot.vfs_bot.browser_manager import get_browser_manager
+from vfs_appointment_bot.vfs_bot.check_deadline import (
+    CheckDeadline,
+    CheckTimeoutError,
+    get_check_deadline,
+)
+from vfs_appointment_bot.vfs_bot.http_probe import (
+    HttpProbe,
+    ProbeEscalationError,
+    create_http_probe,
+    is_http_probe_enabled,
+)
+from vfs_appointment_bot.vfs_bot.resource_policy import (
+    ResourcePolicy,
+    get_resource_policy,
+)
+from vfs_appointment_bot.vfs_bot.response_capture import (
+    AvailabilityRequest,
+    Slot,
+    UnexpectedAvailabilityResponseError,
+    get_availability_capture,
+)
+from vfs_appointment_bot.vfs_bot.slot_watcher import SlotWatcher
+from vfs_appointment_bot.vfs_bot.session_cache import (
+    get_session_cache,
+    get_session_key,
+)
+from vfs_appointment_bot.notification.coalescer import is_urgent_route
+from vfs_appointment_bot.notification.outbox import (
+    get_notification_outbox,
+    make_idempotency_key,
 )
 
 
@@ -17,14 +65,106 @@ class LoginError(Exception):
     """Exception raised when login fails."""
 
 
+class AppointmentCheckError(Exception):
+    """Exception raised when checking for appointments fails."""
+
+
+class InvalidAppointmentParamError(Exception):
+    """Exception raised when an appointment parameter is missing or not an option of the booking form."""
+
+
+# Milliseconds between two reads of the appointment alerts while waiting for a result
+RESULT_POLL_INTERVAL = 100
+
+# Marks the alerts shown before an availability request, to tell them from its result
+SEEN_ALERT_ATTRIBUTE = "data-vfs-bot-seen"
+
+
+def get_failure_outcome(error: Exception) -> CheckOutcome:
+    """
+    Returns the outcome of a check that failed with an exception.
+
+    Args:
+        error (Exception): The exception raised by the check.
+
+    Returns:
+        CheckOutcome: LOGIN_ERROR for a failed login, TIMEOUT for a step that
+            timed out, ERROR otherwise.
+    """
+    if isinstance(error, LoginError):
+        return CheckOutcome.LOGIN_ERROR
+    if isinstance(error, (CheckTimeoutError, PlaywrightTimeoutError)):
+        return CheckOutcome.TIMEOUT
+    return CheckOutcome.ERROR
+
+
+def recorded_check(check: Callable[..., bool]) -> Callable[..., bool]:
+    """
+    Records every call of a `VfsBot` check method in the check history.
+
+    The phase timer and the outcome of the bot are reset and the check
+    deadline is started before the check. A check raising an exception is
+    recorded as failed, with the exception as error, before the exception is
+    passed on.
+
+    Args:
+        check (Callable[..., bool]): The check method, e.g. `VfsBot.run`.
+
+    Returns:
+        Callable[..., bool]: The wrapped check method.
+    """
+
+    @functools.wraps(check)
+    def wrapper(self: "VfsBot", *args, **kwargs) -> bool:
+        self.phase_timer.reset()
+        self.last_outcome = None
+        self.last_dates = []
+        self.last_error = None
+        self.check_deadline = get_check_deadline(self.destination_country_code)
+        started_at = time.time()
+        try:
+            return check(self, *args, **kwargs)
+        except Exception as e:
+            self.last_outcome = get_failure_outcome(e)
+            self.last_error = str(e)
+            raise
+        finally:
+            if self.last_outcome is not None:
+                self.record_check(
+                    self.appointment_params or {},
+                    started_at,
+                    self.last_outcome,
+                    self.last_dates,
+                    self.last_error,
+                )
+
+    return wrapper
+
+
 class VfsBot(ABC):
     """
     Abstract base class for VfsBot
 
     Provides common functionalities like login, pre-login steps, appointment checking, and notification.
     Subclasses are responsible for implementing country-specific login and appointment checking logic.
+
+    The selectors below describe the Angular front end shared by the VFS country
+    sites. They are used by the helper methods of this class, so subclasses
+    only need to override them where a site differs.
     """
 
+    email_input_selector = "#mat-input-0"
+    password_input_selector = "#mat-input-1"
+    start_booking_selector = "role=button >> text=Start New Booking"
+    dropdown_selector = "mat-form-field"
+    dropdown_option_selector = 'mat-option:has-text("{}")'
+    appointment_alert_selector = "div.alert"
+    dropdown_options_selector = "mat-option"
+    # Text of the alert shown when the search has no available appointments
+    no_appointment_pattern = re.compile(
+        r"no (?:appointment )?slots (?:are )?(?:currently )?available", re.IGNORECASE
+    )
+
     def __init__(self):
         """
         Initializes a VfsBot instance for a specific country.
@@ -33,7 +173,20 @@ class VfsBot(ABC):
         self.source_country_code = None
         self.destination_country_code = None
         self.appointment_param_keys: List[str] = []
+        self.appointment_params: Optional[Dict[str, str]] = None
+        self.warm_page: Optional[playwright.sync_api.Page] = None
+        self.warm_check_count = 0
+        self.resource_policy: Optional[ResourcePolicy] = None
+        self.last_availability_request: Optional[AvailabilityRequest] = None
+        self.http_probe: Optional[HttpProbe] = None
+        self.last_outcome: Optional[CheckOutcome] = None
+        self.last_dates: List[date] = []
+        self.last_error: Optional[str] = None
+        self.phase_timer = PhaseTimer()
+        self.check_deadline: Optional[CheckDeadline] = None
+        self.urgent_alerts = False
 
+    @recorded_check
     def run(self, args: argparse.Namespace = None) -> bool:
         """
         Starts the VFS bot for appointment checking and notification.
@@ -42,6 +195,19 @@ class VfsBot(ABC):
         appointments based on provided arguments, and sends notifications if
         appointments are found.
 
+        When `warm_poll` is enabled, the logged-in page is kept open after the
+        check, and the next run re-checks from the dashboard of that page instead
+        of logging in again. A new session is opened when the session has expired
+        or the page has served `warm_poll_max_checks` checks.
+
+        When the HTTP probe mode is enabled, checks after a successful browser
+        check query the availability API directly, and the browser flow is only
+        used again when the probe is rejected.
+
+        Every step waits at most its timeout from the `timeouts` section, and
+        the whole check at most `check_deadline` seconds. A check that runs out
+        of time is recorded as timed out rather than as finding nothing.
+
         Args:
             args (argparse.Namespace, optional): Namespace object containing parsed
                 command-line arguments. Defaults to None.
@@ -56,60 +222,512 @@ class VfsBot(ABC):
 
         # Configuration values
         try:
-            browser_type = get_config_value("browser", "type", "firefox")
-            headless_mode = get_config_value("browser", "headless", "True")
             url_key = self.source_country_code + "-" + self.destination_country_code
             vfs_url = get_config_value("vfs-url", url_key)
         except KeyError as e:
             logging.error(f"Missing configuration value: {e}")
             return
 
+        warm_poll = get_config_value("default", "warm_poll", "False") in (
+            "True",
+            "true",
+        )
+
+        if self.appointment_params is None:
+            self.appointment_params = self.get_appointment_params(args)
+        appointment_params = self.appointment_params
+
+        logging.info(f"Checking appointments for {appointment_params}")
+        try:
+            dates = self.probe_for_appointment(appointment_params)
+            if dates is None:
+                dates = self.check_in_browser(
+                    url_key, vfs_url, appointment_params, warm_poll
+                )
+        except CheckTimeoutError as e:
+            logging.error(f"Appointment check timed out: {e}")
+            self.last_outcome = CheckOutcome.TIMEOUT
+            self.last_error = str(e)
+            return False
+        except AppointmentCheckError as e:
+            logging.error(f"Appointment check failed: {e}")
+            self.last_outcome = CheckOutcome.ERROR
+            self.last_error = str(e)
+            return False
+
+        return self.report_appointments(appointment_params, dates)
+
+    @recorded_check
+    def watch(self, args: argparse.Namespace = None) -> bool:
+        """
+        Watches the booking form for new appointments instead of polling.
+
+        After a first check, a `SlotWatcher` observes the appointment alerts of
+        the logged-in page and this method blocks until they change, so a new
+        slot is reported as soon as the page shows it. Every `refresh_interval`
+        seconds the last appointment parameter is selected again, which fetches
+        the availability again without leaving the booking form. Only if that
+        fails is a new booking started from the dashboard, logging in again if
+        the session has expired.
+
+        Args:
+            args (argparse.Namespace, optional): Namespace object containing parsed
+                command-line arguments. Defaults to None.
+
+        Returns:
+            bool: True if appointments were found, False if the check failed.
+        """
+        url_key = self.source_country_code + "-" + self.destination_country_code
+        vfs_url = get_config_value("vfs-url", url_key)
+        if self.appointment_params is None:
+            self.appointment_params = self.get_appointment_params(args)
+        appointment_params = self.appointment_params
+
+        refresh_interval = float(get_config_value("watch", "refresh_interval", "60"))
+        poll_interval = float(get_config_value("watch", "poll_interval", "0.2"))
+
+        logging.info(f"Watching appointments for {appointment_params}")
+        page = self.new_session_page(url_key, vfs_url)
+        try:
+            slot_watcher = SlotWatcher(
+                page, self.appointment_alert_selector, poll_interval
+            )
+            dates = None
+            while True:
+                if dates is None:
+                    try:
+                        with self.phase_timer.measure("check"):
+                            dates = self.check_for_appontment(page, appointment_params)
+                    except Exception as e:
+                        logging.error(f"Appointment check failed: {e}")
+                        self.last_outcome = get_failure_outcome(e)
+                        self.last_error = str(e)
+                        return False
+                if dates:
+                    return self.report_appointments(appointment_params, dates)
+
+                slot_watcher.install()
+                dates = self.wait_for_new_dates(slot_watcher, refresh_interval)
+                if dates:
+                    return self.report_appointments(appointment_params, dates)
+
+                # Every refresh is a new check with its own time budget
+                self.check_deadline = get_check_deadline(self.destination_country_code)
+                with self.phase_timer.measure("check"):
+                    dates = self.refresh_appointment_result(page, appointment_params)
+                if dates is None and not self.restore_session(page, vfs_url):
+                    logging.info("Session has expired, logging in again")
+                    get_browser_manager().close_page(page)
+                    page = self.new_session_page(url_key, vfs_url)
+                    slot_watcher = SlotWatcher(
+                        page, self.appointment_alert_selector, poll_interval
+                    )
+        finally:
+            get_browser_manager().close_page(page)
+
+    def refresh_appointment_result(
+        self, page: playwright.sync_api.Page, appointment_params: Dict[str, str]
+    ) -> Optional[List[date]]:
+        """
+        Fetches the availability again by re-selecting the last appointment parameter.
+
+        The other dropdowns of the booking form keep their selection, so only
+        the availability request and the result alert are repeated.
+
+        Args:
+            page (playwright.sync_api.Page): The page showing the booking form.
+            appointment_params (Dict[str, str]): A dictionary containing appointment search criteria.
+
+        Returns:
+            Optional[List[date]]: The appointment dates (empty list if none are
+                available), or None if the booking form could not be refreshed,
+                e.g. because the session has expired.
+        """
+        last_index = len(self.appointment_param_keys) - 1
+        value = appointment_params.get(self.appointment_param_keys[last_index])
+        try:
+            slots = self.capture_availability(
+                page,
+                lambda: self.select_dropdown_option(page, last_index, value),
+                appointment_params,
+            )
+            if slots is not None:
+                return [slot.date for slot in slots]
+            return self.extract_appointment_dates(page)
+        except Exception as e:
+            logging.info(
+                f"Could not refresh the booking form, starting a new booking: {e}"
+            )
+            return None
+
+    def wait_for_new_dates(
+        self, slot_watcher: SlotWatcher, timeout: float
+    ) -> Optional[List[date]]:
+        """
+        Blocks until the watched alerts show appointment dates or the timeout expires.
+
+        Args:
+            slot_watcher (SlotWatcher): The watcher installed on the booking form.
+            timeout (float): Maximum number of seconds to wait.
+
+        Returns:
+            Optional[List[date]]: The appointment dates, or None if no dates were
+                shown before the timeout.
+        """
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            alerts = slot_watcher.wait_for_change(deadline - time.monotonic())
+            if alerts is None:
+                return None
+            dates = get_alert_dates(alerts)
+            if dates:
+                return dates
+            logging.debug(
+                f"Appointment alerts changed: {[alert.text for alert in alerts]}"
+            )
+        return None
+
+    def report_appointments(
+        self, appointment_params: Dict[str, str], dates: Optional[List[date]]
+    ) -> bool:
+        """
+        Logs the result of a check and notifies the user about newly found appointments.
+
+        Args:
+            appointment_params (Dict[str, str]): A dictionary containing appointment search criteria.
+            dates (Optional[List[date]]): The available appointment dates, if any.
+
+        Returns:
+            bool: True if appointments were found, False otherwise.
+        """
+        if dates:
+            # Log successful appointment finding
+            logging.info(
+                f"\033[1;32mFound appointments on: {format_dates(dates)} \033[0m"
+            )
+            with self.phase_timer.measure("notify"):
+                self.announce_slots(appointment_params, dates)
+            self.last_outcome = CheckOutcome.FOUND
+            self.last_dates = dates
+            return True
+
+        # Log no appointments found
+        logging.info(
+            "\033[1;33mNo appointments found for the specified criteria.\033[0m"
+        )
+        with self.phase_timer.measure("notify"):
+            self.announce_slots(appointment_params, [])
+        self.last_outcome = CheckOutcome.NOT_FOUND
+        return False
+
+    def check_in_browser(
+        self,
+        url_key: str,
+        vfs_url: str,
+        appointment_params: Dict[str, str],
+        warm_poll: bool,
+    ) -> Optional[List[date]]:
+        """
+        Checks for appointments in a logged-in browser page.
+
+        The page kept open by warm polling is reused when possible, otherwise a
+        new session page is opened. When the HTTP probe mode is enabled, the
+        availability request captured during the check is used to start an
+        `HttpProbe` for the following checks.
+
+        Args:
+            url_key (str): The route key, e.g. "IN-DE".
+            vfs_url (str): The VFS login page URL for the bot's route.
+            appointment_params (Dict[str, str]): A dictionary containing appointment search criteria.
+            warm_poll (bool): Whether the page is kept open for the next check.
+
+        Returns:
+            Optional[List[date]]: A list of available appointment dates, or None if
+                no appointments were found.
+
+        Raises:
+            LoginError: If the login fails.
+            CheckTimeoutError: If a step of the check times out.
+            AppointmentCheckError: If the appointment check fails.
+        """
+        page = self.get_warm_page(vfs_url) if warm_poll else None
+        if page is None:
+            page = self.new_session_page(url_key, vfs_url)
+
+        keep_page = False
+        self.last_availability_request = None
+        try:
+            try:
+                with self.phase_timer.measure("check"):
+                    dates = self.check_for_appontment(page, appointment_params)
+            except CheckTimeoutError:
+                raise
+            except PlaywrightTimeoutError as e:
+                raise CheckTimeoutError(e)
+            except Exception as e:
+                raise AppointmentCheckError(e)
+            keep_page = warm_poll
+            self.start_http_probe(page)
+            return dates
+        finally:
+            if self.resource_policy:
+                self.resource_policy.log_report()
+            if keep_page:
+                self.warm_page = page
+                self.warm_check_count += 1
+            elif page is self.warm_page:
+                self.close_warm_page()
+            else:
+                get_browser_manager().close_page(page)
+
+    def start_http_probe(self, page: playwright.sync_api.Page) -> None:
+        """
+        Starts the browserless HTTP probe from a logged-in page, if enabled.
+
+        Args:
+            page (playwright.sync_api.Page): The page whose availability request was captured.
+        """
+        availability_capture = get_availability_capture()
+        if (
+            not is_http_probe_enabled()
+            or self.last_availability_request is None
+            or availability_capture is None
+        ):
+            return
+        self.close_http_probe()
+        self.http_probe = create_http_probe(
+            page.context, self.last_availability_request, availability_capture
+        )
+
+    def probe_for_appointment(
+        self, appointment_params: Dict[str, str]
+    ) -> Optional[List[date]]:
+        """
+        Checks for appointments through the HTTP probe, if one is running.
+
+        Args:
+            appointment_params (Dict[str, str]): A dictionary containing appointment search criteria.
+
+        Returns:
+            Optional[List[date]]: A list of available appointment dates (empty list if
+                none found), or None if the browser flow has to be used instead.
+
+        Raises:
+            AppointmentCheckError: If the probe request fails.
+        """
+        if self.http_probe is None:
+            return None
+
+        try:
+            with self.phase_timer.measure("probe"):
+                slots = self.http_probe.probe(appointment_params)
+        except ProbeEscalationError as e:
+            logging.info(f"Escalating to the browser check: {e}")
+            self.close_http_probe()
+            return None
+        except requests.RequestException as e:
+            raise AppointmentCheckError(e)
+
+        logging.debug(f"HTTP probe latency: {self.http_probe.get_latency_summary()}")
+        return [slot.date for slot in slots]
+
+    def close_http_probe(self) -> None:
+        """
+        Stops the HTTP probe, if one is running.
+        """
+        if self.http_probe is not None:
+            logging.info(f"HTTP probe latency: {self.http_probe.get_latency_summary()}")
+            self.http_probe.close()
+            self.http_probe = None
+
+    def new_session_page(self, url_key: str, vfs_url: str) -> playwright.sync_api.Page:
+        """
+        Opens a new logged-in page, restoring a cached session when possible.
+
+        Args:
+            url_key (str): The route key, e.g. "IN-DE".
+            vfs_url (str): The VFS login page URL for the bot's route.
+
+        Returns:
+            playwright.sync_api.Page: A page showing the VFS dashboard.
+
+        Raises:
+            LoginError: If the login fails.
+        """
         email_id = get_config_value("vfs-credential", "email")
         password = get_config_value("vfs-credential", "password")
 
-        appointment_params = self.get_appointment_params(args)
+        session_cache = get_session_cache()
+        session_key = get_session_key(email_id, url_key)
+        storage_state = session_cache.load(session_key) if session_cache else None
 
-        # Launch browser and perform actions
-        with sync_playwright() as p:
-            browser = getattr(p, browser_type).launch(
-                headless=headless_mode in ("True", "true")
+        browser_manager = get_browser_manager()
+        with self.phase_timer.measure("browser"):
+            page = browser_manager.new_page(storage_state)
+        self.resource_policy = get_resource_policy(self.destination_country_code)
+        if self.resource_policy:
+            self.resource_policy.apply(page.context)
+        try:
+            if storage_state is not None and self.restore_session(page, vfs_url):
+                logging.info("Restored cached session, skipping login")
+                return page
+
+            if storage_state is not None:
+                logging.info("Cached session has expired, logging in again")
+                session_cache.invalidate(session_key)
+            self.open_session(page, vfs_url, email_id, password)
+            if session_cache:
+                session_cache.save(session_key, page.context.storage_state())
+            return page
+        except Exception:
+            browser_manager.close_page(page)
+            raise
+
+    def get_warm_page(self, vfs_url: str) -> Optional[playwright.sync_api.Page]:
+        """
+        Returns the page kept open by the previous run, back on the dashboard.
+
+        The page is dropped when it has reached `warm_poll_max_checks` checks or
+        when the dashboard is no longer reachable because the session expired.
+
+        Args:
+            vfs_url (str): The VFS login page URL for the bot's route.
+
+        Returns:
+            Optional[playwright.sync_api.Page]: The logged-in page, or None if a
+                new session is needed.
+        """
+        if self.warm_page is None:
+            return None
+
+        max_checks = int(get_config_value("default", "warm_poll_max_checks", "20"))
+        if self.warm_page.is_closed() or self.warm_check_count >= max_checks:
+            logging.info(
+                f"Warm page served {self.warm_check_count} checks, opening a new session"
             )
-            page = browser.new_page()
-            stealth_sync(page)
+            self.close_warm_page()
+            return None
+
+        if not self.restore_session(self.warm_page, vfs_url):
+            logging.info("Session has expired, logging in again")
+            self.close_warm_page()
+            return None
+
+        logging.info(f"Re-checking in warm page (check #{self.warm_check_count + 1})")
+        return self.warm_page
+
+    def close_warm_page(self) -> None:
+        """
+        Closes the page kept open for warm polling, if any.
+        """
+        if self.warm_page is not None:
+            get_browser_manager().close_page(self.warm_page)
+            self.warm_page = None
+        self.warm_check_count = 0
 
-            page.goto(vfs_url)
+    def open_session(
+        self, page: playwright.sync_api.Page, vfs_url: str, email_id: str, password: str
+    ) -> None:
+        """
+        Opens the VFS login page and performs the full pre-login and login flow.
+
+        Args:
+            page (playwright.sync_api.Page): The Playwright page object used for browser interaction.
+            vfs_url (str): The VFS login page URL for the bot's route.
+            email_id (str): The user's email address for VFS login.
+            password (str): The user's password for VFS login.
+
+        Raises:
+            LoginError: If the login fails.
+            CheckTimeoutError: If the login page does not load in time, or the
+                check deadline passes during the login.
+        """
+        try:
+            with self.phase_timer.measure("goto"):
+                page.goto(vfs_url, timeout=self.step_timeout("navigation"))
+        except PlaywrightTimeoutError as e:
+            raise CheckTimeoutError(f"Login page did not load in time: {e}")
+        with self.phase_timer.measure("pre_login"):
             self.pre_login_steps(page)
 
-            try:
+        try:
+            with self.phase_timer.measure("login"):
                 self.login(page, email_id, password)
-                logging.info("Logged in successfully")
-            except Exception:
-                browser.close()
-                raise LoginError(
-                    "\033[1;31mLogin failed. "
-                    + "Please verify your username and password by logging in to the browser and try again.\033[0m"
+            logging.info("Logged in successfully")
+        except Exception:
+            if self.check_deadline is not None and self.check_deadline.expired:
+                raise CheckTimeoutError("Check deadline passed during the login")
+            raise LoginError(
+                "\033[1;31mLogin failed. "
+                + "Please verify your username and password by logging in to the browser and try again.\033[0m"
+            )
+
+    def restore_session(self, page: playwright.sync_api.Page, vfs_url: str) -> bool:
+        """
+        Checks whether a page seeded with a cached session is still logged in.
+
+        This method opens the dashboard next to the login page and waits briefly
+        for the "Start New Booking" button, which is only shown to logged-in users.
+
+        Args:
+            page (playwright.sync_api.Page): The Playwright page object used for browser interaction.
+            vfs_url (str): The VFS login page URL for the bot's route.
+
+        Returns:
+            bool: True if the dashboard is reachable with the cached session, False otherwise.
+        """
+        check_timeout = float(get_config_value("session", "check_timeout", "5000"))
+        try:
+            with self.phase_timer.measure("restore_session"):
+                page.goto(
+                    vfs_url.rsplit("/login", 1)[0] + "/dashboard",
+                    timeout=self.step_timeout("navigation"),
+                )
+                page.wait_for_selector(
+                    self.start_booking_selector,
+                    timeout=self.cap_timeout(check_timeout),
                 )
+            return True
+        except Exception:
+            return False
 
-            logging.info(f"Checking appointments for {appointment_params}")
-            appointment_found = False
-            try:
-                dates = self.check_for_appontment(page, appointment_params)
-                if dates:
-                    # Log successful appointment finding
-                    logging.info(
-                        f"\033[1;32mFound appointments on: {', '.join(dates)} \033[0m"
-                    )
-                    self.notify_appointment(appointment_params, dates)
-                    appointment_found = True
-                else:
-                    # Log no appointments found
-                    logging.info(
-                        "\033[1;33mNo appointments found for the specified criteria.\033[0m"
-                    )
-            except Exception as e:
-                logging.error(f"Appointment check failed: {e}")
-            browser.close()
-            return appointment_found
+    def record_check(
+        self,
+        appointment_params: Dict[str, str],
+        started_at: float,
+        outcome: CheckOutcome,
+        dates: List[date],
+        error: Optional[str] = None,
+    ) -> None:
+        """
+        Records a finished check in the metrics and, if enabled, the check history.
+
+        Args:
+            appointment_params (Dict[str, str]): A dictionary containing appointment search criteria.
+            started_at (float): The UNIX time at which the check started.
+            outcome (CheckOutcome): The outcome of the check.
+            dates (List[date]): The appointment dates found by the check.
+            error (Optional[str]): The error that made the check fail, if any.
+        """
+        check_record = CheckRecord(
+            f"{self.source_country_code}-{self.destination_country_code}".upper(),
+            appointment_params,
+            started_at,
+            time.time(),
+            outcome.value,
+            dict(self.phase_timer.durations),
+            [slot_date.isoformat() for slot_date in dates],
+            error,
+        )
+        observe_check(check_record)
+
+        check_history = get_check_history()
+        if check_history is None:
+            return
+        try:
+            check_history.record(check_record)
+        except sqlite3.Error as e:
+            logging.warning(f"Could not record the check in the check history: {e}")
 
     def get_appointment_params(self, args: argparse.Namespace) -> Dict[str, str]:
         """
@@ -117,37 +735,115 @@ class VfsBot(ABC):
 
         This method iterates through pre-defined `appointment_param_keys` (replace
         with relevant keys) and retrieves values either from provided arguments
-        or prompts the user for input if values are missing.
+        or prompts the user for input if no arguments were provided.
 
         Args:
             args (argparse.Namespace): Namespace object containing parsed command-line arguments.
 
         Returns:
             Dict[str, str]: A dictionary containing appointment parameters.
+
+        Raises:
+            InvalidAppointmentParamError: If the provided arguments miss some of the parameters.
         """
+        if getattr(args, "appointment_params", None) is not None:
+            missing_keys = [
+                key
+                for key in self.appointment_param_keys
+                if key not in args.appointment_params
+            ]
+            if missing_keys:
+                raise InvalidAppointmentParamError(
+                    f"Missing appointment parameters: {', '.join(missing_keys)} "
+                    + f"(this route needs {', '.join(self.appointment_param_keys)})"
+                )
+            return {
+                key: args.appointment_params[key] for key in self.appointment_param_keys
+            }
+
         appointment_params = {}
         for key in self.appointment_param_keys:
-            if (
-                getattr(args, "appointment_params") is not None
-                and args.appointment_params[key] is not None
-            ):
-                appointment_params[key] = args.appointment_params[key]
-            else:
-                key_name = key.replace("_", " ")
-                appointment_params[key] = input(f"Enter the {key_name}: ")
+            key_name = key.replace("_", " ")
+            appointment_params[key] = input(f"Enter the {key_name}: ")
         return appointment_params
 
-    def notify_appointment(self, appointment_params: Dict[str, str], dates: List[str]):
+    def announce_slots(self, appointment_params: Dict[str, str], dates: List[date]):
+        """
+        Notifies the user about the appointment dates that were not announced before.
+
+        The announced dates are remembered in the slot state, so a date is only
+        notified once for as long as it stays available. When enabled, the user
+        is also notified about announced dates that are no longer available.
+        Without slot state, every found date is notified.
+
+        Args:
+            appointment_params (Dict[str, str]): A dictionary containing appointment search criteria.
+            dates (List[date]): The appointment dates found by the latest check.
+        """
+        slot_state = get_slot_state()
+        if slot_state is None:
+            if dates:
+                self.notify_appointment(appointment_params, dates)
+            return
+
+        route = f"{self.source_country_code}-{self.destination_country_code}"
+        added, removed = slot_state.update(route, appointment_params, dates)
+        if added:
+            self.notify_appointment(appointment_params, added)
+        elif dates:
+            logging.info("All found appointments were already announced")
+        if removed and is_slot_removal_notified():
+            self.send_notification(
+                f"Appointment(s) for {route.upper()} {', '.join(appointment_params.values())} "
+                + f"no longer available on {format_dates(removed)}",
+                make_idempotency_key(
+                    event="removed",
+                    route=route.upper(),
+                    params=appointment_params,
+                    dates=format_dates(removed),
+                ),
+            )
+
+    def notify_appointment(self, appointment_params: Dict[str, str], dates: List[date]):
         """
         Sends appointment dates notification to the user.
 
-        This method is responsible for notifying the appointment dates to the user configured channels
+        This method is responsible for notifying the appointment dates to the user configured channels.
+        The notification is stored in the notification outbox and delivered in the background, so this
+        method does not wait for the channels.
 
         Args:
-            dates (List[str]): A list of appointment dates.
+            dates (List[date]): A list of appointment dates.
             appointment_params (Dict[str, str]): A dictionary containing appointment search criteria.
         """
-        message = f"Found appointment(s) for {', '.join(appointment_params.values())} on {', '.join(dates)}"
+        route = f"{self.source_country_code}-{self.destination_country_code}"
+        message = (
+            f"Found appointment(s) for {route.upper()} {', '.join(appointment_params.values())} "
+            + f"on {format_dates(dates)}"
+        )
+        idempotency_key = make_idempotency_key(
+            event="found",
+            route=route.upper(),
+            params=appointment_params,
+            dates=format_dates(dates),
+        )
+        self.send_notification(
+            message, idempotency_key, self.urgent_alerts or is_urgent_route(route)
+        )
+
+    def send_notification(
+        self, message: str, idempotency_key: str, urgent: bool = False
+    ):
+        """
+        Stores a message in the notification outbox for delivery to the user configured channels.
+
+        Args:
+            message (str): The message content to be sent.
+            idempotency_key (str): Key identifying the message, so the same
+                message is not sent twice (see `make_idempotency_key`).
+            urgent (bool): Whether the message is sent without waiting for other
+                alerts to coalesce with. Defaults to False.
+        """
         channels = get_config_value("notification", "channels")
         if len(channels) == 0:
             logging.warning(
@@ -155,12 +851,276 @@ class VfsBot(ABC):
             )
             return
 
-        for channel in channels.split(","):
-            client = get_notification_client(channel)
-            try:
-                client.send_notification(message)
-            except Exception:
-                logging.error(f"Failed to send {channel} notification")
+        get_notification_outbox().enqueue(
+            message, channels.split(","), idempotency_key, urgent
+        )
+
+    def fill_login_form(
+        self, page: playwright.sync_api.Page, email_id: str, password: str
+    ) -> None:
+        """
+        Fills and submits the standard VFS login form.
+
+        This method fills the email and password input fields, clicks the
+        "Sign In" button and waits for the "Start New Booking" button that is
+        shown after a successful login.
+
+        Args:
+            page (playwright.sync_api.Page): The Playwright page object used for browser interaction.
+            email_id (str): The user's email address for VFS login.
+            password (str): The user's password for VFS login.
+        """
+        page.locator(self.email_input_selector).fill(email_id)
+        page.locator(self.password_input_selector).fill(password)
+
+        page.get_by_role("button", name="Sign In").click()
+        page.wait_for_selector(
+            self.start_booking_selector, timeout=self.step_timeout("login")
+        )
+
+    def reject_cookie_policies(self, page: playwright.sync_api.Page) -> None:
+        """
+        Clicks the "Reject All" button of the cookie policy banner.
+
+        Args:
+            page (playwright.sync_api.Page): The Playwright page object used for browser interaction.
+        """
+        policies_reject_button = page.get_by_role("button", name="Reject All")
+        if policies_reject_button is not None:
+            policies_reject_button.click()
+            logging.debug("Rejected all cookie policies")
+
+    def select_appointment_params(
+        self, page: playwright.sync_api.Page, appointment_params: Dict[str, str]
+    ) -> Optional[List[Slot]]:
+        """
+        Starts a new booking and selects every appointment parameter.
+
+        The n-th key of `appointment_param_keys` is selected in the n-th
+        dropdown of the booking form. The availability API response fetched
+        after the last selection is captured and parsed into slots.
+
+        Args:
+            page (playwright.sync_api.Page): The Playwright page object used for browser interaction.
+            appointment_params (Dict[str, str]): A dictionary containing appointment search criteria.
+
+        Returns:
+            Optional[List[Slot]]: The slots from the availability response (empty list if
+                none are available), or None if no availability response was captured.
+        """
+        dropdown_timeout = self.step_timeout("dropdown")
+        page.get_by_role("button", name="Start New Booking").click(
+            timeout=dropdown_timeout
+        )
+        page.wait_for_selector(self.dropdown_selector, timeout=dropdown_timeout)
+
+        slots = None
+        last_index = len(self.appointment_param_keys) - 1
+        for index, key in enumerate(self.appointment_param_keys):
+            value = appointment_params.get(key)
+            if index == last_index:
+                slots = self.capture_availability(
+                    page,
+                    lambda: self.select_dropdown_option(page, index, value),
+                    appointment_params,
+                )
+            else:
+                self.select_dropdown_option(page, index, value)
+        return slots
+
+    def select_dropdown_option(
+        self, page: playwright.sync_api.Page, index: int, value: str
+    ) -> None:
+        """
+        Opens the n-th dropdown of the booking form and selects an option.
+
+        The option is waited for, since the options of a dropdown that depends
+        on a previous selection are loaded asynchronously. If it does not show
+        up within the `option` timeout, the options shown instead are reported.
+
+        Args:
+            page (playwright.sync_api.Page): The Playwright page object used for browser interaction.
+            index (int): The position of the dropdown in the booking form.
+            value (str): The text of the option to select.
+
+        Raises:
+            InvalidAppointmentParamError: If no option of the dropdown matches the value.
+        """
+        dropdown = page.query_selector_all(self.dropdown_selector)[index]
+        dropdown.click()
+        try:
+            dropdown_option = page.wait_for_selector(
+                self.dropdown_option_selector.format(value),
+                timeout=self.step_timeout("option"),
+            )
+        except PlaywrightTimeoutError:
+            options = page.eval_on_selector_all(
+                self.dropdown_options_selector,
+                "(options) => options.map((option) => option.textContent.trim())",
+            )
+            raise InvalidAppointmentParamError(
+                f'"{value}" is not an option of dropdown #{index + 1}, '
+                + f"the options are: {', '.join(options) or 'none'}"
+            )
+        dropdown_option.click()
+
+    def capture_availability(
+        self,
+        page: playwright.sync_api.Page,
+        action: Callable[[], None],
+        appointment_params: Dict[str, str],
+    ) -> Optional[List[Slot]]:
+        """
+        Performs an action and captures the availability API response it triggers.
+
+        The booking form alerts are read while waiting for the response, and
+        the wait ends as soon as an alert rendered or changed by the action
+        shows a result, so a response that does not match the capture's URL
+        patterns does not hold up the check until the capture timeout.
+
+        Args:
+            page (playwright.sync_api.Page): The Playwright page object used for browser interaction.
+            action (Callable[[], None]): The action triggering the availability request.
+            appointment_params (Dict[str, str]): A dictionary containing appointment search criteria.
+
+        Returns:
+            Optional[List[Slot]]: The parsed slots, or None if capturing is disabled,
+                the booking form showed a result first, no availability response
+                arrived in time or it could not be parsed.
+        """
+        availability_capture = get_availability_capture()
+        if availability_capture is None:
+            action()
+            return None
+
+        responses = []
+
+        def record_response(response: playwright.sync_api.Response) -> None:
+            if availability_capture.matches(response):
+                responses.append(response)
+
+        page.eval_on_selector_all(
+            self.appointment_alert_selector,
+            f"(elements) => elements.forEach((element) => element.setAttribute('{SEEN_ALERT_ATTRIBUTE}', ''))",
+        )
+        alerts_before = extract_alerts(page, self.appointment_alert_selector)
+        page.on("response", record_response)
+        try:
+            action()
+            timeout = self.cap_timeout(availability_capture.timeout)
+            deadline = time.monotonic() + timeout / 1000
+            while not responses:
+                alerts = [
+                    alert
+                    for alert in extract_alerts(page, self.appointment_alert_selector)
+                    if SEEN_ALERT_ATTRIBUTE not in alert.attributes
+                    or alert not in alerts_before
+                ]
+                if self.read_appointment_result(alerts) is not None:
+                    logging.debug(
+                        "The booking form showed a result before an availability response"
+                    )
+                    return None
+                if time.monotonic() >= deadline:
+                    logging.debug("No availability response captured in time")
+                    return None
+                page.wait_for_timeout(RESULT_POLL_INTERVAL)
+        finally:
+            page.remove_listener("response", record_response)
+
+        response = responses[0]
+        try:
+            self.last_availability_request = AvailabilityRequest.from_request(
+                response.request
+            )
+            return availability_capture.parse(response.json(), appointment_params)
+        except (UnexpectedAvailabilityResponseError, ValueError) as e:
+            logging.debug(f"No availability response captured: {e}")
+            return None
+
+    def extract_appointment_dates(self, page: playwright.sync_api.Page) -> List[date]:
+        """
+        Extracts the appointment dates shown in the booking form alerts.
+
+        The alerts are read, in a single round-trip to the browser each time,
+        until they show appointment dates or the "no appointments" message, so
+        the check returns as soon as the result is known. Other alerts shown on
+        the booking form are not mistaken for a result.
+
+        Args:
+            page (playwright.sync_api.Page): The Playwright page object used for browser interaction.
+
+        Returns:
+            List[date]: A list of available appointment dates (empty list if none found).
+
+        Raises:
+            CheckTimeoutError: If no result is shown within the `result` timeout.
+        """
+        timeout = self.step_timeout("result")
+        deadline = time.monotonic() + timeout / 1000
+        try:
+            page.wait_for_selector(self.appointment_alert_selector, timeout=timeout)
+            while True:
+                alerts = extract_alerts(page, self.appointment_alert_selector)
+                dates = self.read_appointment_result(alerts)
+                if dates is not None:
+                    return dates
+                if time.monotonic() >= deadline:
+                    break
+                page.wait_for_timeout(RESULT_POLL_INTERVAL)
+        except PlaywrightTimeoutError:
+            pass
+        raise CheckTimeoutError("No appointment result was shown in time")
+
+    def read_appointment_result(self, alerts: List[Alert]) -> Optional[List[date]]:
+        """
+        Reads the result of an appointment search from the booking form alerts.
+
+        Args:
+            alerts (List[Alert]): The alerts shown on the booking form.
+
+        Returns:
+            Optional[List[date]]: The appointment dates, an empty list if an alert
+                says that no appointments are available, or None if the alerts do
+                not show a result yet.
+        """
+        dates = get_alert_dates(alerts)
+        if dates:
+            return dates
+        if any(self.no_appointment_pattern.search(alert.text) for alert in alerts):
+            logging.debug("The booking form shows that no appointments are available")
+            return []
+        return None
+
+    def step_timeout(self, step: str) -> float:
+        """
+        Returns the Playwright timeout of a step of the current check.
+
+        Args:
+            step (str): The step, one of the keys of `STEP_TIMEOUTS`.
+
+        Returns:
+            float: The timeout of the step in milliseconds, capped to the rest of
+                the check deadline.
+        """
+        check_deadline = self.check_deadline or get_check_deadline(
+            self.destination_country_code
+        )
+        return check_deadline.timeout(step)
+
+    def cap_timeout(self, timeout: float) -> float:
+        """
+        Caps a Playwright timeout to the rest of the check deadline.
+
+        Args:
+            timeout (float): The timeout in milliseconds.
+
+        Returns:
+            float: The capped timeout in milliseconds.
+        """
+        if self.check_deadline is None:
+            return timeout
+        return self.check_deadline.cap(timeout)
 
     @abstractmethod
     def login(
@@ -200,7 +1160,7 @@ class VfsBot(ABC):
     @abstractmethod
     def check_for_appontment(
         self, page: playwright.sync_api.Page, appointment_params: Dict[str, str]
-    ) -> List[str]:
+    ) -> List[date]:
         """
         Checks for appointments based on provided parameters on the VFS website.
 
@@ -214,7 +1174,7 @@ class VfsBot(ABC):
             appointment_params (Dict[str, str]): A dictionary containing appointment search criteria.
 
         Returns:
-            List[str]: A list of available appointment dates (empty list if none found).
+            List[date]: A list of available appointment dates (empty list if none found).
         """
         raise NotImplementedError(
             "Subclasses must implement appointment checking logic"
@@ -1,9 +1,8 @@
-import logging
+from datetime import date
 from typing import Dict, List, Optional
 
 from playwright.sync_api import Page
 
-from vfs_appointment_bot.utils.date_utils import extract_date_from_string
 from vfs_appointment_bot.vfs_bot.vfs_bot import VfsBot
 
 
@@ -59,14 +58,7 @@ class VfsBotIt(VfsBot):
         Raises:
             Exception: If login fails due to unexpected errors or missing "Start New Booking" button.
         """
-        email_input = page.locator("#mat-input-0")
-        password_input = page.locator("#mat-input-1")
-
-        email_input.fill(email_id)
-        password_input.fill(password)
-
-        page.get_by_role("button", name="Sign In").click()
-        page.wait_for_selector("role=button >> text=Start New Booking")
+        self.fill_login_form(page, email_id, password)
 
     def pre_login_steps(self, page: Page) -> None:
         """
@@ -78,77 +70,30 @@ class VfsBotIt(VfsBot):
         Args:
             page (playwright.sync_api.Page): The Playwright page object used for browser interaction.
         """
-        policies_reject_button = page.get_by_role("button", name="Reject All")
-        if policies_reject_button is not None:
-            policies_reject_button.click()
-            logging.debug("Rejected all cookie policies")
+        self.reject_cookie_policies(page)
 
     def check_for_appontment(
         self, page: Page, appointment_params: Dict[str, str]
-    ) -> Optional[List[str]]:
+    ) -> Optional[List[date]]:
         """
         Checks for appointments on the Italy VFS website based on provided parameters.
 
         This method clicks the "Start New Booking" button, selects the specified
-        visa center, category, and subcategory based on the `appointment_params`
-        dictionary. It then extracts the available appointment dates from the
-        website and returns them as a list. If no appointments are found, it
-        returns None.
+        visa center, category, subcategory and, for Morocco, payment mode based on
+        the `appointment_params` dictionary. It then reads the available appointment
+        dates from the captured availability response, falling back to the alerts
+        shown on the website, and returns them as a list. If no appointments are
+        found, it returns None.
 
         Args:
             page (playwright.sync_api.Page): The Playwright page object used for browser interaction.
             appointment_params (Dict[str, str]): A dictionary containing appointment search criteria.
 
         Returns:
-            Optional[List[str]]: A list of available appointment dates (empty list if none found),
+            Optional[List[date]]: A list of available appointment dates (empty list if none found),
                 including a timestamp of the check, or None if no appointments found.
         """
-        page.get_by_role("button", name="Start New Booking").click()
-
-        # Select Visa Centre
-        visa_centre_dropdown = page.wait_for_selector("mat-form-field")
-        visa_centre_dropdown.click()
-        visa_centre_dropdown_option = page.wait_for_selector(
-            f'mat-option:has-text("{appointment_params.get("visa_center")}")'
-        )
-        visa_centre_dropdown_option.click()
-
-        # Select Visa Category
-        visa_category_dropdown = page.query_selector_all("mat-form-field")[1]
-        visa_category_dropdown.click()
-        visa_category_dropdown_option = page.wait_for_selector(
-            f'mat-option:has-text("{appointment_params.get("visa_category")}")'
-        )
-        visa_category_dropdown_option.click()
-
-        # Select Subcategory
-        visa_subcategory_dropdown = page.query_selector_all("mat-form-field")[2]
-        visa_subcategory_dropdown.click()
-        visa_subcategory_dropdown_option = page.wait_for_selector(
-            f'mat-option:has-text("{appointment_params.get("visa_sub_category")}")'
-        )
-        visa_subcategory_dropdown_option.click()
-
-        if self.source_country_code == "MA":
-            # Select Payment Mode
-            payment_mode_dropdown = page.query_selector_all("mat-form-field")[3]
-            payment_mode_dropdown.click()
-            payment_mode_dropdown_option = page.wait_for_selector(
-                f'mat-option:has-text("{appointment_params.get("payment_mode")}")'
-            )
-            payment_mode_dropdown_option.click()
-
-        try:
-            page.wait_for_selector("div.alert")
-            appointment_date_elements = page.query_selector_all("div.alert")
-            appointment_dates = []
-            for appointment_date_element in appointment_date_elements:
-                appointment_date_text = appointment_date_element.text_content()
-                appointment_date = extract_date_from_string(appointment_date_text)
-                if appointment_date is not None and len(appointment_date) > 0:
-                    appointment_dates.append(appointment_date)
-            return appointment_dates
-        except Exception:
-            return None
-
-        return None
+        slots = self.select_appointment_params(page, appointment_params)
+        if slots is not None:
+            return [slot.date for slot in slots]
+        return self.extract_appointment_dates(page)
@@ -0,0 +1,259 @@
+import argparse
+import logging
+import multiprocessing
+import queue
+import statistics
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+# Imported before forking so that workers start with Playwright and the
+# country bots already loaded.
+import playwright.sync_api  # noqa: F401
+
+from vfs_appointment_bot.notification.notification_client_factory import (
+    close_notification_clients,
+    initialize_notification_clients,
+)
+from vfs_appointment_bot.notification.notification_dispatcher import (
+    close_notification_dispatcher,
+)
+from vfs_appointment_bot.notification.outbox import (
+    close_notification_outbox,
+    get_notification_outbox,
+)
+from vfs_appointment_bot.utils.config_reader import initialize_config
+from vfs_appointment_bot.utils.metrics import drain_metrics, merge_metrics
+from vfs_appointment_bot.utils.watchlist_reader import WatchlistEntry
+from vfs_appointment_bot.vfs_bot.browser_manager import close_browser_manager
+from vfs_appointment_bot.vfs_bot.vfs_bot import VfsBot
+from vfs_appointment_bot.vfs_bot.vfs_bot_de import VfsBotDe  # noqa: F401
+from vfs_appointment_bot.vfs_bot.vfs_bot_factory import get_vfs_bot
+from vfs_appointment_bot.vfs_bot.vfs_bot_it import VfsBotIt  # noqa: F401
+
+# Seconds to wait for a result before checking that the workers are alive
+LIVENESS_CHECK_INTERVAL = 5
+
+# Bots created by this worker process, by watchlist entry name. Keeping them
+# lets warm polling reuse each entry's logged-in page between rounds.
+_vfs_bots: Dict[str, VfsBot] = {}
+
+
+@dataclass
+class CheckResult:
+    """Outcome of one watchlist entry check performed by a worker."""
+
+    worker_id: int
+    entry_name: str
+    found: bool
+    duration: float
+    error: Optional[str] = None
+    metrics: Optional[Dict] = None
+
+
+class WorkerPool:
+    """
+    Pool of pre-forked worker processes that check watchlist entries.
+
+    Workers are forked once, after Playwright and the bot modules have been
+    imported, and stay alive for the whole session. Every entry is always
+    dispatched to the same worker, so that worker keeps a warm browser and
+    cached session for the entry's route. The pool also keeps per-worker
+    throughput and latency statistics, and merges the metrics collected by
+    the workers into the metrics of the main process. A worker that dies is
+    replaced by a new one, and the checks it had not finished are reported
+    as failed.
+    """
+
+    def __init__(self, num_workers: int):
+        """
+        Forks the worker processes.
+
+        Args:
+            num_workers (int): Number of worker processes.
+        """
+        methods = multiprocessing.get_all_start_methods()
+        self._mp_context = multiprocessing.get_context(
+            "fork" if "fork" in methods else "spawn"
+        )
+        self.num_workers = max(1, num_workers)
+        self._result_queue = self._mp_context.Queue()
+        self._task_queues = [None] * self.num_workers
+        self._workers = [None] * self.num_workers
+        self._round = 0
+        for worker_id in range(self.num_workers):
+            self._start_worker(worker_id)
+
+        self._started_at = time.monotonic()
+        self._latencies: Dict[int, List[float]] = {
+            worker_id: [] for worker_id in range(self.num_workers)
+        }
+        self._failures: Dict[int, int] = {
+            worker_id: 0 for worker_id in range(self.num_workers)
+        }
+
+    def worker_for(self, entry: WatchlistEntry) -> int:
+        """
+        Returns the worker that owns an entry.
+
+        The mapping only depends on the entry's route, so all entries for the
+        same route share a worker, its browser and its login session.
+
+        Args:
+            entry (WatchlistEntry): The watchlist entry.
+
+        Returns:
+            int: The worker id.
+        """
+        return zlib.crc32(entry.route.encode()) % self.num_workers
+
+    def run(self, entries: List[WatchlistEntry]) -> List[CheckResult]:
+        """
+        Checks every entry once and waits for all results.
+
+        Args:
+            entries (List[WatchlistEntry]): The watchlist entries to check.
+
+        Returns:
+            List[CheckResult]: The check results, in the order of `entries`.
+        """
+        # Results of a round given up on after its worker died are ignored later
+        self._round += 1
+        pending: Dict[int, WatchlistEntry] = {}
+        for index, entry in enumerate(entries):
+            self._task_queues[self.worker_for(entry)].put((self._round, index, entry))
+            pending[index] = entry
+
+        results: List[Optional[CheckResult]] = [None] * len(entries)
+        while pending:
+            try:
+                round_id, index, result = self._result_queue.get(
+                    timeout=LIVENESS_CHECK_INTERVAL
+                )
+            except queue.Empty:
+                for index, result in self._replace_dead_workers(pending):
+                    results[index] = result
+                    self._record(result)
+                continue
+            if round_id == self._round and pending.pop(index, None) is not None:
+                results[index] = result
+                self._record(result)
+        return results
+
+    def _start_worker(self, worker_id: int) -> None:
+        task_queue = self._mp_context.Queue()
+        worker = self._mp_context.Process(
+            target=_worker_main,
+            args=(worker_id, task_queue, self._result_queue),
+            daemon=True,
+        )
+        worker.start()
+        self._task_queues[worker_id] = task_queue
+        self._workers[worker_id] = worker
+
+    def _replace_dead_workers(
+        self, pending: Dict[int, WatchlistEntry]
+    ) -> List[Tuple[int, CheckResult]]:
+        failed = []
+        for worker_id, worker in enumerate(self._workers):
+            if worker.is_alive():
+                continue
+            error = f"Worker {worker_id} exited with code {worker.exitcode}"
+            logging.error(f"{error}, starting a new worker")
+            self._start_worker(worker_id)
+            for index, entry in list(pending.items()):
+                if self.worker_for(entry) == worker_id:
+                    del pending[index]
+                    failed.append(
+                        (index, CheckResult(worker_id, entry.name, False, 0.0, error))
+                    )
+        return failed
+
+    def _record(self, result: CheckResult) -> None:
+        if result.metrics:
+            merge_metrics(result.metrics)
+        self._latencies[result.worker_id].append(result.duration)
+        if result.error is not None:
+            self._failures[result.worker_id] += 1
+
+    def log_summary(self) -> None:
+        """
+        Logs throughput and latency per worker since the pool was started.
+        """
+        elapsed_minutes = max(time.monotonic() - self._started_at, 1e-9) / 60
+        for worker_id, latencies in self._latencies.items():
+            if not latencies:
+                logging.info(f"Worker {worker_id}: idle")
+                continue
+            logging.info(
+                f"Worker {worker_id}: {len(latencies)} checks "
+                + f"({len(latencies) / elapsed_minutes:.2f}/min), "
+                + f"{self._failures[worker_id]} failed, "
+                + f"latency median {statistics.median(latencies):.2f}s, "
+                + f"max {max(latencies):.2f}s"
+            )
+
+    def close(self) -> None:
+        """
+        Stops every worker and waits for them to exit.
+        """
+        for task_queue in self._task_queues:
+            task_queue.put(None)
+        for worker in self._workers:
+            worker.join(timeout=30)
+            if worker.is_alive():
+                worker.terminate()
+
+
+def _worker_main(worker_id: int, task_queue, result_queue) -> None:
+    initialize_config()
+    # Metrics inherited from the main process were already counted there
+    drain_metrics()
+    try:
+        initialize_notification_clients()
+        get_notification_outbox()
+        while True:
+            task = task_queue.get()
+            if task is None:
+                break
+            round_id, index, entry = task
+            result_queue.put((round_id, index, _check_entry(worker_id, entry)))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        close_browser_manager()
+        close_notification_outbox()
+        close_notification_dispatcher()
+        close_notification_clients()
+
+
+def _check_entry(worker_id: int, entry: WatchlistEntry) -> CheckResult:
+    start = time.monotonic()
+    try:
+        vfs_bot = _vfs_bots.get(entry.name)
+        if vfs_bot is None:
+            vfs_bot = get_vfs_bot(
+                entry.source_country_code, entry.destination_country_code
+            )
+            _vfs_bots[entry.name] = vfs_bot
+        found = vfs_bot.run(
+            argparse.Namespace(appointment_params=entry.appointment_params)
+        )
+        return CheckResult(
+            worker_id,
+            entry.name,
+            bool(found),
+            time.monotonic() - start,
+            metrics=drain_metrics(),
+        )
+    except Exception as e:
+        logging.error(f"Watchlist entry '{entry.name}' failed: {e}")
+        return CheckResult(
+            worker_id,
+            entry.name,
+            False,
+            time.monotonic() - start,
+            str(e),
+            drain_metrics(),
+        )